@@ -3,6 +3,7 @@
 from datetime import date
 from datetime import datetime
 from typing import Any
+from typing import AsyncIterator
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -12,6 +13,9 @@ from uuid import UUID
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import Query
+from fastapi.responses import StreamingResponse
+from mora import codec
+from mora import config
 from mora import mapping
 from mora.api.v1.models import Address
 from mora.api.v1.models import Association
@@ -28,12 +32,14 @@ from mora.api.v1.models import RelatedUnit
 from mora.api.v1.models import Role
 from mora.api.v1.models import to_only_uuid_model
 from mora.common import get_connector
+from mora.common import new_connector
 from mora.handler.impl.employee import ROLE_TYPE as EMPLOYEE_ROLE_TYPE
 from mora.handler.impl.org_unit import ROLE_TYPE as ORG_UNIT_ROLE_TYPE
 from mora.handler.reading import get_handler_for_type
 from mora.lora import Connector
 from mora.mapping import MoOrgFunk
 from mora.util import date_to_datetime
+from more_itertools import chunked
 
 router = APIRouter(prefix="/api/v1")
 
@@ -102,6 +108,52 @@ async def orgfunk_endpoint(
     )
 
 
+@date_to_datetime
+async def orgfunk_stream(
+    orgfunk_type: MoOrgFunk,
+    query_args: Dict[str, Any],
+    changed_since: Optional[Union[date, datetime]] = None,
+) -> StreamingResponse:
+    """
+    Like orgfunk_endpoint, but the objects are read, converted and written as
+    newline-delimited JSON a chunk at a time, so they are never all held in memory.
+
+    The matching UUIDs are searched for up front, so errors in the search are
+    reported as usual, whereas errors while streaming abort the response.
+    """
+    search_params = _extract_search_params(query_args=query_args)
+    cls = get_handler_for_type(orgfunk_type.value)
+    model = orgfunk_type_map[orgfunk_type]
+    uuids = await cls.get_uuids(get_connector(), search_params)
+    chunk_size = config.get_settings().v1_stream_chunk_size
+
+    async def lines() -> AsyncIterator[str]:
+        for chunk in chunked(uuids, chunk_size):
+            # A connector per chunk, as its loaders hold on to everything loaded
+            c = new_connector()
+            mo_objects = await _query_orgfunk(
+                c=c,
+                orgfunk_type=orgfunk_type,
+                search_params={mapping.UUID: chunk},
+                changed_since=changed_since,
+            )
+            c.organisationfunktion.forget(chunk)
+            for mo_object in mo_objects:
+                yield codec.dumps_str(model.parse_obj(mo_object)) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def stream_query() -> bool:
+    return Query(
+        False,
+        description=(
+            "Stream the objects as newline-delimited JSON, one object per line, "
+            "as opposed to a JSON list. Recommended for large results."
+        ),
+    )
+
+
 class CommonQueryParams:
     def __init__(
         self,
@@ -153,11 +205,13 @@ class CommonQueryParams:
 async def search_address(
     common: CommonQueryParams = Depends(),
     engagement: Optional[str] = None,
+    stream: bool = stream_query(),
 ):
     args = {"at": common.at, "validity": common.validity}
     if engagement is not None:
         args[MoOrgFunk.ENGAGEMENT.value] = engagement
-    return await orgfunk_endpoint(
+    endpoint = orgfunk_stream if stream else orgfunk_endpoint
+    return await endpoint(
         orgfunk_type=MoOrgFunk.ADDRESS,
         query_args=args,
         changed_since=common.changed_since,
@@ -173,6 +227,7 @@ async def search_engagement_association(
     common: CommonQueryParams = Depends(),
     engagement: Optional[UUID] = None,
     org_unit: Optional[UUID] = None,
+    stream: bool = stream_query(),
 ):
     args = {"at": common.at, "validity": common.validity}
     if engagement is not None:
@@ -180,7 +235,8 @@ async def search_engagement_association(
     if org_unit is not None:
         args["tilknyttedeenheder"] = org_unit
 
-    return await orgfunk_endpoint(
+    endpoint = orgfunk_stream if stream else orgfunk_endpoint
+    return await endpoint(
         orgfunk_type=MoOrgFunk.ENGAGEMENT_ASSOCIATION,
         query_args=args,
         changed_since=common.changed_since,
@@ -251,8 +307,10 @@ def search_func_factory(orgfunk: MoOrgFunk):
     @date_to_datetime
     async def search_orgfunk(
         common: CommonQueryParams = Depends(),
+        stream: bool = stream_query(),
     ):
-        return await orgfunk_endpoint(
+        endpoint = orgfunk_stream if stream else orgfunk_endpoint
+        return await endpoint(
             orgfunk_type=orgfunk,
             query_args={"at": common.at, "validity": common.validity},
             changed_since=common.changed_since,
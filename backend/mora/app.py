@@ -37,19 +37,23 @@ from .exceptions import ErrorCodes
 from .exceptions import http_exception_to_json_response
 from .exceptions import HTTPException
 from .metrics import setup_metrics
+from mora import codec
 from mora import config
 from mora import health
 from mora import log
+from mora import lora
 from mora.auth.exceptions import AuthorizationError
 from mora.auth.keycloak.oidc import auth
 from mora.auth.keycloak.oidc import authorization_exception_handler
 from mora.auth.keycloak.router import keycloak_router
 from mora.graphapi.main import setup_graphql
 from mora.graphapi.middleware import GraphQLContextPlugin
+from mora.graphapi.shim import prepare_queries
 from mora.http import client
 from mora.integrations import serviceplatformen
 from mora.request_scoped.bulking import request_wide_bulk
 from mora.request_scoped.query_args_context_plugin import QueryArgContextPlugin
+from mora.service.address_handler import dar
 from mora.service.address_handler.dar import DARLoaderPlugin
 from mora.service.shimmed import meta_router
 from tests.util import setup_test_routing
@@ -196,6 +200,7 @@ def create_app(settings_overrides: Optional[Dict[str, Any]] = None):
     app = FastAPI(
         middleware=middleware,
         openapi_tags=list(tags_metadata),
+        default_response_class=codec.JSONResponse,
     )
     settings = config.get_settings(**settings_overrides)
     if settings.enable_cors:
@@ -261,6 +266,19 @@ def create_app(settings_overrides: Optional[Dict[str, Any]] = None):
     async def register_triggers():
         await triggers.register(app)
 
+    @app.on_event("startup")
+    async def start_lora_session():
+        await lora.start_session()
+
+    @app.on_event("startup")
+    async def prepare_shim_queries():
+        prepare_queries()
+
+    @app.on_event("startup")
+    async def load_dar_cache():
+        if settings.dar_cache_path:
+            dar.load_cache(settings.dar_cache_path)
+
     # TODO: Deal with uncaught "Exception", #43826
     app.add_exception_handler(Exception, fallback_handler)
     app.add_exception_handler(FastAPIHTTPException, fallback_handler)
@@ -274,6 +292,16 @@ def create_app(settings_overrides: Optional[Dict[str, Any]] = None):
         await client.aclose()
         await triggers.internal.amqp_trigger.close_amqp()
 
+    @app.on_event("shutdown")
+    async def close_lora_session():
+        await lora.close_session()
+
+    @app.on_event("shutdown")
+    async def close_dar_client():
+        await dar.close_client()
+        if settings.dar_cache_path:
+            dar.save_cache(settings.dar_cache_path)
+
     if not is_under_test():
         app = setup_instrumentation(app)
         setup_metrics(app)
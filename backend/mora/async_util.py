@@ -61,6 +61,30 @@ async def __session_context_helper(awaitable) -> typing.Any:
     return ret
 
 
+async def gather_bounded(
+    awaitables: typing.Iterable[typing.Awaitable], limit: int
+) -> typing.List[typing.Any]:
+    """
+    Like asyncio.gather, but awaiting at most `limit` of the awaitables at a time.
+
+    The results are in the order of the awaitables. If one of them fails, the
+    remaining ones are cancelled and the error is raised.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    tasks = [asyncio.ensure_future(run(awaitable)) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
 def async_to_sync(f: typing.Callable):
     """
     Decorator-designed, for 'converting' an async function to a sync function.
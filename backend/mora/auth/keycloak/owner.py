@@ -4,19 +4,17 @@
 import asyncio
 
 from structlog import get_logger
-from typing import List
 from typing import Set
 from uuid import UUID
 from more_itertools import flatten
 
 from mora import common
 from mora.handler.impl.owner import OwnerReader
-import mora.service.orgunit
+from mora.service import orgunit_index
 
 from mora.mapping import EntityType
 from mora.mapping import OWNER
 from mora.mapping import UUID as UUID_KEY
-from mora.auth.keycloak import uuid_extractor
 
 logger = get_logger()
 
@@ -41,11 +39,14 @@ async def get_ancestor_owners(uuid: UUID) -> Set[UUID]:
 
     logger.debug("get_ancestor_owners called")
 
-    ancestors_tree = await _get_ancestors(uuid)
-    ancestor_uuids = uuid_extractor.get_ancestor_uuids(ancestors_tree)
+    c = common.get_connector()
+    ancestor_uuids = await orgunit_index.read_ancestors(c, str(uuid))
 
     ancestor_owner_sublists = await asyncio.gather(
-        *(_get_entity_owners(uuid, EntityType.ORG_UNIT) for uuid in ancestor_uuids)
+        *(
+            _get_entity_owners(UUID(uuid), EntityType.ORG_UNIT)
+            for uuid in ancestor_uuids
+        )
     )
 
     ancestor_owners = set(flatten(ancestor_owner_sublists))
@@ -53,56 +54,6 @@ async def get_ancestor_owners(uuid: UUID) -> Set[UUID]:
     return ancestor_owners
 
 
-async def _get_ancestors(uuid: UUID) -> List[dict]:
-    """
-    Get org unit ancestor tree from LoRa.
-
-    :param uuid: UUID of the leaf org unit in the tree
-    :return: nested ancestor org unit tree branch (including the leaf unit)
-
-    **Example return value**
-
-    .. sourcecode:: python
-
-        [
-            {
-                "name": "Overordnet Enhed",
-                "user_key": "root",
-                "uuid": "2874e1dc-85e6-4269-823a-e1125484dfd3",
-                "validity": {
-                    "from": "2016-01-01",
-                    "to": None
-                },
-                "children": [
-                    {
-                        "name": "Humanistisk fakultet",
-                        "user_key": "hum",
-                        "uuid": "9d07123e-47ac-4a9a-88c8-da82e3a4bc9e",
-                        "validity": {
-                            "from": "2016-01-01",
-                            "to": None
-                        },
-                        "children": [
-                            {
-                                "name": "Filosofisk Institut",
-                                "user_key": "fil",
-                                "uuid": "85715fc7-925d-401b-822d-467eb4b163b6",
-                                "validity": {
-                                    "from": "2016-01-01",
-                                    "to": None
-                                }
-                            }
-                        ]
-                    }
-                ]
-            }
-        ]
-
-    """
-    c = common.get_connector()
-    return await mora.service.orgunit.get_unit_tree(c, [str(uuid)], with_siblings=False)
-
-
 async def _get_entity_owners(uuid: UUID, entity_type: EntityType) -> Set[UUID]:
     """
     Get the UUID of the owner of an entity (org unit or employee)
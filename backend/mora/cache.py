@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Generic
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Size-bounded, least-recently-used cache where entries expire after a TTL.
+
+    Hits and misses are counted, so they can be exported as metrics.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self.__data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.__lookup(key) is not None
+
+    def __lookup(self, key: K) -> Optional[Tuple[float, V]]:
+        entry = self.__data.get(key)
+        if entry is None:
+            return None
+        expires, _ = entry
+        if expires <= self.timer():
+            del self.__data[key]
+            return None
+        return entry
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self.__lookup(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.__data.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self.__data[key] = (self.timer() + ttl, value)
+        self.__data.move_to_end(key)
+        while len(self.__data) > self.maxsize:
+            self.__data.popitem(last=False)
+
+    def items(self) -> List[Tuple[K, V]]:
+        """The unexpired entries, without affecting their recency or statistics."""
+        now = self.timer()
+        return [
+            (key, value)
+            for key, (expires, value) in self.__data.items()
+            if expires > now
+        ]
+
+    def pop(self, key: K) -> Optional[V]:
+        entry = self.__data.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self.__data.clear()
+
+
+class SharedIndexes(Generic[V]):
+    """
+    Indexes built from present-time LoRa reads, shared between requests.
+
+    There is one index per effective date, as given by ``Connector.shared_date``,
+    which expires after the TTL. Connectors whose reads cannot be shared get an
+    index built for them alone.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[Any], Awaitable[V]],
+        maxsize: int,
+        ttl: float,
+    ):
+        self.build = build
+        self.__indexes: TTLCache[date, V] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, c) -> V:
+        """The index at the effective time of the connector."""
+        index_date = c.shared_date
+        if index_date is None:
+            return await self.build(c)
+        index = self.__indexes.get(index_date)
+        if index is None:
+            index = await self.build(c)
+            self.__indexes.set(index_date, index)
+        return index
+
+    def values(self) -> List[V]:
+        """The unexpired indexes."""
+        return [index for _, index in self.__indexes.items()]
+
+    def clear(self) -> None:
+        self.__indexes.clear()
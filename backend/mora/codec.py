@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+"""
+JSON encoding and decoding of LoRa requests and responses and of MO responses.
+
+Values orjson does not support natively, such as pydantic models and sets, are
+converted as by FastAPI's ``jsonable_encoder``.
+"""
+import asyncio
+from typing import Any
+from typing import Callable
+from typing import Union
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import JSONResponse as StarletteJSONResponse
+from starlette.responses import Response
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.dict(by_alias=True)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return jsonable_encoder(value)
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+loads: Callable[[Union[bytes, str]], Any] = orjson.loads
+
+
+def dumps_str(value: Any) -> str:
+    """Like :func:`dumps`, but returning a string, e.g. for aiohttp."""
+    return dumps(value).decode("utf-8")
+
+
+class JSONResponse(StarletteJSONResponse):
+    """JSON response rendered by the codec."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class JSONRoute(APIRoute):
+    """
+    Route responding with the results of its endpoint rendered by the codec
+    directly, as opposed to converting them with ``jsonable_encoder`` first.
+
+    Only endpoints without a response model, which would validate the results, and
+    without a ``Response`` parameter, whose status and headers would be lost, are
+    responded to directly. Calling the endpoint functions is unaffected.
+    """
+
+    def get_route_handler(self) -> Callable:
+        response_class = getattr(self.response_class, "value", self.response_class)
+        call = self.dependant.call
+        if (
+            self.response_model is None
+            and self.dependant.response_param_name is None
+            and isinstance(response_class, type)
+            and issubclass(response_class, JSONResponse)
+            and asyncio.iscoroutinefunction(call)
+            and not getattr(call, "_responds_directly", False)
+        ):
+            status_code = self.status_code
+
+            async def respond(**values: Any) -> Response:
+                content = await call(**values)
+                if isinstance(content, Response):
+                    return content
+                return response_class(content, status_code=status_code or 200)
+
+            respond._responds_directly = True
+            self.dependant.call = respond
+        return super().get_route_handler()
@@ -54,6 +54,15 @@ def get_connector(**loraparams) -> lora.Connector:
     return create_connector(**loraparams)
 
 
+def new_connector(**loraparams) -> lora.Connector:
+    """Like get_connector, but a new connector rather than the one of the request.
+
+    Connectors hold on to everything loaded through them, so long-running reads use
+    new ones for each part to bound their memory use.
+    """
+    return _create_connector(**loraparams)
+
+
 def _create_connector(**loraparams) -> lora.Connector:
     args = util.get_query_args() or {}
 
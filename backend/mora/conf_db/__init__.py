@@ -3,9 +3,10 @@
 
 from structlog import get_logger
 from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
-from itertools import starmap
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 from alembic.config import Config as AlembicConfig
 from sqlalchemy import Column, Integer, String, Text, create_engine
@@ -13,13 +14,27 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import select
 from sqlalchemy_utils import UUIDType, create_database, database_exists, drop_database
+from starlette.concurrency import run_in_threadpool
 
 from mora import exceptions, config
+from mora.cache import TTLCache
 
 logger = get_logger()
 
 SUBSTITUTE_ROLES = "substitute_roles"
 
+# The whole orgunit_settings table, as the settings of each unit by unit UUID,
+# with None for the global settings. Kept under a single key.
+configuration_cache: TTLCache[str, Dict[Optional[str], Dict[str, Any]]] = TTLCache(
+    maxsize=1, ttl=config.get_settings().conf_db_cache_ttl
+)
+
+# Settings of units resolved with inheritance, by unit UUID. Set for the duration
+# of a request by request_wide_bulk.cache_context()
+request_resolved_configuration: ContextVar[
+    Optional[Dict[str, Dict[str, Any]]]
+] = ContextVar("request_resolved_configuration", default=None)
+
 Base = declarative_base()
 
 
@@ -87,6 +102,7 @@ def drop_db():
     logger.info("Dropping configuration database.")
     drop_database(_get_connection_url())
     _get_session_maker.cache_clear()
+    configuration_cache.clear()
     logger.info("Configuration database dropped.")
 
 
@@ -135,6 +151,14 @@ def set_db_configuration(configuration, unitid=None):
     logger.debug("set_configuration", unitid=unitid, configuration=configuration)
     configuration = configuration["org_units"]
 
+    try:
+        _set_db_configuration(configuration, unitid)
+    finally:
+        configuration_cache.clear()
+    return True
+
+
+def _set_db_configuration(configuration, unitid):
     with _get_session() as session:
         for setting, value in configuration.items():
             # Check if setting exists
@@ -151,7 +175,6 @@ def set_db_configuration(configuration, unitid=None):
             else:
                 entry = Config(object=unitid, setting=setting, value=value)
                 session.add(entry)
-        return True
 
 
 def set_configuration(configuration, unitid=None):
@@ -161,22 +184,54 @@ def set_configuration(configuration, unitid=None):
     return set_db_configuration(configuration, unitid)
 
 
-def get_db_configuration(unitid=None):
-    def convert_bool(setting, value):
-        lower_value = str(value).lower()
-        if lower_value == "true":
-            value = True
-        elif lower_value == "false":
-            value = False
-        return setting, value
+def _convert_bool(value):
+    lower_value = str(value).lower()
+    if lower_value == "true":
+        return True
+    elif lower_value == "false":
+        return False
+    return value
 
+
+def _load_db_configurations() -> Dict[Optional[str], Dict[str, Any]]:
     with _get_session() as session:
-        query = select([Config.setting, Config.value]).where(Config.object == unitid)
-        result = session.execute(query)
-        result = starmap(convert_bool, result)
-        configuration = dict(result)
-        logger.debug("get_configuration", unitid=unitid, configuration=configuration)
-        return configuration
+        query = select([Config.object, Config.setting, Config.value])
+        configurations = {}
+        for unitid, setting, value in session.execute(query):
+            unitid = None if unitid is None else str(unitid)
+            configurations.setdefault(unitid, {})[setting] = _convert_bool(value)
+        logger.debug("load_configurations", units=len(configurations))
+        return configurations
+
+
+def get_db_configurations() -> Dict[Optional[str], Dict[str, Any]]:
+    """All settings, read through the process-wide cache."""
+    configurations = configuration_cache.get("orgunit_settings")
+    if configurations is None:
+        configurations = _load_db_configurations()
+        configuration_cache.set("orgunit_settings", configurations)
+    return configurations
+
+
+async def get_db_configurations_async() -> Dict[Optional[str], Dict[str, Any]]:
+    """Like get_db_configurations, but reads the database in a thread pool."""
+    configurations = configuration_cache.get("orgunit_settings")
+    if configurations is None:
+        configurations = await run_in_threadpool(_load_db_configurations)
+        configuration_cache.set("orgunit_settings", configurations)
+    return configurations
+
+
+def _unit_configuration(configurations, unitid=None) -> Dict[str, Any]:
+    unitid = None if unitid is None else str(unitid)
+    # Copy, as callers are free to modify the result
+    configuration = dict(configurations.get(unitid, {}))
+    logger.debug("get_configuration", unitid=unitid, configuration=configuration)
+    return configuration
+
+
+def get_db_configuration(unitid=None):
+    return _unit_configuration(get_db_configurations(), unitid)
 
 
 def get_settings_configuration():
@@ -196,6 +251,14 @@ def get_configuration(unitid=None):
     return get_db_configuration(unitid)
 
 
+async def get_configuration_async(unitid=None):
+    """Like get_configuration, but without blocking the event loop."""
+    settings = config.get_settings()
+    if not settings.conf_db_use:
+        return get_settings_configuration()
+    return _unit_configuration(await get_db_configurations_async(), unitid)
+
+
 def health_check():
     """Return a tuple (healthy, msg) where healthy is a boolean and msg
     is the potential error message.
@@ -213,7 +276,7 @@ def health_check():
 
     try:
         # Check that a connection can be made
-        db_configuration = get_db_configuration()
+        db_configuration = _unit_configuration(_load_db_configurations())
     except Exception as e:
         error_msg = "Configuration database connection error: %s"
         return False, error_msg.format(str(e))
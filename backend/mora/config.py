@@ -11,6 +11,8 @@ from typing import Optional
 from pydantic import AnyHttpUrl
 from pydantic import BaseSettings
 from pydantic import root_validator
+from pydantic.types import NonNegativeFloat
+from pydantic.types import NonNegativeInt
 from pydantic.types import PositiveInt
 from pydantic.types import UUID
 
@@ -60,6 +62,54 @@ class Settings(BaseSettings):
     # Bulked LoRa DataLoader fetching
     bulked_fetch: bool = True
 
+    # LoRa connection pool
+    lora_pool_size: PositiveInt = 100
+    # 0 means no per-host limit besides lora_pool_size
+    lora_pool_size_per_host: int = 0
+    lora_keepalive_timeout: float = 15.0
+    lora_timeout: PositiveInt = 300
+    lora_connect_timeout: Optional[PositiveInt]
+
+    # Cursor pagination of LoRa searches, i.e. Scope.paged_get
+    paged_cursor_cache_size: PositiveInt = 100
+    paged_cursor_ttl: PositiveInt = 300
+
+    # Process-wide cache of classes and facets
+    classification_cache: bool = True
+    classification_cache_size: PositiveInt = 10000
+    classification_cache_ttl: PositiveInt = 300
+
+    # Shared index of the organisation unit hierarchy, per effective date
+    org_unit_index_size: PositiveInt = 10
+    org_unit_index_ttl: PositiveInt = 300
+
+    # Index of the employees with associations, kept up to date through AMQP if
+    # enabled, and rebuilt after association_index_ttl for writes straight to LoRa
+    association_index_ttl: PositiveInt = 300
+
+    # Objects read and converted at a time by the streaming /api/v1 searches
+    v1_stream_chunk_size: PositiveInt = 100
+
+    # Details of a bulk write prepared and validated at once
+    request_preparation_concurrency: PositiveInt = 10
+
+    # Bulk writes through /service/details/*?bulk=1, written with at most
+    # bulk_write_concurrency LoRa writes at a time. Writes failing with transient
+    # errors are retried, waiting bulk_write_retry_backoff seconds, doubled for
+    # each retry.
+    bulk_write_concurrency: PositiveInt = 50
+    bulk_write_retries: NonNegativeInt = 3
+    bulk_write_retry_backoff: NonNegativeFloat = 0.5
+
+    # DAR address lookups, cached process-wide. Not found addresses are cached for
+    # dar_cache_negative_ttl, and the cache is persisted to dar_cache_path if set.
+    dar_url: AnyHttpUrl = "https://api.dataforsyningen.dk"
+    dar_timeout: PositiveInt = 120
+    dar_cache_size: PositiveInt = 100000
+    dar_cache_ttl: PositiveInt = 86400
+    dar_cache_negative_ttl: PositiveInt = 300
+    dar_cache_path: Optional[str]
+
     # GraphQL settings
     graphql_enable: bool = False
     graphiql_enable: bool = False
@@ -68,6 +118,9 @@ class Settings(BaseSettings):
     http_endpoints: Optional[List[str]]
     fetch_trigger_timeout: int = 5
     run_trigger_timeout: int = 5
+    # Consecutive timeouts before calls to an endpoint are refused, and for how long
+    http_trigger_failure_threshold: PositiveInt = 5
+    http_trigger_reset_timeout: float = 30.0
 
     # HTTPX
     httpx_timeout: PositiveInt = 10
@@ -77,6 +130,13 @@ class Settings(BaseSettings):
     amqp_host: str = "msg_broker"
     amqp_port: int = 5672
     amqp_os2mo_exchange: str = "os2mo"
+    # Outbox of messages waiting to be published, and its publisher workers
+    amqp_outbox_size: PositiveInt = 10000
+    amqp_publisher_workers: PositiveInt = 4
+    amqp_publish_batch_size: PositiveInt = 100
+    amqp_publish_retries: int = 5
+    amqp_publish_backoff: float = 0.5
+    amqp_flush_timeout: float = 10.0
 
     # Serviceplatform settings
     sp_service_uuid: Optional[UUID]
@@ -118,6 +178,8 @@ class Settings(BaseSettings):
     conf_db_host: str = "mox-db"
     conf_db_port: str = "5432"
     conf_db_sslmode: Optional[str]
+    # Seconds to cache the configuration database, as other instances may write it
+    conf_db_cache_ttl: PositiveInt = 60
 
     @root_validator
     def conf_db_password_maybe_required(cls, values: Dict[str, Any]) -> Dict[str, Any]:
@@ -7,7 +7,8 @@
 # --------------------------------------------------------------------------------------
 # Imports
 # --------------------------------------------------------------------------------------
-from asyncio import gather
+from collections import defaultdict
+from collections.abc import Callable
 from collections.abc import Iterable
 from functools import partial
 from itertools import starmap
@@ -263,62 +264,79 @@ async def load_facet_classes(facet_uuids: list[UUID]) -> list[ClassRead]:
     return list(map(lambda key: buckets[key], facet_uuids))
 
 
-async def get_employee_details(
-    employee_uuid: UUID, role_type: str
-) -> Optional[list[MOModel]]:
-    """Non-bulk loader for employee details."""
+async def get_details(
+    search_field: str, uuids: list[UUID], role_type: str
+) -> list[dict[str, Any]]:
+    """Get details of the given role type related to any of the given UUIDs.
+
+    All UUIDs are searched for in a single LoRa query.
+
+    Args:
+        search_field: The LoRa relation to search, i.e. 'tilknyttedebrugere' or
+            'tilknyttedeenheder'.
+        uuids: The related employee or organisation unit UUIDs.
+        role_type: The MO role type of the details.
+
+    Returns:
+        List of MO details related to any of the UUIDs.
+    """
     c = get_connector()
     cls = get_handler_for_type(role_type)
-    result = await cls.get(
+    return await cls.get(
         c=c,
         search_fields=_extract_search_params(
             query_args={
                 "at": None,
                 "validity": None,
-                "tilknyttedebrugere": str(employee_uuid),
+                search_field: list(map(str, uuids)),
             }
         ),
         changed_since=None,
     )
-    return parse_obj_as(list[MOModel], result)
+
+
+def bucket_details(
+    keys: list[UUID],
+    mo_models: Iterable[MOModel],
+    key_fn: Callable[[MOModel], Iterable[Optional[UUID]]],
+) -> list[list[MOModel]]:
+    """Bucket MO models by the (possibly multiple) keys each of them relates to."""
+    buckets: dict[Optional[UUID], list[MOModel]] = defaultdict(list)
+    for mo_model in mo_models:
+        for key in set(key_fn(mo_model)):
+            buckets[key].append(mo_model)
+    return [buckets.get(key, []) for key in keys]
+
+
+def employee_uuids(mo_model: MOModel) -> list[Optional[UUID]]:
+    return [mo_model.employee_uuid]  # type: ignore
+
+
+def org_unit_uuids(mo_model: MOModel) -> list[Optional[UUID]]:
+    # Related units are related to (exactly two) organisation units
+    if isinstance(mo_model, RelatedUnitRead):
+        return mo_model.org_unit_uuids
+    return [mo_model.org_unit_uuid]  # type: ignore
 
 
 async def load_employee_details(
     keys: list[UUID], model: MOModel
 ) -> list[list[MOModel]]:
-    """Non-bulk loader for employee details with bulk interface."""
+    """Bulk loader for employee details."""
     mo_type = model.__fields__["type_"].default
-    tasks = map(partial(get_employee_details, role_type=mo_type), keys)
-    return await gather(*tasks)
-
-
-async def get_org_unit_details(
-    org_unit_uuid: UUID, role_type: str
-) -> Optional[list[MOModel]]:
-    """Non-bulk loader for organisation unit details."""
-    c = get_connector()
-    cls = get_handler_for_type(role_type)
-    result = await cls.get(
-        c=c,
-        search_fields=_extract_search_params(
-            query_args={
-                "at": None,
-                "validity": None,
-                "tilknyttedeenheder": str(org_unit_uuid),
-            }
-        ),
-        changed_since=None,
-    )
-    return parse_obj_as(list[MOModel], result)
+    results = await get_details("tilknyttedebrugere", keys, mo_type)
+    mo_models = parse_obj_as(list[model], results)  # type: ignore
+    return bucket_details(keys, mo_models, employee_uuids)
 
 
 async def load_org_unit_details(
     keys: list[UUID], model: MOModel
 ) -> list[list[MOModel]]:
-    """Non-bulk loader for org_unit details with bulk interface."""
+    """Bulk loader for organisation unit details."""
     mo_type = model.__fields__["type_"].default
-    tasks = map(partial(get_org_unit_details, role_type=mo_type), keys)
-    return await gather(*tasks)
+    results = await get_details("tilknyttedeenheder", keys, mo_type)
+    mo_models = parse_obj_as(list[model], results)  # type: ignore
+    return bucket_details(keys, mo_models, org_unit_uuids)
 
 
 async def load_org(keys: list[int]) -> list[OrganisationRead]:
@@ -337,30 +355,34 @@ async def load_org(keys: list[int]) -> list[OrganisationRead]:
     return [OrganisationRead.parse_obj(obj)] * len(keys)
 
 
-async def get_org_unit_children(parent_uuid: UUID) -> list[MOModel]:
-    """Non-bulk loader for organisation unit children."""
+async def get_org_unit_children(parent_uuids: list[UUID]) -> list[dict[str, Any]]:
+    """Get the active children of any of the given organisation units.
+
+    All parents are searched for in a single LoRa query.
+    """
     c = get_connector()
     cls = get_handler_for_type(OrganisationUnitRead.__fields__["type_"].default)
-    result = await cls.get(
+    return await cls.get(
         c=c,
         search_fields=_extract_search_params(
             query_args={
                 "at": None,
                 "validity": None,
-                "overordnet": str(parent_uuid),
+                "overordnet": list(map(str, parent_uuids)),
                 "gyldighed": "Aktiv",
             }
         ),
         changed_since=None,
     )
-    return parse_obj_as(list[MOModel], result)
 
 
-async def load_org_units_children(keys: list[UUID]) -> list[list[MOModel]]:
-    """Non-bulk loader for organisation unit children with bulk interface."""
-    # TODO: This function should be replaced with a bulk version
-    tasks = map(get_org_unit_children, keys)
-    return await gather(*tasks)
+async def load_org_units_children(
+    keys: list[UUID],
+) -> list[list[OrganisationUnitRead]]:
+    """Bulk loader for organisation unit children."""
+    results = await get_org_unit_children(keys)
+    mo_models = parse_obj_as(list[OrganisationUnitRead], results)
+    return bucket_details(keys, mo_models, lambda model: [model.parent_uuid])
 
 
 async def get_loaders() -> dict[str, DataLoader]:
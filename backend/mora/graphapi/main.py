@@ -7,6 +7,7 @@
 # Imports
 # --------------------------------------------------------------------------------------
 from asyncio import gather
+from functools import lru_cache
 from typing import Any
 from typing import cast
 from typing import Optional
@@ -38,6 +39,7 @@ from mora.graphapi.dataloaders import get_roles
 from mora.graphapi.dataloaders import MOModel
 from mora.graphapi.health import health_map
 from mora.graphapi.middleware import StarletteContextExtension
+from mora.graphapi.shim import PreparedQueryExtension
 from mora.graphapi.models import HealthRead
 from mora.graphapi.schema import Address
 from mora.graphapi.schema import Association
@@ -293,7 +295,9 @@ async def get_by_uuid(dataloader: DataLoader, uuids: list[UUID]) -> list[MOModel
     return list(filter(lambda result: result is not None, results))
 
 
+@lru_cache(maxsize=None)
 def get_schema() -> strawberry.Schema:
+    """The GraphQL schema, built once per process as it converts every model."""
     schema = strawberry.Schema(
         query=Query,
         # Automatic camelCasing disabled because under_score style is simply better
@@ -309,6 +313,7 @@ def get_schema() -> strawberry.Schema:
         extensions=[
             OpenTelemetryExtension,
             StarletteContextExtension,
+            PreparedQueryExtension,
         ],
     )
     return schema
@@ -11,23 +11,93 @@ Used for shimming the service API.
 # Imports
 # --------------------------------------------------------------------------------------
 from typing import Any
+from typing import Dict
+from typing import Set
 
+from graphql import DocumentNode
+from graphql import parse
+from graphql import validate
+from strawberry.extensions import Extension
 from strawberry.types import ExecutionResult
+from structlog import get_logger
+
+logger = get_logger()
+
+# --------------------------------------------------------------------------------------
+# Prepared queries
+# --------------------------------------------------------------------------------------
+
+# Fixed queries of the shim, which are parsed and validated once instead of per call
+_registered_queries: Set[str] = set()
+_prepared_queries: Dict[str, DocumentNode] = {}
+
+
+def register_query(query: str) -> str:
+    """Register a fixed query string to be prepared.
+
+    Args:
+        query: The GraphQL query string.
+
+    Returns:
+        The query string, so it can be registered where it is defined.
+    """
+    _registered_queries.add(query)
+    return query
+
+
+def prepare_query(query: str) -> None:
+    """Parse and validate the query against the schema, keeping the document.
+
+    Raises:
+        ValueError: If the query is invalid.
+    """
+    from mora.graphapi.main import get_schema
+
+    document = parse(query)
+    errors = validate(get_schema()._schema, document)
+    if errors:
+        raise ValueError(errors)
+    _prepared_queries[query] = document
+
+
+def prepare_queries() -> None:
+    """Prepare all registered queries, e.g. at startup."""
+    for query in _registered_queries - _prepared_queries.keys():
+        prepare_query(query)
+    logger.debug("prepared_queries", queries=len(_prepared_queries))
+
+
+class PreparedQueryExtension(Extension):
+    """Skip parsing and validation of prepared queries."""
+
+    def on_parsing_start(self) -> None:
+        document = _prepared_queries.get(self.execution_context.query)
+        if document is not None:
+            self.execution_context.graphql_document = document
+
+    def on_validation_start(self) -> None:
+        if self.execution_context.query in _prepared_queries:
+            # Validation is skipped if errors are already known
+            self.execution_context.errors = []
+
 
 # --------------------------------------------------------------------------------------
 # Code
 # --------------------------------------------------------------------------------------
 
 
-async def execute_graphql(*args: Any, **kwargs: Any) -> ExecutionResult:
+async def execute_graphql(query: str, *args: Any, **kwargs: Any) -> ExecutionResult:
     from mora.graphapi.main import get_schema
     from mora.graphapi.dataloaders import get_loaders
     from mora.graphapi.middleware import set_is_shim
 
     set_is_shim()
 
+    if query in _registered_queries and query not in _prepared_queries:
+        prepare_query(query)
+
     loaders = await get_loaders()
     if "context_value" not in kwargs:
         kwargs["context_value"] = loaders
 
-    return await get_schema().execute(*args, **kwargs)
+    return await get_schema().execute(query, *args, **kwargs)
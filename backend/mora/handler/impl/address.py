@@ -23,18 +23,28 @@ logger = get_logger()
 @reading.register(ROLE_TYPE)
 class AddressReader(reading.OrgFunkReadingHandler):
     function_key = mapping.ADDRESS_KEY
+    projection = mapping.Projection(
+        person=mapping.USER_FIELD,
+        org_unit=mapping.ASSOCIATED_ORG_UNIT_FIELD,
+        address_type=mapping.ADDRESS_TYPE_FIELD,
+        engagement=mapping.ASSOCIATED_FUNCTION_FIELD,
+        addresses=(mapping.ADDRESSES_FIELD, mapping.Project.ENTRIES),
+    )
 
     @classmethod
     async def _get_mo_object_from_effect(
         cls, effect, start, end, funcid, flat: bool = False
     ):
-        person_uuid = mapping.USER_FIELD.get_uuid(effect)
-        org_unit_uuid = mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(effect)
-        address_type_uuid = mapping.ADDRESS_TYPE_FIELD.get_uuid(effect)
-        engagement_uuid = mapping.ASSOCIATED_FUNCTION_FIELD.get_uuid(effect)
-        visibility_uuid = mapping.USER_FIELD.get_uuid(effect)
-
-        scope = mapping.ADDRESSES_FIELD(effect)[0].get("objekttype")
+        (
+            person_uuid,
+            org_unit_uuid,
+            address_type_uuid,
+            engagement_uuid,
+            addresses,
+        ) = cls.projection(effect)
+        visibility_uuid = person_uuid
+
+        scope = addresses[0].get("objekttype")
         handler = await base.get_handler_for_scope(scope).from_effect(effect)
 
         base_obj_task = create_task(
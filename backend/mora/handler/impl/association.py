@@ -32,6 +32,14 @@ MO_OBJ_TYPE = Dict[str, Any]
 @reading.register(ROLE_TYPE)
 class AssociationReader(reading.OrgFunkReadingHandler):
     function_key = mapping.ASSOCIATION_KEY
+    projection = mapping.Projection(
+        person=mapping.USER_FIELD,
+        org_unit=mapping.ASSOCIATED_ORG_UNIT_FIELD,
+        association_type=mapping.ORG_FUNK_TYPE_FIELD,
+        substitute=mapping.ASSOCIATED_FUNCTION_FIELD,
+        classes=(mapping.ORG_FUNK_CLASSES_FIELD, mapping.Project.UUIDS),
+        primary=mapping.PRIMARY_FIELD,
+    )
 
     @classmethod
     async def get_from_type(
@@ -108,14 +116,18 @@ class AssociationReader(reading.OrgFunkReadingHandler):
     async def _get_mo_object_from_effect(
         cls, effect, start, end, funcid, flat: bool = False
     ):
-        person = mapping.USER_FIELD.get_uuid(effect)
-        org_unit = mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(effect)
-        association_type = mapping.ORG_FUNK_TYPE_FIELD.get_uuid(effect)
-        substitute_uuid = mapping.ASSOCIATED_FUNCTION_FIELD.get_uuid(effect)
+        (
+            person,
+            org_unit,
+            association_type,
+            substitute_uuid,
+            classes,
+            primary,
+        ) = cls.projection(effect)
         only_primary_uuid = util.get_args_flag("only_primary_uuid")
-        need_sub = substitute_uuid and util.is_substitute_allowed(association_type)
-        classes = list(mapping.ORG_FUNK_CLASSES_FIELD.get_uuids(effect))
-        primary = mapping.PRIMARY_FIELD.get_uuid(effect)
+        need_sub = substitute_uuid and (
+            await util.is_substitute_allowed_async(association_type)
+        )
 
         # Await base object
         base_obj = await super()._get_mo_object_from_effect(effect, start, end, funcid)
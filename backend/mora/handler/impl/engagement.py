@@ -2,9 +2,11 @@
 # SPDX-License-Identifier: MPL-2.0
 from asyncio import create_task
 from asyncio import gather
+from functools import partial
 from typing import Any
 from typing import Dict
 from typing import Optional
+from typing import Tuple
 from typing import Union
 from uuid import UUID
 
@@ -29,30 +31,40 @@ logger = get_logger()
 @reading.register(ROLE_TYPE)
 class EngagementReader(reading.OrgFunkReadingHandler):
     function_key = mapping.ENGAGEMENT_KEY
+    deferred_lookups = True
+    projection = mapping.Projection(
+        person=mapping.USER_FIELD,
+        org_unit=mapping.ASSOCIATED_ORG_UNIT_FIELD,
+        job_function=mapping.JOB_FUNCTION_FIELD,
+        engagement_type=mapping.ORG_FUNK_TYPE_FIELD,
+        primary=mapping.PRIMARY_FIELD,
+        extensions=(mapping.ORG_FUNK_UDVIDELSER_FIELD, mapping.Project.ENTRIES),
+    )
 
     @classmethod
     async def _get_mo_object_from_effect(
         cls, effect, start, end, funcid, flat: bool = False
     ):
 
-        person = mapping.USER_FIELD.get_uuid(effect)
-        org_unit = mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(effect)
-        job_function = mapping.JOB_FUNCTION_FIELD.get_uuid(effect)
-        engagement_type = mapping.ORG_FUNK_TYPE_FIELD.get_uuid(effect)
-
-        primary = mapping.PRIMARY_FIELD.get_uuid(effect)
-        extensions = mapping.ORG_FUNK_UDVIDELSER_FIELD(effect)
+        (
+            person,
+            org_unit,
+            job_function,
+            engagement_type,
+            primary,
+            extensions,
+        ) = cls.projection(effect)
         extensions = extensions[0] if extensions else {}
         fraction = extensions.get("fraktion", None)
 
-        base_obj = await create_task(
-            super()._get_mo_object_from_effect(effect, start, end, funcid)
-        )
+        base_obj = await super()._get_mo_object_from_effect(effect, start, end, funcid)
         only_primary_uuid = util.get_args_flag("only_primary_uuid")
 
         # TODO this should only be done in graphql when requested
-        is_primary = await create_task(
-            cls._is_primary(request_wide_bulk.connector, person, primary)
+        is_primary = (
+            reading.lookup(cls._is_request_primary, person, primary)
+            if util.get_args_flag("calculate_primary")
+            else None
         )
 
         if is_graphql():
@@ -69,45 +81,36 @@ class EngagementReader(reading.OrgFunkReadingHandler):
                 **cls._get_extension_fields(extensions),
             }
 
-        person_task = create_task(
-            employee.request_bulked_get_one_employee(
-                userid=person, only_primary_uuid=only_primary_uuid
-            )
-        )
-
-        org_unit_task = create_task(
-            orgunit.request_bulked_get_one_orgunit(
+        r = {
+            **base_obj,
+            mapping.PERSON: reading.lookup(
+                employee.request_bulked_get_one_employee,
+                userid=person,
+                only_primary_uuid=only_primary_uuid,
+            ),
+            mapping.ORG_UNIT: reading.lookup(
+                orgunit.request_bulked_get_one_orgunit,
                 unitid=org_unit,
                 details=orgunit.UnitDetails.MINIMAL,
                 only_primary_uuid=only_primary_uuid,
+            ),
+            mapping.JOB_FUNCTION: reading.lookup(
+                facet.request_bulked_get_one_class_full,
+                job_function,
+                only_primary_uuid=only_primary_uuid,
+            ),
+            mapping.ENGAGEMENT_TYPE: reading.lookup(
+                facet.request_bulked_get_one_class_full,
+                engagement_type,
+                only_primary_uuid=only_primary_uuid,
+            ),
+            mapping.PRIMARY: reading.lookup(
+                facet.request_bulked_get_one_class_full,
+                primary,
+                only_primary_uuid=only_primary_uuid,
             )
-        )
-
-        job_function_task = create_task(
-            facet.request_bulked_get_one_class_full(
-                job_function, only_primary_uuid=only_primary_uuid
-            )
-        )
-        engagement_type_task = create_task(
-            facet.request_bulked_get_one_class_full(
-                engagement_type, only_primary_uuid=only_primary_uuid
-            )
-        )
-
-        if primary:
-            primary_task = create_task(
-                facet.request_bulked_get_one_class_full(
-                    primary, only_primary_uuid=only_primary_uuid
-                )
-            )
-
-        r = {
-            **base_obj,
-            mapping.PERSON: await person_task,
-            mapping.ORG_UNIT: await org_unit_task,
-            mapping.JOB_FUNCTION: await job_function_task,
-            mapping.ENGAGEMENT_TYPE: await engagement_type_task,
-            mapping.PRIMARY: (await primary_task) if primary else None,
+            if primary
+            else None,
             mapping.IS_PRIMARY: is_primary,
             mapping.FRACTION: fraction,
             **cls._get_extension_fields(extensions),
@@ -129,6 +132,11 @@ class EngagementReader(reading.OrgFunkReadingHandler):
             for mo_key, lora_key in mapping.EXTENSION_ATTRIBUTE_MAPPING
         }
 
+    @classmethod
+    async def _is_request_primary(cls, person: str, primary: str) -> Optional[bool]:
+        """Like :meth:`_is_primary`, using the connector of the request."""
+        return await cls._is_primary(request_wide_bulk.connector, person, primary)
+
     @classmethod
     async def _is_primary(
         cls,
@@ -144,7 +152,8 @@ class EngagementReader(reading.OrgFunkReadingHandler):
         used for ranking the classes.
 
         Compare the primary class to the primary classes of the other
-        engagements of the person, and determine if it has the highest priority
+        engagements of the person, and determine if it has the highest priority.
+        The highest priority is only found once per person during a request.
 
         :param c: A LoRa connector
         :param person: The UUID of a person
@@ -156,6 +165,32 @@ class EngagementReader(reading.OrgFunkReadingHandler):
         if not util.get_args_flag("calculate_primary"):
             return None
 
+        count, primary_class = await request_wide_bulk.memoized(
+            ("engagement_primary_class", person, c.validity, c.start, c.end),
+            partial(cls._get_primary_class, c, person),
+        )
+
+        # If only engagement
+        if count <= 1:
+            return True
+
+        if primary_class is None:
+            return None
+        return primary_class == primary
+
+    @classmethod
+    async def _get_primary_class(
+        cls, c: lora.Connector, person: str
+    ) -> Tuple[int, Optional[str]]:
+        """
+        Find the highest ranked primary class of the engagements of a person.
+
+        :param c: A LoRa connector
+        :param person: The UUID of a person
+
+        :return: The number of engagement effects of the person, and the highest
+            ranked primary class among them, if any
+        """
         objs = [
             obj
             for _, obj in await cls._get_lora_object(c, {"tilknyttedebrugere": person})
@@ -173,19 +208,19 @@ class EngagementReader(reading.OrgFunkReadingHandler):
             if util.is_reg_valid(effect)
         ]
 
-        # If only engagement
         if len(engagements) <= 1:
-            return True
+            return len(engagements), None
 
-        engagement_primary_uuids = [
+        engagement_primary_uuids = {
             mapping.PRIMARY_FIELD.get_uuid(engagement) for engagement in engagements
-        ]
+        }
 
         sorted_classes = await get_sorted_primary_class_list(c)
 
         for class_id, _ in sorted_classes:
             if class_id in engagement_primary_uuids:
-                return class_id == primary
+                return len(engagements), class_id
+        return len(engagements), None
 
 
 async def get_engagement(c: lora.Connector, uuid: UUID) -> Optional[Dict[str, Any]]:
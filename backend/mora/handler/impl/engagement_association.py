@@ -1,6 +1,5 @@
 # SPDX-FileCopyrightText: 2019-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
-from asyncio import create_task
 from typing import Any
 from typing import Dict
 
@@ -24,46 +23,44 @@ MO_OBJ_TYPE = Dict[str, Any]
 @reading.register(ROLE_TYPE)
 class EngagementAssociationReader(reading.OrgFunkReadingHandler):
     function_key = mapping.ENGAGEMENT_ASSOCIATION_KEY
+    deferred_lookups = True
+    projection = mapping.Projection(
+        org_unit=mapping.ASSOCIATED_ORG_UNIT_FIELD,
+        association_type=mapping.ORG_FUNK_TYPE_FIELD,
+        engagement=mapping.ASSOCIATED_FUNCTION_FIELD,
+    )
 
     @classmethod
     async def _get_mo_object_from_effect(
         cls, effect, start, end, funcid, flat: bool = False
     ):
-        org_unit = mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(effect)
-        association_type = mapping.ORG_FUNK_TYPE_FIELD.get_uuid(effect)
-        engagement_uuid = mapping.ASSOCIATED_FUNCTION_FIELD.get_uuid(effect)
+        org_unit, association_type, engagement_uuid = cls.projection(effect)
 
         only_primary_uuid = util.get_args_flag("only_primary_uuid")
 
-        base_obj = create_task(
-            super()._get_mo_object_from_effect(effect, start, end, funcid)
-        )
+        base_obj = await super()._get_mo_object_from_effect(effect, start, end, funcid)
 
         if only_primary_uuid:
             engagement = {mapping.UUID: engagement_uuid}
         else:
-            engagement = await get_engagement(
-                request_wide_bulk.connector, uuid=engagement_uuid
+            engagement = reading.lookup(
+                get_engagement, request_wide_bulk.connector, uuid=engagement_uuid
             )
 
-        org_unit_task = create_task(
-            orgunit.request_bulked_get_one_orgunit(
+        r = {
+            **base_obj,
+            mapping.ENGAGEMENT: engagement,
+            mapping.ORG_UNIT: reading.lookup(
+                orgunit.request_bulked_get_one_orgunit,
                 org_unit,
                 details=orgunit.UnitDetails.MINIMAL,
                 only_primary_uuid=only_primary_uuid,
-            )
-        )
-
-        association_type_task = create_task(
-            facet.request_bulked_get_one_class_full(
-                association_type, only_primary_uuid=only_primary_uuid
-            )
-        )
-        r = {
-            **await base_obj,
-            mapping.ENGAGEMENT: engagement,
-            mapping.ORG_UNIT: await org_unit_task,
-            mapping.ENGAGEMENT_ASSOCIATION_TYPE: await association_type_task,
+            ),
+            mapping.ENGAGEMENT_ASSOCIATION_TYPE: reading.lookup(
+                facet.request_bulked_get_one_class_full,
+                association_type,
+                only_primary_uuid=only_primary_uuid,
+            ),
         }
 
         return r
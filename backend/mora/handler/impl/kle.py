@@ -20,14 +20,17 @@ logger = get_logger()
 @reading.register(ROLE_TYPE)
 class KLEReader(reading.OrgFunkReadingHandler):
     function_key = mapping.KLE_KEY
+    projection = mapping.Projection(
+        org_unit=mapping.ASSOCIATED_ORG_UNIT_FIELD,
+        kle_number=mapping.ORG_FUNK_TYPE_FIELD,
+        kle_aspects=(mapping.KLE_ASPECT_FIELD, mapping.Project.UUIDS),
+    )
 
     @classmethod
     async def _get_mo_object_from_effect(
         cls, effect, start, end, funcid, flat: bool = False
     ):
-        org_unit_uuid = mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(effect)
-        kle_number_uuid = mapping.ORG_FUNK_TYPE_FIELD.get_uuid(effect)
-        kle_aspect_uuids = list(mapping.KLE_ASPECT_FIELD.get_uuids(effect))
+        org_unit_uuid, kle_number_uuid, kle_aspect_uuids = cls.projection(effect)
 
         base_obj = await create_task(
             super()._get_mo_object_from_effect(effect, start, end, funcid)
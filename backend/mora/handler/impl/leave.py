@@ -1,7 +1,5 @@
 # SPDX-FileCopyrightText: 2019-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
-from asyncio import create_task
-
 from structlog import get_logger
 
 from .. import reading
@@ -18,21 +16,27 @@ ROLE_TYPE = "leave"
 logger = get_logger()
 
 
+async def get_present_engagement(uuid):
+    return await get_engagement(lora.Connector(validity="present"), uuid=uuid)
+
+
 @reading.register(ROLE_TYPE)
 class LeaveReader(reading.OrgFunkReadingHandler):
     function_key = mapping.LEAVE_KEY
+    deferred_lookups = True
+    projection = mapping.Projection(
+        person=mapping.USER_FIELD,
+        leave_type=mapping.ORG_FUNK_TYPE_FIELD,
+        engagement=mapping.ASSOCIATED_FUNCTION_FIELD,
+    )
 
     @classmethod
     async def _get_mo_object_from_effect(
         cls, effect, start, end, funcid, flat: bool = False
     ):
-        person = mapping.USER_FIELD.get_uuid(effect)
-        leave_type = mapping.ORG_FUNK_TYPE_FIELD.get_uuid(effect)
-        engagement_uuid = mapping.ASSOCIATED_FUNCTION_FIELD.get_uuid(effect)
+        person, leave_type, engagement_uuid = cls.projection(effect)
 
-        base_obj = await create_task(
-            super()._get_mo_object_from_effect(effect, start, end, funcid)
-        )
+        base_obj = await super()._get_mo_object_from_effect(effect, start, end, funcid)
         only_primary_uuid = util.get_args_flag("only_primary_uuid")
 
         if is_graphql():
@@ -43,31 +47,26 @@ class LeaveReader(reading.OrgFunkReadingHandler):
                 "engagement_uuid": engagement_uuid,
             }
 
-        person_task = create_task(
-            employee.request_bulked_get_one_employee(
-                person, only_primary_uuid=only_primary_uuid
-            )
-        )
-
-        leave_type_task = create_task(
-            facet.request_bulked_get_one_class(
-                leave_type, only_primary_uuid=only_primary_uuid
-            )
-        )
-
         if only_primary_uuid:
             engagement = {mapping.UUID: engagement_uuid}
         else:
             # We look up whatever engagement is active at the present time period
             # to account for edge cases where the engagement might have changed or is
             # no longer active during the time period
-            present_connector = lora.Connector(validity="present")
-            engagement = await get_engagement(present_connector, uuid=engagement_uuid)
+            engagement = reading.lookup(get_present_engagement, engagement_uuid)
 
         r = {
             **base_obj,
-            mapping.PERSON: await person_task,
-            mapping.LEAVE_TYPE: await leave_type_task,
+            mapping.PERSON: reading.lookup(
+                employee.request_bulked_get_one_employee,
+                person,
+                only_primary_uuid=only_primary_uuid,
+            ),
+            mapping.LEAVE_TYPE: reading.lookup(
+                facet.request_bulked_get_one_class,
+                leave_type,
+                only_primary_uuid=only_primary_uuid,
+            ),
             mapping.ENGAGEMENT: engagement,
         }
 
@@ -3,12 +3,17 @@
 from asyncio import create_task
 from asyncio import gather
 from datetime import datetime
+from functools import partial
+from itertools import chain
 from typing import Any
 from typing import Awaitable
 from typing import Dict
 from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Set
 
+from strawberry.dataloader import DataLoader
 from structlog import get_logger
 
 from .. import reading
@@ -18,6 +23,8 @@ from ...graphapi.middleware import is_graphql
 from ...service import employee
 from ...service import facet
 from ...service import orgunit
+from ...service import orgunit_index
+from mora.request_scoped.bulking import request_wide_bulk
 
 ROLE_TYPE = "manager"
 
@@ -27,6 +34,13 @@ logger = get_logger()
 @reading.register(ROLE_TYPE)
 class ManagerReader(reading.OrgFunkReadingHandler):
     function_key = mapping.MANAGER_KEY
+    projection = mapping.Projection(
+        person=mapping.USER_FIELD,
+        manager_type=mapping.ORG_FUNK_TYPE_FIELD,
+        manager_level=mapping.MANAGER_LEVEL_FIELD,
+        responsibilities=(mapping.RESPONSIBILITY_FIELD, mapping.Project.UUIDS),
+        org_unit=mapping.ASSOCIATED_ORG_UNIT_FIELD,
+    )
 
     @classmethod
     async def get_from_type(
@@ -40,38 +54,123 @@ class ManagerReader(reading.OrgFunkReadingHandler):
 
     @classmethod
     async def get_inherited_manager(cls, c, type, object_id):
+        if type != "ou":
+            return await super().get(c, {cls.SEARCH_FIELDS[type]: object_id})
+
+        # Units looked up concurrently during the request, e.g. those of a listing,
+        # are resolved together
+        loader = await request_wide_bulk.memoized(
+            ("inherited_managers_loader", c.validity, c.start, c.end),
+            partial(cls._get_inherited_managers_loader, c),
+        )
+        return await loader.load(str(object_id))
 
-        search_fields = {cls.SEARCH_FIELDS[type]: object_id}
+    @classmethod
+    async def _get_inherited_managers_loader(cls, c) -> DataLoader:
+        async def load_managers(unitids: List[str]) -> List[List[Dict[str, Any]]]:
+            managers = await cls.get_inherited_managers(c, unitids)
+            return [managers[unitid] for unitid in unitids]
 
-        manager = list(await super().get(c, search_fields))
+        return DataLoader(load_fn=load_managers)
 
-        if not manager:
-            only_primary_uuid = util.get_args_flag("only_primary_uuid")
-            ou = await orgunit.get_one_orgunit(
-                c,
-                object_id,
-                details=orgunit.UnitDetails.FULL,
-                only_primary_uuid=only_primary_uuid,
+    @classmethod
+    async def get_inherited_managers(
+        cls, c, unitids: Iterable[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Retrieve the managers of each of the units, inherited from the nearest
+        ancestor with managers if the unit has none itself.
+
+        The managers of all ancestors are searched for at once, and shared with
+        other lookups during the request.
+
+        :param unitids: UUIDs of organisation units
+        :return: dict from unit UUID to list of MO manager objects
+        """
+        unitids = list(map(str, unitids))
+        ancestors = await cls._get_ancestors(c, unitids)
+
+        managers = await request_wide_bulk.memoized_many(
+            ("managers", c.validity, c.start, c.end),
+            chain.from_iterable(ancestors.values()),
+            partial(cls._get_managers_by_unit, c),
+        )
+
+        return {
+            unitid: next(
+                (managers[uuid] for uuid in ancestors[unitid] if managers[uuid]), []
+            )
+            for unitid in unitids
+        }
+
+    @classmethod
+    async def _get_ancestors(cls, c, unitids: List[str]) -> Dict[str, List[str]]:
+        """The units followed by their ancestors, up to the top-level unit."""
+        if orgunit_index.is_shared(c):
+            chains = await gather(
+                *(orgunit_index.get_ancestors(c, unitid) for unitid in unitids)
             )
-            try:
-                parent_id = ou[mapping.PARENT][mapping.UUID]
-            except (TypeError, KeyError):
-                return manager
+            # Units missing from the index are still searched
+            return {unitid: chain or [unitid] for unitid, chain in zip(unitids, chains)}
+
+        # Otherwise, walk up the tree level by level, reading only the parents
+        parents: Dict[str, Optional[str]] = {}
+        units: Set[str] = set()
+        pending = set(unitids)
+        while pending:
+            objs = dict(await c.organisationenhed.get_all_by_uuid(uuids=pending))
+            units.update(objs)
+            for uuid in pending:
+                parents[uuid] = (
+                    mapping.PARENT_FIELD.get_uuid(objs[uuid]) if uuid in objs else None
+                )
+            pending = {
+                parent
+                for parent in parents.values()
+                if parent is not None and parent not in parents
+            }
 
-            return await cls.get_inherited_manager(c, type, parent_id)
+        ancestors = {}
+        for unitid in unitids:
+            ancestors[unitid] = []
+            uuid = unitid
+            # Stop at the organisation, or if the hierarchy is cyclic
+            while uuid in units and uuid not in ancestors[unitid]:
+                ancestors[unitid].append(uuid)
+                uuid = parents[uuid]
+            ancestors[unitid] = ancestors[unitid] or [unitid]
+        return ancestors
 
-        return manager
+    @classmethod
+    async def _get_managers_by_unit(
+        cls, c, unitids: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """The managers of each of the units, using a single search."""
+        managers = await super().get(c, {cls.SEARCH_FIELDS["ou"]: unitids})
+
+        managers_by_unit: Dict[str, List[Dict[str, Any]]] = {
+            unitid: [] for unitid in unitids
+        }
+        for manager in managers:
+            if is_graphql():
+                org_unit = manager.get("org_unit_uuid")
+            else:
+                org_unit = (manager.get(mapping.ORG_UNIT) or {}).get(mapping.UUID)
+            if org_unit in managers_by_unit:
+                managers_by_unit[org_unit].append(manager)
+        return managers_by_unit
 
     @classmethod
     async def _get_mo_object_from_effect(
         cls, effect, start, end, funcid, flat: bool = False
     ):
 
-        person = mapping.USER_FIELD.get_uuid(effect)
-        manager_type = mapping.ORG_FUNK_TYPE_FIELD.get_uuid(effect)
-        manager_level = mapping.MANAGER_LEVEL_FIELD.get_uuid(effect)
-        responsibilities = list(mapping.RESPONSIBILITY_FIELD.get_uuids(effect))
-        org_unit = mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(effect)
+        (
+            person,
+            manager_type,
+            manager_level,
+            responsibilities,
+            org_unit,
+        ) = cls.projection(effect)
 
         base_obj = await create_task(
             super()._get_mo_object_from_effect(effect, start, end, funcid)
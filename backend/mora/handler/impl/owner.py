@@ -39,6 +39,12 @@ logger = get_logger()
 @reading.register(ROLE_TYPE)
 class OwnerReader(reading.OrgFunkReadingHandler):
     function_key = mapping.OWNER
+    projection = mapping.Projection(
+        owned_person=mapping.USER_FIELD,
+        org_unit=mapping.ASSOCIATED_ORG_UNIT_FIELD,
+        owner=mapping.EMPLOYEE_PERSON_FIELD,
+        extensions=(mapping.ORG_FUNK_UDVIDELSER_FIELD, mapping.Project.ENTRIES),
+    )
 
     @classmethod
     async def get_from_type(
@@ -168,10 +174,7 @@ class OwnerReader(reading.OrgFunkReadingHandler):
         cls, effect, start, end, funcid, flat: bool = False
     ):
 
-        owned_person = mapping.USER_FIELD.get_uuid(effect)
-        org_unit = mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(effect)
-        owner_uuid = mapping.EMPLOYEE_PERSON_FIELD.get_uuid(effect)
-        extensions = mapping.ORG_FUNK_UDVIDELSER_FIELD(effect)
+        owned_person, org_unit, owner_uuid, extensions = cls.projection(effect)
         extensions = extensions[0] if extensions else {}
         inference_priority_str = extensions.get(EXTENSION_1, None)
         inference_priority = None
@@ -26,6 +26,9 @@ T = TypeVar("T")
 @reading.register(ROLE_TYPE)
 class RoleReader(reading.OrgFunkReadingHandler):
     function_key = mapping.RELATED_UNIT_KEY
+    projection = mapping.Projection(
+        org_units=(mapping.ASSOCIATED_ORG_UNIT_FIELD, mapping.Project.UUIDS),
+    )
 
     @staticmethod
     async def get_sorted_org_units(aws: Iterable[Awaitable[T]]) -> T:
@@ -43,7 +46,7 @@ class RoleReader(reading.OrgFunkReadingHandler):
     async def _get_mo_object_from_effect(
         cls, effect, start, end, funcid, flat: bool = False
     ) -> Dict[str, Union[Awaitable, Any]]:
-        org_units_uuid = mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuids(effect)
+        (org_units_uuid,) = cls.projection(effect)
 
         base_obj = await super()._get_mo_object_from_effect(effect, start, end, funcid)
         if is_graphql():
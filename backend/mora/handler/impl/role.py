@@ -1,7 +1,5 @@
 # SPDX-FileCopyrightText: 2019-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
-from asyncio import create_task
-
 from structlog import get_logger
 
 from .. import reading
@@ -20,18 +18,20 @@ logger = get_logger()
 @reading.register(ROLE_TYPE)
 class RoleReader(reading.OrgFunkReadingHandler):
     function_key = mapping.ROLE_KEY
+    deferred_lookups = True
+    projection = mapping.Projection(
+        person=mapping.USER_FIELD,
+        org_unit=mapping.ASSOCIATED_ORG_UNIT_FIELD,
+        role_type=mapping.ORG_FUNK_TYPE_FIELD,
+    )
 
     @classmethod
     async def _get_mo_object_from_effect(
         cls, effect, start, end, funcid, flat: bool = False
     ):
-        person_uuid = mapping.USER_FIELD.get_uuid(effect)
-        org_unit_uuid = mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(effect)
-        role_type_uuid = mapping.ORG_FUNK_TYPE_FIELD.get_uuid(effect)
+        person_uuid, org_unit_uuid, role_type_uuid = cls.projection(effect)
 
-        base_obj = await create_task(
-            super()._get_mo_object_from_effect(effect, start, end, funcid)
-        )
+        base_obj = await super()._get_mo_object_from_effect(effect, start, end, funcid)
         if is_graphql():
             return {
                 **base_obj,
@@ -42,30 +42,24 @@ class RoleReader(reading.OrgFunkReadingHandler):
 
         only_primary_uuid = util.get_args_flag("only_primary_uuid")
 
-        person_task = create_task(
-            employee.request_bulked_get_one_employee(
-                person_uuid, only_primary_uuid=only_primary_uuid
-            )
-        )
-
-        org_unit_task = create_task(
-            orgunit.request_bulked_get_one_orgunit(
+        r = {
+            **base_obj,
+            mapping.PERSON: reading.lookup(
+                employee.request_bulked_get_one_employee,
+                person_uuid,
+                only_primary_uuid=only_primary_uuid,
+            ),
+            mapping.ORG_UNIT: reading.lookup(
+                orgunit.request_bulked_get_one_orgunit,
                 org_unit_uuid,
                 details=orgunit.UnitDetails.MINIMAL,
                 only_primary_uuid=only_primary_uuid,
-            )
-        )
-        role_type_task = create_task(
-            facet.request_bulked_get_one_class_full(
-                role_type_uuid, only_primary_uuid=only_primary_uuid
-            )
-        )
-
-        r = {
-            **base_obj,
-            mapping.PERSON: await person_task,
-            mapping.ORG_UNIT: await org_unit_task,
-            mapping.ROLE_TYPE: await role_type_task,
+            ),
+            mapping.ROLE_TYPE: reading.lookup(
+                facet.request_bulked_get_one_class_full,
+                role_type_uuid,
+                only_primary_uuid=only_primary_uuid,
+            ),
         }
 
         return r
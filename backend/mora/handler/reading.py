@@ -3,9 +3,12 @@
 import abc
 from asyncio import create_task
 from asyncio import gather
+from dataclasses import dataclass
 from datetime import datetime
 from inspect import isawaitable
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import Dict
 from typing import Iterable
 from typing import List
@@ -39,7 +42,37 @@ def get_handler_for_type(object_type) -> "ReadingHandler":
         exceptions.ErrorCodes.E_UNKNOWN_ROLE_TYPE(type=object_type)
 
 
+@dataclass(frozen=True)
+class Lookup:
+    """
+    Nested lookup in a MO object, such as its person or organisation unit.
+
+    Handlers with ``deferred_lookups`` convert effects into MO objects with lookups
+    as values, which :meth:`OrgFunkReadingHandler.get` then resolves at once for all
+    the objects, resolving equal lookups only once.
+    """
+
+    fn: Callable[..., Awaitable]
+    args: Tuple[Any, ...] = ()
+    kwargs: Tuple[Tuple[str, Any], ...] = ()
+
+    async def resolve(self) -> Any:
+        result = await self.fn(*self.args, **dict(self.kwargs))
+        # The request bulked lookups return an awaitable of their result
+        if isawaitable(result):
+            result = await result
+        return result
+
+
+def lookup(fn: Callable[..., Awaitable], *args: Any, **kwargs: Any) -> Lookup:
+    return Lookup(fn, args, tuple(kwargs.items()))
+
+
 class ReadingHandler:
+    # Whether _get_mo_object_from_effect never awaits, and defers all its lookups
+    # with lookup(), such that effects can be converted without a task each
+    deferred_lookups = False
+
     @classmethod
     @abc.abstractmethod
     async def get(
@@ -104,30 +137,6 @@ class ReadingHandler:
         """
         pass
 
-    @classmethod
-    async def __async_get_mo_object_from_effect(
-        cls, c, function_id, function_obj, flat: bool = False
-    ) -> List[Any]:
-        """
-        just a wrapper that makes calls in parallel. Not encapsulating / motivated by
-        business logic
-        :param c: A LoRa connector
-        :param function_id: UUID from object_tuple
-        :param function_id: object from object_tuple
-        :return: List of whatever this returns get_mo_object_from_effect
-        """
-        return await gather(
-            *[
-                create_task(
-                    cls._get_mo_object_from_effect(
-                        effect, start, end, function_id, flat
-                    )
-                )
-                for start, end, effect in (await cls._get_effects(c, function_obj))
-                if util.is_reg_valid(effect)
-            ]
-        )
-
     @classmethod
     async def _get_obj_effects(
         cls,
@@ -141,40 +150,38 @@ class ReadingHandler:
         :param c: A LoRa connector
         :param object_tuples: An iterable of (UUID, object) tuples
         """
-        # flatten a bunch of nested tasks
-        return [
-            x
-            for sublist in await gather(
-                *[
-                    create_task(
-                        cls.__async_get_mo_object_from_effect(
-                            c, function_id, function_obj, flat
-                        )
-                    )
-                    for function_id, function_obj in object_tuples
-                ]
-            )
-            for x in sublist
+        effects = [
+            (function_id, start, end, effect)
+            for function_id, function_obj in object_tuples
+            for start, end, effect in await cls._get_effects(c, function_obj)
+            if util.is_reg_valid(effect)
         ]
 
+        if cls.deferred_lookups:
+            return [
+                await cls._get_mo_object_from_effect(
+                    effect, start, end, function_id, flat
+                )
+                for function_id, start, end, effect in effects
+            ]
+
+        return await gather(
+            *[
+                create_task(
+                    cls._get_mo_object_from_effect(
+                        effect, start, end, function_id, flat
+                    )
+                )
+                for function_id, start, end, effect in effects
+            ]
+        )
+
 
 class OrgFunkReadingHandler(ReadingHandler):
     function_key = None
 
     SEARCH_FIELDS = {"e": "tilknyttedebrugere", "ou": "tilknyttedeenheder"}
 
-    @staticmethod
-    async def assign_when_ready(mapping, key, awaitable_value):
-        """
-        convenient wrapper allowing easy creation of tasks
-
-        :param mapping:
-        :param key:
-        :param awaitable_value:
-        :return:
-        """
-        mapping[key] = await awaitable_value
-
     @classmethod
     async def get(
         cls,
@@ -193,20 +200,34 @@ class OrgFunkReadingHandler(ReadingHandler):
             return mo_objects
 
         # Mutate objects by awaiting as needed. This delayed evaluation allows bulking.
-        tasks = []
+        # All the values are awaited at once, and equal lookups only once.
+        pending: Dict[Any, List[Tuple[Dict[str, Any], str]]] = {}
         for mo_object in mo_objects:
             for key, val in mo_object.items():
-                if isawaitable(val):
-                    tasks.append(
-                        create_task(
-                            cls.assign_when_ready(
-                                mapping=mo_object, key=key, awaitable_value=val
-                            )
-                        )
-                    )
-        await gather(*tasks)  # ensure everything has completed
+                if isinstance(val, Lookup) or isawaitable(val):
+                    pending.setdefault(val, []).append((mo_object, key))
+        results = await gather(
+            *[val.resolve() if isinstance(val, Lookup) else val for val in pending]
+        )
+        for targets, result in zip(pending.values(), results):
+            for mo_object, key in targets:
+                mo_object[key] = result
         return mo_objects
 
+    @classmethod
+    async def get_uuids(cls, c, search_fields) -> List[str]:
+        """Retrieve the UUIDs of the LoRA objects matching 'search_fields',
+        without reading the objects themselves.
+
+        :param search_fields: search fields as for :meth:`get`
+        :return: list of UUIDs
+        """
+        if mapping.UUID in search_fields:
+            return list(map(str, search_fields[mapping.UUID]))
+        return await c.organisationfunktion.fetch(
+            funktionsnavn=cls.function_key, **search_fields
+        )
+
     @classmethod
     async def get_from_type(
         cls, c, type, objid, changed_since: Optional[datetime] = None
@@ -235,6 +256,22 @@ class OrgFunkReadingHandler(ReadingHandler):
         tuple_gen = await cls._get_lora_object(c, cls._get_search_fields(type, objid))
         return len(list(filter(lambda tup: util.is_reg_valid(tup[1]), tuple_gen)))
 
+    @classmethod
+    async def get_counts(cls, c, type, objids: Iterable[str]) -> Dict[str, int]:
+        """Retrieve the number of valid LoRA objects of type 'type' related to
+        each of the object IDs 'objids', using a single search.
+
+        :param type: str
+        :param objids: UUIDs
+        :return: dict from object ID to count
+        """
+        return await c.organisationfunktion.get_counts(
+            cls.SEARCH_FIELDS[type],
+            objids,
+            valid_only=True,
+            funktionsnavn=cls.function_key,
+        )
+
     @classmethod
     def _get_search_fields(cls, type, objid):
         """Return search fields suitable to retrieve a LoRA object of type
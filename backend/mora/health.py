@@ -11,11 +11,33 @@ from starlette.status import HTTP_204_NO_CONTENT
 from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
 
 from mora.graphapi.shim import execute_graphql
+from mora.graphapi.shim import register_query
 from mora.graphapi.health import oio_rest, keycloak, configuration_database
 
 
 router = APIRouter()
 
+HEALTHS_QUERY = register_query(
+    """
+    query HealthQuery {
+      healths {
+        identifier
+        status
+      }
+    }
+    """
+)
+
+HEALTH_QUERY = register_query(
+    """
+    query HealthQuery($identifier: String!) {
+      healths(identifiers: [$identifier]) {
+        status
+      }
+    }
+    """
+)
+
 
 @router.get("/live", status_code=HTTP_204_NO_CONTENT)
 async def liveness():
@@ -44,15 +66,7 @@ async def readiness(response: Response):
 
 @router.get("/")
 async def root() -> Dict[str, bool]:
-    query = """
-    query HealthQuery {
-      healths {
-        identifier
-        status
-      }
-    }
-    """
-    r = await execute_graphql(query)
+    r = await execute_graphql(HEALTHS_QUERY)
     if r.errors:
         raise ValueError(r.errors)
 
@@ -61,15 +75,7 @@ async def root() -> Dict[str, bool]:
 
 @router.get("/{identifier}")
 async def healthcheck(identifier: str) -> Optional[bool]:
-    query = """
-    query HealthQuery($identifier: String!) {
-      healths(identifiers: [$identifier]) {
-        status
-      }
-    }
-    """
-
-    r = await execute_graphql(query, variable_values={"identifier": identifier})
+    r = await execute_graphql(HEALTH_QUERY, variable_values={"identifier": identifier})
     if r.errors:
         raise ValueError(r.errors)
     if not r.data["healths"]:
@@ -3,13 +3,21 @@
 from __future__ import generator_stop
 
 import asyncio
+import json
 import re
 import uuid
 from asyncio import gather
+from bisect import bisect_left
+from bisect import bisect_right
+from collections import OrderedDict
 from collections import defaultdict
+from contextvars import ContextVar
+from datetime import date
 from datetime import datetime
+from datetime import timezone
 from enum import Enum
 from enum import unique
+from functools import lru_cache
 from functools import partial
 from itertools import starmap
 from typing import Any
@@ -19,6 +27,7 @@ from typing import Container
 from typing import Coroutine
 from typing import Dict
 from typing import FrozenSet
+from typing import Hashable
 from typing import ItemsView
 from typing import Iterable
 from typing import List
@@ -29,15 +38,20 @@ from typing import Tuple
 from typing import TypeVar
 from typing import Union
 
-import lora_utils
+from aiohttp import ClientConnectionError
+from aiohttp import ClientResponse
 from aiohttp import ClientSession
-from fastapi.encoders import jsonable_encoder
+from aiohttp import ClientTimeout
+from aiohttp import TCPConnector
+from aiohttp import TraceConfig
 from strawberry.dataloader import DataLoader
 from structlog import get_logger
 
+from . import codec
 from . import config
 from . import exceptions
 from . import util
+from .cache import TTLCache
 from .graphapi.middleware import is_graphql
 from .util import DEFAULT_TIMEZONE
 from .util import from_iso_time
@@ -48,6 +62,35 @@ V = TypeVar("V")
 logger = get_logger()
 settings = config.get_settings()
 
+# Sorted uuids of paged searches, by cursor
+_paged_cursors = TTLCache(
+    maxsize=settings.paged_cursor_cache_size, ttl=settings.paged_cursor_ttl
+)
+
+# Classes and facets rarely change, so they are shared between requests through a
+# process-wide cache. Entries are keyed by (path, uuid) and map the effective date
+# they were read at to the LoRa object, which must be treated as read-only.
+CLASSIFICATION_PATHS = frozenset({"klassifikation/klasse", "klassifikation/facet"})
+classification_cache: TTLCache[Tuple[str, str], Dict[date, dict]] = TTLCache(
+    maxsize=settings.classification_cache_size, ttl=settings.classification_cache_ttl
+)
+
+
+# Called with the path and UUID of classes and facets when they are invalidated
+on_classification_invalidated: List[Callable[[str, str], None]] = []
+
+
+# Awaited with the path and UUID of classes and facets written to LoRa through a
+# Scope, e.g. to have other MO instances invalidate them as well
+on_classification_written: List[Callable[[str, str], Awaitable[None]]] = []
+
+
+def invalidate_classification_cache(path: str, uuid) -> None:
+    """Forget a class or facet, e.g. when it has been written to LoRa."""
+    classification_cache.pop((path, str(uuid)))
+    for callback in on_classification_invalidated:
+        callback(path, str(uuid))
+
 
 def registration_changed_since(reg: Dict[str, Any], since: datetime) -> bool:
     from_time = reg.get("fratidspunkt", {}).get("tidsstempeldatotid", None)
@@ -93,6 +136,105 @@ def filter_registrations(
     return gen()
 
 
+Groups = Dict[str, Tuple[str, ...]]
+
+
+@lru_cache(maxsize=4096)
+def _parse_virkning_time(timestamp: str) -> datetime:
+    """Parse a 'virkning' timestamp, as the same few recur throughout LoRa."""
+    if timestamp == "infinity":
+        dt = datetime.max
+    elif timestamp == "-infinity":
+        dt = datetime.min
+    else:
+        dt = util.parse_iso_time(timestamp)
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def split_effects(
+    reg: Dict[str, Any],
+    relevant: Groups,
+    also: Optional[Groups] = None,
+    is_relevant: Callable[[datetime, datetime], bool] = lambda start, end: True,
+) -> List[Tuple[datetime, datetime, Dict[str, Any]]]:
+    """
+    Split a registration into effects, like :func:`lora_utils.get_effects`.
+
+    The boundaries of the 'relevant' entries are parsed and sorted once, and each
+    entry is added to the effects it overlaps in a single pass, as opposed to
+    filtering every entry for every effect. Only the effects for which
+    'is_relevant(start, end)' holds are built.
+
+    :param reg: A LoRa registration
+    :param relevant: The attributes to split on, e.g. {"relationer": ("opgaver",)}
+    :param also: Additional attributes to include in the effects
+    :param is_relevant: Predicate on the start and end of an effect
+    :return: List of (start, end, effect) tuples
+    """
+    everything: Dict[str, Tuple[str, ...]] = defaultdict(tuple)
+    for groups in (relevant, also or {}):
+        for group, keys in groups.items():
+            everything[group] += keys
+
+    boundaries = set()
+    for group, keys in relevant.items():
+        entries = reg.get(group)
+        if entries is None:
+            continue
+        for key in keys:
+            for entry in entries.get(key, ()):
+                virkning = entry["virkning"]
+                boundaries.add(_parse_virkning_time(virkning["from"]))
+                boundaries.add(_parse_virkning_time(virkning["to"]))
+    boundaries = sorted(boundaries)
+    intervals = list(zip(boundaries, boundaries[1:]))
+
+    effects = [
+        {
+            group: {key: [] for key in keys if key in reg[group]}
+            for group, keys in everything.items()
+            if group in reg
+        }
+        if is_relevant(start, end)
+        else None
+        for start, end in intervals
+    ]
+    if not any(effect is not None for effect in effects):
+        return []
+
+    last = len(intervals) - 1
+    for group in everything:
+        if group not in reg:
+            continue
+        for key, entries in reg[group].items():
+            if key not in everything[group]:
+                continue
+            for entry in entries:
+                virkning = entry["virkning"]
+                # The effects overlapping the entry, i.e. those ending after its
+                # start, and starting before its end
+                first = max(
+                    bisect_right(boundaries, _parse_virkning_time(virkning["from"]))
+                    - 1,
+                    0,
+                )
+                stop = min(
+                    bisect_left(boundaries, _parse_virkning_time(virkning["to"])),
+                    last + 1,
+                )
+                for effect in effects[first:stop]:
+                    if effect is not None:
+                        effect[group][key].append(entry)
+
+    return [
+        (start, end, effect)
+        for (start, end), effect in zip(intervals, effects)
+        if effect is not None and any(v for g in effect.values() for v in g.values())
+    ]
+
+
 @unique
 class LoraObjectType(Enum):
     org = "organisation/organisation"
@@ -138,10 +280,50 @@ def raise_on_status(status_code: int, msg, cause: Optional = None) -> NoReturn:
         exceptions.ErrorCodes.E_UNKNOWN(message=msg, cause=cause)
 
 
+# Retries of writes failing with transient errors, set for bulk writes
+write_retries: ContextVar[int] = ContextVar("write_retries", default=0)
+
+TRANSIENT_STATUSES = frozenset({502, 503, 504})
+
+
+async def _send_write(
+    method: str,
+    url: str,
+    handle: Callable[[ClientResponse], Awaitable[T]],
+    idempotent: bool = True,
+    **kwargs,
+) -> T:
+    """
+    Send a write to LoRa, and handle the response.
+
+    Idempotent writes failing with connection errors, timeouts or transient
+    statuses are retried up to ``write_retries`` times, with exponential backoff.
+    """
+    retries = write_retries.get() if idempotent else 0
+    backoff = config.get_settings().bulk_write_retry_backoff
+    for attempt in range(retries):
+        try:
+            async with get_session().request(method, url, **kwargs) as response:
+                if response.status not in TRANSIENT_STATUSES:
+                    return await handle(response)
+                logger.warning("retrying lora write", url=url, status=response.status)
+        except (ClientConnectionError, asyncio.TimeoutError) as e:
+            logger.warning("retrying lora write", url=url, error=repr(e))
+        await asyncio.sleep(backoff * 2**attempt)
+    # The last attempt is handled as any other write
+    async with get_session().request(method, url, **kwargs) as response:
+        return await handle(response)
+
+
+async def _read_json(response: ClientResponse) -> Any:
+    """Decode the JSON body of a LoRa response with the fast codec."""
+    return codec.loads(await response.read())
+
+
 async def _check_response(r):
     if 400 <= r.status < 600:  # equivalent to requests.response.ok
         try:
-            cause = await r.json()
+            cause = await _read_json(r)
             msg = cause["message"]
         except (ValueError, KeyError):
             cause = None
@@ -249,6 +431,17 @@ class Connector:
     def validity(self):
         return self.__validity
 
+    @property
+    def shared_date(self) -> Optional[date]:
+        """
+        The date under which present-time reads through the connector can be shared
+        between requests, such as in process-wide caches and indexes, or None if
+        they cannot be.
+        """
+        if self.validity != "present" or self.end - self.start != util.MINIMAL_INTERVAL:
+            return None
+        return self.now.date()
+
     def is_range_relevant(self, start, end, effect):
         if self.validity == "present":
             return util.do_ranges_overlap(self.start, self.end, start, end)
@@ -371,6 +564,112 @@ class ParameterValuesExtractor:
         return suffix
 
 
+_session: Optional[ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_trace_configs: List[TraceConfig] = []
+
+
+def register_trace_config(trace_config: TraceConfig) -> None:
+    """Attach an aiohttp TraceConfig to the LoRa session, e.g. for metrics.
+
+    Must be registered before the session is started to take effect.
+    """
+    _trace_configs.append(trace_config)
+
+
+def _create_session() -> ClientSession:
+    settings = config.get_settings()
+    connector = TCPConnector(
+        limit=settings.lora_pool_size,
+        limit_per_host=settings.lora_pool_size_per_host,
+        keepalive_timeout=settings.lora_keepalive_timeout,
+    )
+    timeout = ClientTimeout(
+        total=settings.lora_timeout,
+        connect=settings.lora_connect_timeout,
+    )
+    return ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=list(_trace_configs),
+        json_serialize=codec.dumps_str,
+    )
+
+
+def get_session() -> ClientSession:
+    """
+    Return the application-wide, connection-pooled LoRa session.
+
+    The session is created lazily, and recreated if the running event loop has
+    changed since it was created, as aiohttp sessions are bound to their loop.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = _create_session()
+        _session_loop = loop
+    return _session
+
+
+async def start_session() -> None:
+    get_session()
+
+
+async def close_session() -> None:
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+def pool_statistics() -> Dict[str, int]:
+    """
+    Number of connections in use by requests, and idle in the keep-alive pool.
+    """
+    if _session is None or _session.closed:
+        return {"in_use": 0, "idle": 0}
+    # aiohttp does not expose pool statistics publicly
+    connector = _session.connector
+    in_use = len(getattr(connector, "_acquired", ()))
+    idle = sum(map(len, getattr(connector, "_conns", {}).values()))
+    return {"in_use": in_use, "idle": idle}
+
+
+class ObjectCache:
+    """
+    Identity map of the LoRa objects fetched during a request.
+
+    Objects are keyed by their type (path), UUID and the validity ('virkningfra',
+    'virkningtil') they were fetched with, as that determines their contents.
+    """
+
+    def __init__(self):
+        self.objects: Dict[Tuple[str, str], Dict[Tuple[str, str], dict]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, uuid: str, validity: Tuple[str, str]) -> Optional[dict]:
+        obj = self.objects.get((path, uuid), {}).get(validity)
+        if obj is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return obj
+
+    def add(self, path: str, validity: Tuple[str, str], obj: dict) -> None:
+        self.objects.setdefault((path, obj["id"]), {})[validity] = obj
+
+    def invalidate(self, path: str, uuid: str) -> None:
+        self.objects.pop((path, str(uuid)), None)
+
+
+# Set for the duration of a request by request_wide_bulk.cache_context()
+request_object_cache: ContextVar[Optional[ObjectCache]] = ContextVar(
+    "request_object_cache", default=None
+)
+
+
 class BaseScope:
     def __init__(self, connector, path):
         self.connector = connector
@@ -381,10 +680,15 @@ class BaseScope:
         return config.get_settings().lora_url + self.path
 
 
+# Registrations whose effects are memoized per scope, least recently used first out
+EFFECTS_MEMO_SIZE = 1000
+
+
 class Scope(BaseScope):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.loaders: Dict[Tuple[str], DataLoader] = {}
+        self._effects: "OrderedDict[tuple, Tuple[dict, list]]" = OrderedDict()
 
     def load(self, **params: Any) -> Awaitable[List[dict]]:
         """
@@ -549,23 +853,106 @@ class Scope(BaseScope):
         return results_for_calls
 
     async def fetch(self, **params):
-        async with ClientSession() as session:
-            response = await session.get(
-                self.base_path,
-                # We send the parameters as JSON through the body of the GET request to
-                # allow arbitrarily many, as opposed to being limited by the length of a
-                # URL if we were using query parameters.
-                json=jsonable_encoder(
-                    param_exotics_to_strings({**self.connector.defaults, **params})
-                ),
-            )
+        async with get_session().get(
+            self.base_path,
+            # We send the parameters as JSON through the body of the GET request to
+            # allow arbitrarily many, as opposed to being limited by the length of a
+            # URL if we were using query parameters.
+            json=param_exotics_to_strings({**self.connector.defaults, **params}),
+        ) as response:
             await _check_response(response)
             try:
-                ret = (await response.json())["results"][0]
-                return ret
+                ret = (await _read_json(response))["results"][0]
             except IndexError:
                 return []
 
+        cache = request_object_cache.get()
+        validity = self._object_cache_validity(params)
+        if cache is not None and validity is not None:
+            for obj in ret:
+                # Searches without 'list' only return UUIDs
+                if isinstance(obj, dict):
+                    cache.add(self.path, validity, obj)
+        effective_date = self._classification_cache_date(params)
+        if effective_date is not None:
+            for obj in ret:
+                if isinstance(obj, dict):
+                    self._add_to_classification_cache(effective_date, obj)
+        return ret
+
+    def _object_cache_validity(self, params: Dict[str, Any]) -> Optional[tuple]:
+        """
+        The validity of objects fetched using the given parameters, or None if
+        they cannot be shared through the request's ObjectCache.
+        """
+        if not params.keys().isdisjoint(
+            {"registreretfra", "registrerettil", "registreringstid", "virkningstid"}
+        ):
+            return None
+        params = {**self.connector.defaults, **params}
+        return str(params["virkningfra"]), str(params["virkningtil"])
+
+    def _classification_cache_date(self, params: Dict[str, Any]) -> Optional[date]:
+        """
+        The date under which classes and facets fetched using the given parameters
+        are kept in the process-wide classification cache, or None if they cannot be.
+
+        Only present-time reads are shared, and they are shared for the whole day of
+        the effective date, as the contents of a class rarely depend on the time of
+        day. Changes are picked up on writes, or when the entries expire.
+        """
+        if self.path not in CLASSIFICATION_PATHS or not settings.classification_cache:
+            return None
+        if not params.keys().isdisjoint(
+            {
+                "registreretfra",
+                "registrerettil",
+                "registreringstid",
+                "virkningstid",
+                "virkningfra",
+                "virkningtil",
+            }
+        ):
+            return None
+        return self.connector.shared_date
+
+    def _add_to_classification_cache(self, effective_date: date, obj: dict) -> None:
+        key = (self.path, obj["id"])
+        by_date = classification_cache.get(key) or {}
+        classification_cache.set(key, {**by_date, effective_date: obj})
+
+    async def _load_by_uuids(self, uuids: Iterable, **params: Any) -> List[dict]:
+        """
+        Like load(uuid=uuids), but objects already fetched during the request are
+        taken from its ObjectCache, and only the remaining ones are loaded.
+        """
+        cache = request_object_cache.get()
+        validity = self._object_cache_validity(params)
+        effective_date = self._classification_cache_date(params)
+        if (cache is None or validity is None) and effective_date is None:
+            return await self.load(uuid=uuids, **params)
+
+        def get_cached(uuid_: str) -> Optional[dict]:
+            if cache is not None and validity is not None:
+                obj = cache.get(self.path, uuid_, validity)
+                if obj is not None:
+                    return obj
+            if effective_date is not None:
+                by_date = classification_cache.get((self.path, uuid_)) or {}
+                return by_date.get(effective_date)
+            return None
+
+        cached, missing = [], []
+        for uuid_ in dict.fromkeys(map(str, uuids)):
+            obj = get_cached(uuid_)
+            if obj is None:
+                missing.append(uuid_)
+            else:
+                cached.append(obj)
+        if not missing:
+            return cached
+        return cached + await self.load(uuid=missing, **params)
+
     async def get_all(self, changed_since: Optional[datetime] = None, **params):
         """Perform a search on given params and return the result.
 
@@ -589,6 +976,35 @@ class Scope(BaseScope):
             response=response, wantregs=wantregs, changed_since=changed_since
         )
 
+    async def get_counts(
+        self,
+        relation: str,
+        uuids: Iterable[str],
+        valid_only: bool = False,
+        **params,
+    ) -> Dict[str, int]:
+        """Count the objects related to each of the given UUIDs through a relation.
+
+        All the counts are found by a single search, whose results are grouped by
+        the UUIDs of the relation. With 'valid_only', only objects whose
+        registration is valid are counted, as with :func:`util.is_reg_valid`.
+
+        Returns a dict from each of the UUIDs to its count.
+        """
+        counts = dict.fromkeys(map(str, uuids), 0)
+        if not counts:
+            return counts
+        response = await self.fetch(list=True, **{relation: list(counts)}, **params)
+        for _, registration in filter_registrations(response, wantregs=False):
+            if valid_only and not util.is_reg_valid(registration):
+                continue
+            related = {
+                rel.get("uuid") for rel in registration["relationer"].get(relation, [])
+            }
+            for related_uuid in related & counts.keys():
+                counts[related_uuid] += 1
+        return counts
+
     async def get_all_by_uuid(
         self,
         uuids: Union[List, Set],
@@ -598,7 +1014,7 @@ class Scope(BaseScope):
         Get a list of objects by their UUIDs.
         Returns an iterator of tuples (obj_id, obj) of all matches.
         """
-        ret = await self.load(uuid=uuids)
+        ret = await self._load_by_uuids(uuids)
         return filter_registrations(
             response=ret, wantregs=False, changed_since=changed_since
         )
@@ -613,6 +1029,8 @@ class Scope(BaseScope):
         start=0,
         limit=0,
         uuid_filters=None,
+        uuid_filters_key: Hashable = None,
+        cursor: Optional[str] = None,
         **params,
     ):
         """Perform a search on given params, filter and return the result.
@@ -621,20 +1039,48 @@ class Scope(BaseScope):
         :code:`item-type`.
 
         :code:`uuid_filters` is a list of functions from uuid to bool, where
-        the uuid will be kept assuming the returned bool is truthy.
+        the uuid will be kept assuming the returned bool is truthy. The
+        functions may be coroutine functions.
+
+        :code:`uuid_filters_key` identifies the :code:`uuid_filters`, as they
+        are taken into account when reusing a cursor.
+
+        :code:`cursor` enables cursor pagination when not None. The sorted and
+        filtered list of matching uuids is cached under the returned cursor,
+        so subsequent pages using it are sliced from the cache, as opposed to
+        searching LoRa and applying :code:`uuid_filters` again. An empty,
+        unknown or expired cursor starts a new search.
 
         Returns paged dict with 3 keys: 'total', 'offset' and 'items', where:
             'total' is the total number of matches found.
             'offset' is the offset into 'total' (for pagination).
             'items' is a list of :code:`item-type` items.
+        If :code:`cursor` is not None, the dict has the additional key 'cursor',
+        to pass when requesting the following pages.
         """
-        uuid_filters = uuid_filters or []
-        # Fetch all uuids matching search params and filter with uuid_filters
-        uuids = await self.fetch(**params)
-        for uuid_filter in uuid_filters:
-            uuids = filter(uuid_filter, uuids)
-        # Sort to ensure consistent order, as LoRa does not seem to do that
-        uuids = sorted(list(uuids))
+        uuids = None
+        if cursor is not None:
+            search_key = self._paged_search_key(params, uuid_filters_key)
+            cached = _paged_cursors.get(cursor)
+            if cached is not None and cached[0] == search_key:
+                uuids = cached[1]
+            else:
+                cursor = str(uuid.uuid4())
+
+        if uuids is None:
+            uuid_filters = uuid_filters or []
+            # Fetch all uuids matching search params and filter with uuid_filters
+            uuids = await self.fetch(**params)
+            for uuid_filter in uuid_filters:
+                if asyncio.iscoroutinefunction(uuid_filter):
+                    uuids = [uuid for uuid in uuids if await uuid_filter(uuid)]
+                else:
+                    uuids = filter(uuid_filter, uuids)
+            # Sort to ensure consistent order, as LoRa does not seem to do that
+            uuids = sorted(list(uuids))
+            if cursor is not None:
+                _paged_cursors.set(cursor, (search_key, uuids))
+
         total = len(uuids)
         # Offset by slicing off the start
         uuids = uuids[start:]
@@ -648,10 +1094,26 @@ class Scope(BaseScope):
         else:
             obj_iter = starmap(partial(func, self.connector), obj_iter)
 
-        return {"total": total, "offset": start, "items": list(obj_iter)}
+        result = {"total": total, "offset": start, "items": list(obj_iter)}
+        if cursor is not None:
+            result["cursor"] = cursor
+        return result
+
+    def _paged_search_key(self, params: Dict[str, Any], uuid_filters_key: Hashable):
+        """
+        Identify a paged search by its path, parameters, validity and effective
+        date. The effective time itself changes on every request without 'at'.
+        """
+        return (
+            self.path,
+            self.connector.validity,
+            self.connector.now.date(),
+            json.dumps(param_exotics_to_strings(params), sort_keys=True),
+            uuid_filters_key,
+        )
 
     async def get(self, uuid, **params):
-        d = await self.load(uuid=str(uuid), **params)
+        d = await self._load_by_uuids([str(uuid)], **params)
 
         if not d or not d[0]:
             return None
@@ -670,33 +1132,64 @@ class Scope(BaseScope):
     async def create(self, obj, uuid=None):
         obj = uuid_to_str(obj)
 
-        if uuid:
-            async with ClientSession() as session:
-                r = await session.put("{}/{}".format(self.base_path, uuid), json=obj)
+        async def handle(response):
+            await _check_response(response)
+            return (await _read_json(response))["uuid"]
 
-                async with r:
-                    await _check_response(r)
-                    return (await r.json())["uuid"]
+        if uuid:
+            self._invalidate_object_cache(uuid)
+            url = "{}/{}".format(self.base_path, uuid)
+            result = await _send_write("PUT", url, handle, json=obj)
         else:
-            async with ClientSession() as session:
-                r = await session.post(self.base_path, json=obj)
-                await _check_response(r)
-                return (await r.json())["uuid"]
+            result = await _send_write(
+                "POST", self.base_path, handle, idempotent=False, json=obj
+            )
+        await self._classification_written(uuid or result)
+        return result
 
     async def delete(self, uuid):
-        async with ClientSession() as session:
-            response = await session.delete("{}/{}".format(self.base_path, uuid))
-            await _check_response(response)
+        self._invalidate_object_cache(uuid)
+        url = "{}/{}".format(self.base_path, uuid)
+        await _send_write("DELETE", url, _check_response)
+        await self._classification_written(uuid)
 
     async def update(self, obj, uuid):
-        async with ClientSession() as session:
-            url = "{}/{}".format(self.base_path, uuid)
-            response = await session.patch(url, json=obj)
+        self._invalidate_object_cache(uuid)
+        url = "{}/{}".format(self.base_path, uuid)
+
+        async def handle(response):
             if response.status == 404:
                 logger.warning("could not update nonexistent LoRa object", url=url)
             else:
                 await _check_response(response)
-                return (await response.json()).get("uuid", uuid)
+                return (await _read_json(response)).get("uuid", uuid)
+
+        result = await _send_write("PATCH", url, handle, json=obj)
+        await self._classification_written(uuid)
+        return result
+
+    def forget(self, uuids: Iterable) -> None:
+        """
+        Drop objects no longer needed during the request from its ObjectCache, and
+        the memoized effects of the scope.
+        """
+        cache = request_object_cache.get()
+        if cache is not None:
+            for uuid_ in uuids:
+                cache.invalidate(self.path, uuid_)
+        self._effects.clear()
+
+    def _invalidate_object_cache(self, uuid) -> None:
+        cache = request_object_cache.get()
+        if cache is not None:
+            cache.invalidate(self.path, uuid)
+        if self.path in CLASSIFICATION_PATHS:
+            invalidate_classification_cache(self.path, uuid)
+
+    async def _classification_written(self, uuid) -> None:
+        if self.path in CLASSIFICATION_PATHS and uuid is not None:
+            for callback in on_classification_written:
+                await callback(self.path, str(uuid))
 
     async def get_effects(self, obj, relevant, also=None, **params):
         reg = (
@@ -706,19 +1199,32 @@ class Scope(BaseScope):
         if not reg:
             return
 
-        effects = list(lora_utils.get_effects(reg, relevant, also))
+        # Registrations are shared by the handlers and validators reading them, so
+        # their effects are only split once per connector
+        key = (id(reg), tuple(relevant.items()), tuple((also or {}).items()))
+        memo = self._effects.get(key)
+        if memo is None or memo[0] is not reg:
+            effects = split_effects(
+                reg,
+                relevant,
+                also,
+                lambda start, end: self.connector.is_range_relevant(start, end, None),
+            )
+            memo = self._effects[key] = (reg, effects)
+            if len(self._effects) > EFFECTS_MEMO_SIZE:
+                self._effects.popitem(last=False)
+        else:
+            self._effects.move_to_end(key)
 
-        return filter(
-            lambda a: self.connector.is_range_relevant(*a),
-            effects,
-        )
+        # The effects themselves are shared, and must not be modified
+        return list(memo[1])
 
 
 async def get_version():
-    async with ClientSession() as session:
-        response = await session.get(config.get_settings().lora_url + "version")
+    url = config.get_settings().lora_url + "version"
+    async with get_session().get(url) as response:
         try:
-            return (await response.json())["lora_version"]
+            return (await _read_json(response))["lora_version"]
         except ValueError:
             return "Could not find lora version: %s" % await response.text()
 
@@ -732,7 +1238,6 @@ class AutocompleteScope(BaseScope):
         params = {"phrase": phrase}
         if class_uuids:
             params["class_uuids"] = [str(uuid) for uuid in class_uuids]
-        async with ClientSession() as session:
-            response = await session.get(self.base_path, params=params)
+        async with get_session().get(self.base_path, params=params) as response:
             await _check_response(response)
-            return {"items": (await response.json())["results"]}
+            return {"items": (await _read_json(response))["results"]}
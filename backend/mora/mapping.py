@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2018-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
 
+import collections
 import enum
 import functools
 import operator
@@ -264,6 +265,125 @@ class FieldTuple(object):
         )
 
 
+@enum.unique
+class Project(enum.Enum):
+    """What a :class:`Projection` extracts from a field."""
+
+    #: The first UUID, as :meth:`FieldTuple.get_uuid`
+    UUID = "uuid"
+    #: A list of all UUIDs, as :meth:`FieldTuple.get_uuids`
+    UUIDS = "uuids"
+    #: A list of all entries, as :meth:`FieldTuple.get`
+    ENTRIES = "entries"
+
+
+class Projection(object):
+    """Extract a declared set of fields from LoRa objects.
+
+    The fields are given by name, either as a :class:`FieldTuple`, projected to
+    its first UUID, or as a ``(FieldTuple, Project)`` pair. Calling the
+    projection on an object returns a named tuple with the fields in declared
+    order, equal to what the corresponding :class:`FieldTuple` methods return,
+    but looking up the path to each containing section only once::
+
+        >>> fields = Projection(
+        ...     person=USER_FIELD,
+        ...     classes=(ORG_FUNK_CLASSES_FIELD, Project.UUIDS),
+        ... )
+        >>> fields({"relationer": {"tilknyttedebrugere": [{"uuid": "u"}]}})
+        Projected(person='u', classes=[])
+    """
+
+    __slots__ = (
+        "__fields",
+        "__parents",
+        "__steps",
+        "__record",
+    )
+
+    def __init__(
+        self,
+        **fields: typing.Union[FieldTuple, typing.Tuple[FieldTuple, Project]],
+    ):
+        parents = {}
+        steps = []
+
+        for field in fields.values():
+            if isinstance(field, FieldTuple):
+                field = (field, Project.UUID)
+            field_tuple, project = field
+            parent, key = field_tuple.path[:-1], field_tuple.path[-1]
+            steps.append(
+                (
+                    parents.setdefault(parent, len(parents)),
+                    self._compile(key, field_tuple.filter_fn, project),
+                    project is Project.UUID,
+                )
+            )
+
+        self.__fields = fields
+        self.__parents = tuple(parents)
+        self.__steps = tuple(steps)
+        self.__record = collections.namedtuple("Projected", fields)
+
+    @staticmethod
+    def _compile(key, filter_fn, project):
+        """Return a function extracting a field from its containing section."""
+        if project is Project.ENTRIES:
+
+            def get(section):
+                return list(filter(filter_fn, section[key]))
+
+        elif project is Project.UUIDS:
+
+            def get(section):
+                return [
+                    item["uuid"]
+                    for item in filter(filter_fn, section[key])
+                    if "uuid" in item
+                ]
+
+        else:
+
+            def get(section):
+                for item in filter(filter_fn, section[key]):
+                    if "uuid" in item:
+                        return item["uuid"]
+                return None
+
+        return get
+
+    def __call__(self, obj) -> typing.Tuple:
+        sections = []
+        for path in self.__parents:
+            section = obj
+            try:
+                for key in path:
+                    section = section[key]
+            except (LookupError, TypeError):
+                section = None
+            sections.append(section)
+
+        values = []
+        for section, get, single in self.__steps:
+            try:
+                values.append(get(sections[section]))
+            except (LookupError, TypeError):
+                values.append(None if single else [])
+
+        return tuple.__new__(self.__record, values)
+
+    @property
+    def fields(self) -> typing.Dict[str, typing.Any]:
+        return self.__fields
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join("{}={!r}".format(k, v) for k, v in self.fields.items()),
+        )
+
+
 #
 # MAPPINGS
 #
@@ -1,12 +1,26 @@
 # SPDX-FileCopyrightText: 2017-2021 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
+import asyncio
+from types import SimpleNamespace
 from typing import Callable
-
+from typing import Dict
+
+from aiohttp import ClientSession
+from aiohttp import TraceConfig
+from aiohttp import TraceConnectionQueuedEndParams
+from aiohttp import TraceConnectionQueuedStartParams
+from mora import conf_db
+from mora import lora
 from mora.graphapi.health import dar, dataset, oio_rest, amqp, keycloak
-from prometheus_client import Info, Gauge
+from mora.service import facet
+from mora.service.address_handler import dar as dar_address
+from mora.triggers.internal import http_trigger
+from mora.triggers.internal.amqp_trigger import outbox
+from prometheus_client import Counter, Info, Gauge, Histogram
 from prometheus_fastapi_instrumentator import Instrumentator
 from prometheus_fastapi_instrumentator.metrics import Info as InstInfo, default
 
+from .cache import TTLCache
 from .config import get_settings
 from .conf_db import health_check
 
@@ -16,6 +30,22 @@ def setup_metrics(app):
 
     # Changes on every request
     instrumentator.add(default())
+    instrumentator.add(lora_connection_pool())
+    lora.register_trace_config(lora_connection_wait_trace_config())
+    dar_address.on_fetch.append(dar_latency())
+    instrumentator.add(
+        cache_statistics(
+            {
+                "classification": lora.classification_cache,
+                "configuration": conf_db.configuration_cache,
+                "dar": dar_address.address_cache,
+                "primary_classes": facet.primary_class_cache,
+            }
+        )
+    )
+
+    instrumentator.add(amqp_outbox())
+    instrumentator.add(http_triggers())
 
     # Never changes
     instrumentator.add(os2mo_version())
@@ -45,6 +75,108 @@ def os2mo_version() -> Callable[[InstInfo], None]:
     return instrumentation
 
 
+def lora_connection_pool() -> Callable[[InstInfo], None]:
+    """Number of LoRa connections in use and idle in the keep-alive pool."""
+    IN_USE = Gauge("lora_pool_connections_in_use", "LoRa connections in use")
+    IDLE = Gauge("lora_pool_connections_idle", "Idle LoRa connections in pool")
+
+    def instrumentation(_: InstInfo) -> None:
+        statistics = lora.pool_statistics()
+        IN_USE.set(statistics["in_use"])
+        IDLE.set(statistics["idle"])
+
+    return instrumentation
+
+
+def lora_connection_wait_trace_config() -> TraceConfig:
+    """Time spent by LoRa requests waiting for a free connection in the pool."""
+    METRIC = Histogram(
+        "lora_pool_wait_seconds", "Time waiting for a LoRa connection from the pool"
+    )
+
+    async def on_queued_start(
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionQueuedStartParams,
+    ) -> None:
+        context.queued_at = asyncio.get_running_loop().time()
+
+    async def on_queued_end(
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionQueuedEndParams,
+    ) -> None:
+        METRIC.observe(asyncio.get_running_loop().time() - context.queued_at)
+
+    trace_config = TraceConfig()
+    trace_config.on_connection_queued_start.append(on_queued_start)
+    trace_config.on_connection_queued_end.append(on_queued_end)
+    return trace_config
+
+
+def cache_statistics(caches: Dict[str, TTLCache]) -> Callable[[InstInfo], None]:
+    """Size, hits and misses of the process-wide caches, labelled by cache name."""
+    ENTRIES = Gauge("cache_entries", "Entries in cache", ["cache"])
+    HITS = Gauge("cache_hits", "Cache hits since startup", ["cache"])
+    MISSES = Gauge("cache_misses", "Cache misses since startup", ["cache"])
+
+    def instrumentation(_: InstInfo) -> None:
+        for name, cache in caches.items():
+            ENTRIES.labels(cache=name).set(len(cache))
+            HITS.labels(cache=name).set(cache.hits)
+            MISSES.labels(cache=name).set(cache.misses)
+
+    return instrumentation
+
+
+def dar_latency() -> Callable[[float], None]:
+    """Duration of address lookups in DAR, i.e. misses in the DAR cache."""
+    METRIC = Histogram("dar_latency_seconds", "Duration of DAR address lookups")
+    return METRIC.observe
+
+
+def amqp_outbox() -> Callable[[InstInfo], None]:
+    """Depth of the AMQP outbox, and latency and failures of its publishing."""
+    DEPTH = Gauge("amqp_outbox_depth", "AMQP messages waiting to be published")
+    LATENCY = Histogram(
+        "amqp_publish_latency_seconds",
+        "Time from queueing an AMQP message until its publishing is confirmed",
+    )
+    FAILURES = Counter(
+        "amqp_publish_failures", "AMQP messages given up on after retrying"
+    )
+    outbox.on_published.append(LATENCY.observe)
+    outbox.on_failed.append(FAILURES.inc)
+
+    def instrumentation(_: InstInfo) -> None:
+        DEPTH.set(outbox.qsize())
+
+    return instrumentation
+
+
+def http_triggers() -> Callable[[InstInfo], None]:
+    """Duration of HTTP trigger calls and circuit breaker state, per endpoint."""
+    LATENCY = Histogram(
+        "http_trigger_latency_seconds", "Duration of HTTP trigger calls", ["endpoint"]
+    )
+    CIRCUIT_OPEN = Gauge(
+        "http_trigger_circuit_open",
+        "Whether calls to the HTTP trigger endpoint are being refused",
+        ["endpoint"],
+    )
+
+    def observe(endpoint: str, duration: float) -> None:
+        LATENCY.labels(endpoint=endpoint).observe(duration)
+
+    http_trigger.on_response.append(observe)
+
+    def instrumentation(_: InstInfo) -> None:
+        for endpoint, circuit_breaker in http_trigger.circuit_breakers.items():
+            CIRCUIT_OPEN.labels(endpoint=endpoint).set(circuit_breaker.is_open)
+
+    return instrumentation
+
+
 def confdb_health() -> Callable[[InstInfo], None]:
     CONFDB_USE = Gauge("confdb_use", "ConfDB being used")
     CONFDB_HEALTH = Gauge("confdb_health", "ConfDB health")
@@ -1,19 +1,38 @@
 # SPDX-FileCopyrightText: 2021- Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
+import asyncio
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import TypeVar
 
-from more_itertools import one
+from structlog import get_logger
 
 from mora.common import get_connector
+from mora.conf_db import request_resolved_configuration
 from mora.lora import Connector
 from mora.lora import LoraObjectType
-from mora.lora import filter_registrations
+from mora.lora import ObjectCache
+from mora.lora import request_object_cache
 
 LORA_OBJ = Dict[Any, Any]
 UUID = str
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+logger = get_logger()
+
+# Results computed during the request, by key, set by cache_context()
+request_memo: ContextVar[Optional[Dict[Hashable, asyncio.Future]]] = ContextVar(
+    "request_memo", default=None
+)
 
 
 class __BulkBookkeeper:
@@ -28,15 +47,68 @@ class __BulkBookkeeper:
     async def get_lora_object(
         self, type_: LoraObjectType, uuid: str
     ) -> Optional[LORA_OBJ]:
-        results = await self.connector.scope(type_).load(uuid=uuid)
-        if not results:
-            return None
-        uuid, registration = one(filter_registrations(results, wantregs=False))
-        return registration
+        return await self.connector.scope(type_).get(uuid)
+
+    async def memoized(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await fn() once per key during the request, sharing the result between all
+        callers, including concurrent ones. Outside requests, fn() is always awaited.
+        """
+        memo = request_memo.get()
+        if memo is None:
+            return await fn()
+        if key not in memo:
+            memo[key] = asyncio.ensure_future(fn())
+        # Shielded, as cancelling one of the callers must not cancel the others
+        return await asyncio.shield(memo[key])
+
+    async def memoized_many(
+        self,
+        namespace: Hashable,
+        keys: Iterable[K],
+        fn: Callable[[List[K]], Awaitable[Dict[K, T]]],
+    ) -> Dict[K, T]:
+        """
+        Like memoized, but for many keys at once. fn() is awaited once with all the
+        keys missing from the memo, and must return the results of all of them.
+        """
+        keys = list(dict.fromkeys(keys))
+        memo = request_memo.get()
+        if memo is None:
+            return await fn(keys)
+
+        missing = [key for key in keys if (namespace, key) not in memo]
+        if missing:
+            batch = asyncio.ensure_future(fn(missing))
+
+            async def pick(key: K) -> T:
+                return (await batch)[key]
+
+            for key in missing:
+                memo[namespace, key] = asyncio.ensure_future(pick(key))
+
+        results = await asyncio.gather(
+            *(asyncio.shield(memo[namespace, key]) for key in keys)
+        )
+        return dict(zip(keys, results))
 
     @asynccontextmanager
     async def cache_context(self):
-        yield None
+        """
+        Share LoRa objects fetched by any scope during the request, such that
+        each object is only fetched once per validity.
+        """
+        cache = ObjectCache()
+        token = request_object_cache.set(cache)
+        configuration_token = request_resolved_configuration.set({})
+        memo_token = request_memo.set({})
+        try:
+            yield cache
+        finally:
+            request_memo.reset(memo_token)
+            request_resolved_configuration.reset(configuration_token)
+            request_object_cache.reset(token)
+            logger.debug("lora_object_cache", hits=cache.hits, misses=cache.misses)
 
 
 request_wide_bulk = __BulkBookkeeper()
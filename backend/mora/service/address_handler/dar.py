@@ -1,6 +1,12 @@
 # SPDX-FileCopyrightText: 2019-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
+import asyncio
+import json
+import os
+import time
 from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Optional
 from uuid import UUID
@@ -13,7 +19,9 @@ from strawberry.dataloader import DataLoader
 from structlog import get_logger
 
 from . import base
+from ... import config
 from ... import exceptions
+from ...cache import TTLCache
 from ..validation.validator import forceable
 from mora.graphapi.middleware import is_graphql
 
@@ -21,18 +29,138 @@ NOT_FOUND = "Ukendt"
 
 logger = get_logger()
 
+_client: Optional[AsyncDARClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# DAR addresses by UUID, with None for addresses which were not found
+address_cache: TTLCache[UUID, Optional[dict]] = TTLCache(
+    maxsize=config.get_settings().dar_cache_size,
+    ttl=config.get_settings().dar_cache_ttl,
+)
+_MISSING = object()
+
+# Called with the duration of each lookup in DAR
+on_fetch: List[Callable[[float], None]] = []
+
+
+class DARClient(AsyncDARClient):
+    """DAR client using the given URL, rather than always the public DAR API."""
+
+    def __init__(self, url: str, timeout: int = 10) -> None:
+        super().__init__(timeout=timeout)
+        self._baseurl = url.rstrip("/")
+
+
+async def get_client() -> AsyncDARClient:
+    """
+    Return the application-wide DAR client.
+
+    The client is opened lazily, and reopened if the running event loop has
+    changed since it was opened, as its aiohttp session is bound to the loop.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is not None and _client_loop is loop:
+        return _client
+
+    settings = config.get_settings()
+    client = DARClient(settings.dar_url, timeout=settings.dar_timeout)
+    await client.aopen()
+    if _client is not None and _client_loop is loop:
+        # Another caller opened a client in the meantime
+        await client.aclose()
+        return _client
+
+    stale_client, stale_loop = _client, _client_loop
+    _client, _client_loop = client, loop
+    if stale_client is not None:
+        await _close(stale_client, stale_loop)
+    return client
+
+
+async def _close(client: AsyncDARClient, loop: asyncio.AbstractEventLoop) -> None:
+    """Close a client, on the event loop it was opened on if that still runs."""
+    if loop is not asyncio.get_running_loop() and loop.is_running():
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        )
+    else:
+        await client.aclose()
+
+
+async def close_client() -> None:
+    global _client, _client_loop
+    client, loop = _client, _client_loop
+    _client = None
+    _client_loop = None
+    if client is not None:
+        await _close(client, loop)
+
 
 async def load_addresses(keys: List[UUID]) -> List[Optional[dict]]:
-    adarclient = AsyncDARClient(timeout=120)
-    async with adarclient:
+    addresses: Dict[UUID, Optional[dict]] = {}
+    for key in set(keys):
+        address = address_cache.get(key, _MISSING)
+        if address is not _MISSING:
+            addresses[key] = address
+
+    missing = set(keys) - addresses.keys()
+    if missing:
+        adarclient = await get_client()
+        start = time.monotonic()
         try:
-            addresses, _ = await adarclient.fetch(set(keys))
+            found, not_found = await adarclient.fetch(missing)
         except ClientResponseError as exc:
+            # Failed lookups are not cached, so they are retried on the next load
             logger.exception("address lookup failed", exc=exc)
-            return [None for key in keys]
+            return [addresses.get(key) for key in keys]
+        finally:
+            for callback in on_fetch:
+                callback(time.monotonic() - start)
+
+        negative_ttl = config.get_settings().dar_cache_negative_ttl
+        for key, address in found.items():
+            address_cache.set(key, address)
+            addresses[key] = address
+        for key in not_found:
+            address_cache.set(key, None, ttl=negative_ttl)
+            addresses[key] = None
+
     return list(map(addresses.get, keys))
 
 
+def save_cache(path: str) -> None:
+    """Write the found addresses in the cache to a file, replacing it atomically."""
+    addresses = {str(key): address for key, address in address_cache.items() if address}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"saved": time.time(), "addresses": addresses}, f)
+    os.replace(tmp_path, path)
+    logger.info("dar_cache_saved", path=path, addresses=len(addresses))
+
+
+def load_cache(path: str) -> None:
+    """Fill the cache from a file written by save_cache.
+
+    The addresses expire as if they had been in the cache since it was saved.
+    """
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+        ttl = address_cache.ttl - (time.time() - saved["saved"])
+        addresses = saved["addresses"]
+    except FileNotFoundError:
+        return
+    except (ValueError, KeyError, TypeError) as exc:
+        logger.warning("dar_cache_unreadable", path=path, exc=exc)
+        return
+    if ttl <= 0:
+        return
+    for key, address in addresses.items():
+        address_cache.set(UUID(key), address, ttl=ttl)
+    logger.info("dar_cache_loaded", path=path, addresses=len(addresses))
+
+
 class DARLoaderPlugin(Plugin):
     key = "dar_loader"
 
@@ -11,6 +11,7 @@ This section describes how to interact with employee associations.
 import uuid
 from typing import Any, Dict
 
+from . import association_index
 from . import handlers
 from . import org
 from .validation import validator
@@ -299,3 +300,8 @@ class AssociationRequestHandler(handlers.OrgFunkRequestHandler):
             self.termination_value = {}
 
         await super().prepare_terminate(request)
+
+    async def submit(self) -> str:
+        result = await super().submit()
+        await association_index.refresh_association(self.uuid)
+        return result
@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+"""
+In-memory index of the employees with associations.
+
+Finding the employees with associations otherwise requires reading every
+association in LoRa. The index holds the periods in which each association
+relates to an employee, so a single index answers for any effective time.
+
+It is built a chunk of associations at a time, and kept up to date as
+associations are written: through this instance directly, and through the
+others by their AMQP messages. Writes not seen this way, such as those straight
+to LoRa by importers, are picked up when it is rebuilt after
+ASSOCIATION_INDEX_TTL.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from more_itertools import chunked
+from structlog import get_logger
+
+from .. import config
+from .. import lora
+from .. import mapping
+from .. import util
+
+logger = get_logger()
+
+ASSOCIATION_KEY = "Tilknytning"
+
+# Associations loaded at a time when building the index
+BUILD_CHUNK_SIZE = 500
+
+Period = Tuple[datetime, datetime]
+
+
+class AssociationIndex:
+    """The periods in which each association relates to each employee."""
+
+    def __init__(self, expires: float):
+        self.expires = expires
+        # Employee -> association -> periods
+        self.employees: Dict[str, Dict[str, List[Period]]] = {}
+        # Association -> employees
+        self.associations: Dict[str, Set[str]] = {}
+        # Associations refreshed while the index was being built
+        self.refreshed: Set[str] = set()
+        # The task building the index, shared by all callers awaiting it
+        self.build: Optional["asyncio.Task[None]"] = None
+
+    def is_associated(self, uuid: str, start: datetime, end: datetime) -> bool:
+        """Whether the employee has an association between start and end."""
+        return any(
+            util.do_ranges_overlap(start, end, period_start, period_end)
+            for periods in self.employees.get(uuid, {}).values()
+            for period_start, period_end in periods
+        )
+
+    def set_association(self, uuid: str, registration: Optional[dict]) -> None:
+        """Replace the periods of an association by those of its registration.
+
+        The registration must be read at all times, and None removes the
+        association.
+        """
+        for employee in self.associations.pop(uuid, ()):
+            by_association = self.employees[employee]
+            del by_association[uuid]
+            if not by_association:
+                del self.employees[employee]
+        if registration is None:
+            return
+
+        periods = defaultdict(list)
+        for rel in mapping.USER_FIELD.get(registration):
+            if rel.get("uuid"):
+                periods[rel["uuid"]].append(
+                    (util.get_effect_from(rel), util.get_effect_to(rel))
+                )
+        for employee, employee_periods in periods.items():
+            self.employees.setdefault(employee, {})[uuid] = employee_periods
+        if periods:
+            self.associations[uuid] = set(periods)
+
+
+_index: Optional[AssociationIndex] = None
+
+
+def _connector() -> lora.Connector:
+    return lora.Connector(virkningfra="-infinity", virkningtil="infinity")
+
+
+async def _build_index(index: AssociationIndex) -> None:
+    global _index
+    try:
+        # Without 'list', LoRa only returns the UUIDs of the associations
+        uuids = await _connector().organisationfunktion.fetch(
+            funktionsnavn=ASSOCIATION_KEY
+        )
+        for chunk in chunked(uuids, BUILD_CHUNK_SIZE):
+            # A connector per chunk, as its loaders hold on to everything loaded
+            scope = _connector().organisationfunktion
+            associations = await scope.fetch(uuid=chunk)
+            for uuid, registration in lora.filter_registrations(
+                associations, wantregs=False
+            ):
+                # Refreshes are newer than the chunk, which may have been loaded
+                # before the write
+                if uuid not in index.refreshed:
+                    index.set_association(uuid, registration)
+            scope.forget(chunk)
+    except BaseException:
+        # The next caller builds it anew
+        if _index is index:
+            _index = None
+        raise
+    logger.debug(
+        "association_index_built",
+        associations=len(index.associations),
+        employees=len(index.employees),
+    )
+
+
+async def get_index() -> AssociationIndex:
+    """The index, built on first use and again when it expires.
+
+    Callers arriving while it is built wait for the same build.
+    """
+    global _index
+    index = _index
+    if index is None or index.expires <= time.monotonic():
+        ttl = config.get_settings().association_index_ttl
+        index = _index = AssociationIndex(expires=time.monotonic() + ttl)
+        index.build = asyncio.create_task(_build_index(index))
+    await asyncio.shield(index.build)
+    return index
+
+
+async def refresh_association(uuid: str) -> None:
+    """Refresh the periods of a written association in the index.
+
+    The association is read at all times, as the write may have moved it away from
+    an employee, or ended it. An index being built is refreshed, too, and its build
+    then leaves the association be.
+    """
+    index = _index
+    if index is None:
+        return
+    association = await _connector().organisationfunktion.get(uuid)
+    if not index.build.done():
+        index.refreshed.add(str(uuid))
+    index.set_association(str(uuid), association)
+
+
+def clear() -> None:
+    global _index
+    _index = None
@@ -12,10 +12,11 @@ async def get_results(entity, class_uuids, query):
         # Build map of {uuid: class data} so that we can look up each class
         # title later.
         class_uuids = class_uuids or []
-        class_map = {
-            str(class_uuid): await connector.klasse.get(class_uuid)
-            for class_uuid in class_uuids
-        }
+        class_map = (
+            dict(await connector.klasse.get_all_by_uuid(class_uuids))
+            if class_uuids
+            else {}
+        )
 
         # Fetch autocomplete results from LoRa
         scope = AutocompleteScope(connector, entity)
@@ -27,9 +27,10 @@ from datetime import datetime
 from fastapi import APIRouter
 
 from . import handlers
+from .. import codec
 from .. import common
 
-router = APIRouter()
+router = APIRouter(route_class=codec.JSONRoute)
 
 DetailType = collections.namedtuple(
     "DetailType",
@@ -20,6 +20,7 @@ from starlette.status import HTTP_201_CREATED
 from . import handlers
 from .. import exceptions
 from .. import mapping
+from .. import util
 from mora.auth.keycloak import oidc
 
 router = APIRouter()
@@ -37,6 +38,9 @@ async def handle_requests(
     else:
         exceptions.ErrorCodes.E_INVALID_INPUT(request=reqs)
 
+    if not is_single_request and util.get_args_flag("bulk"):
+        return await handlers.bulk_write(reqs, request_type)
+
     requests = await handlers.generate_requests(reqs, request_type)
 
     uuids = await handlers.submit_requests(requests)
@@ -56,6 +60,9 @@ async def create(
     .. :quickref: Writing; Create relation
 
     :query boolean force: When ``true``, bypass validations.
+    :query boolean bulk: When ``true``, and given a list of requests, write
+        them as a bulk write. Each request succeeds or fails on its own, and the
+        response holds the UUID or the error of each.
 
     :statuscode 200: Creation succeeded.
 
@@ -434,6 +441,9 @@ async def edit(
     .. :quickref: Writing; Edit relation
 
     :query boolean force: When ``true``, bypass validations.
+    :query boolean bulk: When ``true``, and given a list of requests, write
+        them as a bulk write. Each request succeeds or fails on its own, and the
+        response holds the UUID or the error of each.
 
     :statuscode 200: The edit succeeded.
 
@@ -946,6 +956,10 @@ async def terminate(
 
     .. :quickref: Writing; Terminate relation
 
+    :query boolean bulk: When ``true``, and given a list of requests, write
+        them as a bulk write. Each request succeeds or fails on its own, and the
+        response holds the UUID or the error of each.
+
     :<jsonarr str type: Same as for
               http:post:`/service/details/create` and
               http:post:`/service/details/edit`.
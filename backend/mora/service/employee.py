@@ -14,8 +14,6 @@ import asyncio
 import copy
 import enum
 from functools import partial
-from operator import contains
-from operator import itemgetter
 from typing import Any
 from typing import Awaitable
 from typing import Dict
@@ -29,9 +27,11 @@ from fastapi import Body
 from fastapi import Depends
 from ramodels.base import tz_isodate
 
+from . import association_index
 from . import autocomplete
 from . import handlers
 from . import org
+from .. import codec
 from .. import common
 from .. import config
 from .. import exceptions
@@ -45,7 +45,7 @@ from .validation import validator
 from mora.auth.keycloak import oidc
 from mora.request_scoped.bulking import request_wide_bulk
 
-router = APIRouter()
+router = APIRouter(route_class=codec.JSONRoute)
 
 
 @enum.unique
@@ -59,6 +59,7 @@ class EmployeeDetails(enum.Enum):
 
 class EmployeeRequestHandler(handlers.RequestHandler):
     role_type = "employee"
+    lora_object_type = LoraObjectType.user
 
     async def prepare_create(self, req):
         name = util.checked_get(req, mapping.NAME, "", required=False)
@@ -403,6 +404,7 @@ async def list_employees(
     query: Optional[str] = None,
     associated: Optional[bool] = None,
     only_primary_uuid: Optional[bool] = None,
+    cursor: Optional[str] = None,
 ):
     """Query employees in an organisation.
 
@@ -418,10 +420,14 @@ async def list_employees(
     :queryparam string query: Filter by employees matching this string.
         Please note that this only applies to attributes of the user, not the
         relations or engagements they have.
+    :queryparam string cursor: Cursor returned by a previous page, or empty for
+        the first page. The matching employees are then only found once, and
+        not recomputed for each page.
 
     :>json string items: The returned items.
     :>json string offset: Pagination offset.
     :>json string total: Total number of items available on this query.
+    :>json string cursor: Cursor for the next page, if requested.
 
     :>jsonarr string name: Human-readable name.
     :>jsonarr string uuid: Machine-friendly UUID.
@@ -487,11 +493,8 @@ async def list_employees(
     uuid_filters = []
     # Filter search_result to only show employees with associations
     if associated:
-        # NOTE: This call takes ~500ms on fixture-data
-        assocs = await c.organisationfunktion.get_all(funktionsnavn="Tilknytning")
-        assocs = map(itemgetter(1), assocs)
-        assocs = set(map(mapping.USER_FIELD.get_uuid, assocs))
-        uuid_filters.append(partial(contains, assocs))
+        index = await association_index.get_index()
+        uuid_filters.append(partial(index.is_associated, start=c.start, end=c.end))
 
     async def get_full_employee(*args, **kwargs):
         return await get_one_employee(
@@ -502,7 +505,11 @@ async def list_employees(
         )
 
     search_result = await c.bruger.paged_get(
-        get_full_employee, uuid_filters=uuid_filters, **kwargs
+        get_full_employee,
+        uuid_filters=uuid_filters,
+        uuid_filters_key=associated,
+        cursor=cursor,
+        **kwargs
     )
     return search_result
 
@@ -18,6 +18,8 @@ import enum
 import locale
 from asyncio import create_task
 from asyncio import gather
+from datetime import date
+from functools import partial
 from typing import Any
 from typing import Awaitable
 from typing import Dict
@@ -36,10 +38,12 @@ from more_itertools import one
 
 from . import handlers
 from .. import common
+from .. import config
 from .. import exceptions
 from .. import lora
 from .. import mapping
 from .. import util
+from ..cache import TTLCache
 from ..exceptions import ErrorCodes
 from ..lora import LoraObjectType
 from .tree_helper import prepare_ancestor_tree
@@ -570,13 +574,62 @@ async def get_classes_under_facet(
     )
 
 
+# Primary classes sorted by priority, by effective date of present-time reads
+primary_class_cache: TTLCache[date, List[Tuple[str, int]]] = TTLCache(
+    maxsize=10, ttl=config.get_settings().classification_cache_ttl
+)
+
+
+# Incremented by each invalidation, so lists computed meanwhile are not cached
+_primary_class_generation = 0
+
+
+def _invalidate_primary_classes(path: str, uuid: str) -> None:
+    global _primary_class_generation
+    _primary_class_generation += 1
+    primary_class_cache.clear()
+
+
+lora.on_classification_invalidated.append(_invalidate_primary_classes)
+
+
+def _primary_class_cache_date(c: lora.Connector) -> Optional[date]:
+    if (
+        not config.get_settings().classification_cache
+        or c.validity != "present"
+        or c.end - c.start != util.MINIMAL_INTERVAL
+    ):
+        return None
+    return c.now.date()
+
+
 async def get_sorted_primary_class_list(c: lora.Connector) -> List[Tuple[str, int]]:
     """
     Return a list of primary classes, sorted by priority in the "scope" field
 
+    Lists of present-time reads are shared between requests, and forgotten when a
+    class or facet is written. Others are computed once per request.
+
     :param c: A LoRa connector
     :return: A sorted list of tuples of (uuid, scope) for all available primary classes
     """
+    cache_date = _primary_class_cache_date(c)
+    if cache_date is not None:
+        sorted_classes = primary_class_cache.get(cache_date)
+        if sorted_classes is not None:
+            return list(sorted_classes)
+
+    generation = _primary_class_generation
+    sorted_classes = await request_wide_bulk.memoized(
+        ("sorted_primary_classes", c.validity, c.start, c.end),
+        partial(_get_sorted_primary_class_list, c),
+    )
+    if cache_date is not None and generation == _primary_class_generation:
+        primary_class_cache.set(cache_date, sorted_classes)
+    return list(sorted_classes)
+
+
+async def _get_sorted_primary_class_list(c: lora.Connector) -> List[Tuple[str, int]]:
     facet_id = (await c.facet.load_uuids(bvn="primary_type"))[0]
 
     classes = await gather(
@@ -778,6 +831,7 @@ async def get_all_classes(
 
 class ClassRequestHandler(handlers.RequestHandler):
     role_type = "class"
+    lora_object_type = LoraObjectType.class_
 
     async def prepare_create(self, request: dict):
         valid_from = util.NEGATIVE_INFINITY
@@ -7,20 +7,27 @@ handlers for the various detail types.
 """
 
 import abc
+import collections
 import inspect
+import itertools
 import typing
+from contextvars import ContextVar
 
 import asyncio
 
 from structlog import get_logger
 
 from .. import common
+from .. import config
 from .. import exceptions
 from .. import lora
 from .. import mapping
 from .. import util
+from ..async_util import gather_bounded
+from ..lora import LoraObjectType
 from ..mapping import EventType, RequestType
 from ..triggers import Trigger
+from .validation import validator
 
 # The handler mappings are populated by each individual active
 # RequestHandler
@@ -30,6 +37,11 @@ FUNCTION_KEYS = {}
 
 logger = get_logger()
 
+# Set by bulk writes, which defer the ON_AFTER triggers of the submitted requests
+_deferred_triggers: ContextVar[typing.Optional[list]] = ContextVar(
+    "deferred_triggers", default=None
+)
+
 
 class _RequestHandlerMeta(abc.ABCMeta):
     """Metaclass for automatically registering handlers"""
@@ -56,6 +68,11 @@ class RequestHandler(metaclass=_RequestHandlerMeta):
     The `role_type` for corresponding details to this attribute.
     """
 
+    lora_object_type: typing.Optional[LoraObjectType] = None
+    """
+    The type of LoRa object written by the handler, if any.
+    """
+
     @classmethod
     def _register(cls):
         assert cls.role_type is not None
@@ -188,7 +205,11 @@ class RequestHandler(metaclass=_RequestHandlerMeta):
         )
         self.trigger_results_after = None
         if not util.get_args_flag("triggerless"):
-            self.trigger_results_after = await Trigger.run(self.trigger_dict)
+            deferred = _deferred_triggers.get()
+            if deferred is not None:
+                deferred.append(self)
+            else:
+                self.trigger_results_after = await Trigger.run(self.trigger_dict)
 
         return getattr(self, Trigger.RESULT, None)
 
@@ -197,6 +218,8 @@ class OrgFunkRequestHandler(RequestHandler):
     """Abstract base class for automatically registering
     `organisationsfunktion`-based handlers."""
 
+    lora_object_type = LoraObjectType.org_func
+
     function_key = None
     """
     When set, automatically register this class as a writing handler
@@ -323,25 +346,150 @@ async def generate_requests(
             types=sorted(operations - HANDLERS_BY_ROLE_TYPE.keys()),
         )
 
-    requesthandlers = []
-    for req in requests:
-        requesthandler_klasse = HANDLERS_BY_ROLE_TYPE[req.get("type")]
-        if request_type == RequestType.CREATE:
-            requesthandlers.append(
-                await requesthandler_klasse.construct(req, request_type)
-            )
-        elif request_type == RequestType.EDIT:
-            requesthandlers.append(
-                await requesthandler_klasse.construct(req, request_type)
-            )
-        elif request_type == RequestType.TERMINATE:
-            requesthandlers.append(
-                await requesthandler_klasse.construct(req, request_type)
-            )
-        else:
-            requesthandlers.append(await requesthandler_klasse(req, request_type))
-    return requesthandlers
+    # The requests are prepared concurrently, sharing the objects and validities
+    # read by the validators between them
+    with validator.validation_memo():
+        return await gather_bounded(
+            (_construct(req, request_type) for req in requests),
+            config.get_settings().request_preparation_concurrency,
+        )
+
+
+async def _construct(req: dict, request_type: RequestType) -> RequestHandler:
+    requesthandler_klasse = get_handler_for_role_type(req.get("type"))
+    if request_type in (
+        RequestType.CREATE,
+        RequestType.EDIT,
+        RequestType.TERMINATE,
+    ):
+        return await requesthandler_klasse.construct(req, request_type)
+    return await requesthandler_klasse(req, request_type)
 
 
 async def submit_requests(requests: typing.List[RequestHandler]) -> typing.List[str]:
     return await asyncio.gather(*(request.submit() for request in requests))
+
+
+# Objects referred to by others are written first in bulk writes
+BULK_WRITE_ORDER = (
+    LoraObjectType.user,
+    LoraObjectType.org_unit,
+    LoraObjectType.class_,
+    LoraObjectType.org_func,
+    None,
+)
+
+
+def _error_result(e: Exception) -> dict:
+    if not isinstance(e, exceptions.HTTPException):
+        e = exceptions.ErrorCodes.E_UNKNOWN.to_http_exception(message=repr(e))
+    return e.detail
+
+
+async def bulk_write(
+    requests: typing.List[dict], request_type: RequestType
+) -> typing.List[typing.Union[str, dict]]:
+    """Prepare and submit a batch of requests, e.g. for mass imports.
+
+    Unlike :func:`generate_requests` and :func:`submit_requests`, a failing request
+    does not fail the others. The result of each request is either its UUID or its
+    error.
+
+    The requests are grouped by the object type they write, and each group is
+    prepared and then submitted in turn, so the requests of a group are validated
+    against the objects written by the previous groups. The LoRa writes are done
+    with at most ``bulk_write_concurrency`` at a time, and retried on transient
+    errors. The ON_AFTER triggers are run once all writes are done, once per
+    changed object.
+    """
+    results: typing.List[typing.Union[str, dict, None]] = [None] * len(requests)
+    limit = config.get_settings().bulk_write_concurrency
+
+    groups = collections.defaultdict(list)
+    for index, req in enumerate(requests):
+        try:
+            requesthandler_klasse = get_handler_for_role_type(req.get("type"))
+        except Exception as e:
+            results[index] = _error_result(e)
+        else:
+            groups[requesthandler_klasse.lora_object_type].append(index)
+
+    # ON_AFTER triggers of the requests, including any subrequests
+    deferred: typing.Dict[int, typing.List[RequestHandler]] = {}
+
+    async def prepare(index: int) -> typing.Optional[RequestHandler]:
+        try:
+            return await _construct(requests[index], request_type)
+        except Exception as e:
+            results[index] = _error_result(e)
+            return None
+
+    async def submit(index: int, requesthandler: RequestHandler) -> None:
+        deferred[index] = []
+        # Each submit runs in its own task, and thus its own context
+        _deferred_triggers.set(deferred[index])
+        try:
+            results[index] = await requesthandler.submit()
+        except Exception as e:
+            results[index] = _error_result(e)
+            del deferred[index]
+
+    token = lora.write_retries.set(config.get_settings().bulk_write_retries)
+    try:
+        for lora_object_type in BULK_WRITE_ORDER:
+            indexes = groups[lora_object_type]
+            with validator.validation_memo():
+                requesthandlers = await gather_bounded(
+                    map(prepare, indexes),
+                    config.get_settings().request_preparation_concurrency,
+                )
+            await gather_bounded(
+                (
+                    submit(index, requesthandler)
+                    for index, requesthandler in zip(indexes, requesthandlers)
+                    if requesthandler is not None
+                ),
+                limit,
+            )
+    finally:
+        lora.write_retries.reset(token)
+
+    await _run_deferred_triggers(deferred, results, limit)
+    return results
+
+
+async def _run_deferred_triggers(
+    deferred: typing.Dict[int, typing.List[RequestHandler]],
+    results: typing.List[typing.Union[str, dict, None]],
+    limit: int,
+) -> None:
+    """Run the deferred ON_AFTER triggers once per changed object.
+
+    If several requests change the same object, the triggers are run for the last
+    of them, and a failure is reported for all of them.
+    """
+    events: typing.Dict[tuple, typing.Tuple[RequestHandler, typing.List[int]]] = {}
+    for index, requesthandlers in deferred.items():
+        for requesthandler in requesthandlers:
+            trigger_dict = requesthandler.trigger_dict
+            key = (
+                trigger_dict[Trigger.ROLE_TYPE],
+                trigger_dict[Trigger.REQUEST_TYPE],
+                trigger_dict[Trigger.UUID],
+            )
+            _, indexes = events.get(key, (None, []))
+            events[key] = (requesthandler, indexes + [index])
+
+    async def run(requesthandler: RequestHandler, indexes: typing.List[int]):
+        try:
+            requesthandler.trigger_results_after = await Trigger.run(
+                requesthandler.trigger_dict
+            )
+        except exceptions.HTTPException as e:
+            for index in indexes:
+                # The changes were written, so the UUID is reported along with the
+                # error
+                if not isinstance(results[index], dict):
+                    results[index] = {**e.detail, "uuid": results[index]}
+
+    await gather_bounded(itertools.starmap(run, events.values()), limit)
@@ -5,14 +5,11 @@ import json
 import csv
 
 from zipfile import ZipFile
-from io import StringIO, BytesIO
-from typing import List, Union, Optional, Dict, Any
+from io import RawIOBase, TextIOWrapper
+from typing import List, Union, Optional, Dict, Any, Iterable, Iterator, TextIO
 from pydantic import BaseModel, Extra
 from fastapi import APIRouter, Query
 from pathlib import Path
-from asyncio import gather
-from itertools import starmap
-from functools import partial
 
 from starlette.responses import StreamingResponse
 
@@ -23,6 +20,9 @@ from .. import config, exceptions
 router = APIRouter()
 logger = get_logger()
 
+# Characters read from the JSON reports at a time
+CHUNK_SIZE = 64 * 1024
+
 
 class Insight(BaseModel):
     """
@@ -80,25 +80,11 @@ async def download_csv() -> StreamingResponse:
     directory_exists(directory)
 
     list_of_files = list(filter(lambda path: path.is_file(), directory.iterdir()))
-    iter_of_json = map(read_json_from_disc, list_of_files)
-    iter_of_csv = (
-        json_to_csv(json_file, extract_fieldnames(json_file))
-        for json_file in iter_of_json
-    )
-
-    async def zip_writestr(zip_file: ZipFile, file: Path, csv_file: StringIO):
-        zip_file.writestr(file.stem + ".csv", csv_file.getvalue().encode("utf-8-sig"))
-
-    zip_buffer = BytesIO()
-    with ZipFile(zip_buffer, "w") as zip_file:
-        zip_writestr_with_buffer = partial(zip_writestr, zip_file)
-        tasks = starmap(zip_writestr_with_buffer, zip(list_of_files, iter_of_csv))
-        await gather(*tasks)
-
-    zip_buffer.seek(0)
 
+    # The iterator is synchronous, so Starlette runs it in a thread pool and the
+    # file I/O and encoding do not block the event loop.
     return StreamingResponse(
-        zip_buffer,
+        stream_zip_of_csvs(list_of_files),
         media_type="application/zip",
         headers={"content-disposition": "attachment; filename=insights.zip"},
     )
@@ -108,18 +94,159 @@ def read_json_from_disc(file: Path):
     return json.loads(file.read_text())
 
 
-def json_to_csv(json_data: Dict[str, Any], fieldnames: List[str]) -> StringIO:
-    output = StringIO()
-
-    writer = csv.DictWriter(output, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
-    writer.writeheader()
-    writer.writerows(json_data["data"])
-
-    return output
+class JSONStream:
+    """Incremental reader of a JSON document, holding at most a value at a time.
 
+    Only the structure needed for the reports is supported: the members of the
+    top-level object can be iterated, and each member value can either be read
+    whole or, if it is an array, be iterated item by item.
+    """
 
-def extract_fieldnames(json_data: Dict[str, Any]) -> List[str]:
-    return [field["name"] for field in json_data["schema"]["fields"]]
+    def __init__(self, file: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> None:
+        chunk = self.file.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        self.eof = not chunk
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at the end."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos : self.pos + 1]
+            self._fill()
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Read the next complete value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            self._fill()
+
+    def skip(self) -> None:
+        """Skip the next value; arrays are skipped an item at a time."""
+        if self._peek() == "[":
+            for _ in self.items():
+                pass
+        else:
+            self.value()
+
+    def members(self) -> Iterator[str]:
+        """Iterate the keys of an object; each value must be read by the caller."""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def items(self) -> Iterator[Any]:
+        """Iterate the items of an array."""
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self._expect(",]") == "]":
+                return
+
+
+def read_fieldnames(file: Path) -> List[str]:
+    """Read the field names from the schema of a JSON report."""
+    with file.open(encoding="utf-8") as f:
+        stream = JSONStream(f)
+        for key in stream.members():
+            if key == "schema":
+                return [field["name"] for field in stream.value()["fields"]]
+            stream.skip()
+    raise ValueError(f"No schema in {file}")
+
+
+def read_rows(file: Path) -> Iterator[Dict[str, Any]]:
+    """Read the rows of a JSON report one at a time."""
+    with file.open(encoding="utf-8") as f:
+        stream = JSONStream(f)
+        for key in stream.members():
+            if key == "data":
+                yield from stream.items()
+                return
+            stream.skip()
+
+
+class ChunkBuffer(RawIOBase):
+    """Unseekable, write-only stream collecting the bytes written to it."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.chunks.append(bytes(b))
+        return len(b)
+
+    def pop(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip_of_csvs(files: Iterable[Path]) -> Iterator[bytes]:
+    """Convert JSON reports to CSVs in a ZIP file, yielded in chunks.
+
+    Reports are read, encoded and compressed a row at a time, so memory use does
+    not depend on the size of the reports.
+    """
+    buffer = ChunkBuffer()
+    # The ZIP file is written to an unseekable stream, so sizes are written after
+    # each file's data, and ZIP64 is needed as they are unknown beforehand.
+    with ZipFile(buffer, "w") as zip_file:
+        for file in files:
+            fieldnames = read_fieldnames(file)
+            with zip_file.open(file.stem + ".csv", "w", force_zip64=True) as entry:
+                with TextIOWrapper(entry, encoding="utf-8-sig", newline="") as text:
+                    writer = csv.DictWriter(
+                        text, fieldnames=fieldnames, quoting=csv.QUOTE_ALL
+                    )
+                    writer.writeheader()
+                    for row in read_rows(file):
+                        writer.writerow(row)
+                        if buffer.chunks:
+                            yield buffer.pop()
+            yield buffer.pop()
+    yield buffer.pop()
 
 
 def directory_exists(directory: Path):
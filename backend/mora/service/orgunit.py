@@ -18,6 +18,7 @@ import operator
 from asyncio import create_task
 from asyncio import gather
 from datetime import date
+from functools import partial
 from itertools import chain
 from typing import Any
 from typing import Awaitable
@@ -34,12 +35,13 @@ from fastapi import Depends
 from fastapi import Query
 from mora.auth.keycloak import oidc
 from mora.request_scoped.bulking import request_wide_bulk
-from more_itertools import unzip
 
 from . import autocomplete
 from . import facet
 from . import handlers
 from . import org
+from . import orgunit_index
+from .. import codec
 from .. import common
 from .. import conf_db
 from .. import config
@@ -54,7 +56,7 @@ from .tree_helper import prepare_ancestor_tree
 from .validation import validator
 from ..graphapi.middleware import is_graphql
 
-router = APIRouter()
+router = APIRouter(route_class=codec.JSONRoute)
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +86,7 @@ class UnitDetails(enum.Enum):
 
 class OrgUnitRequestHandler(handlers.RequestHandler):
     role_type = "org_unit"
+    lora_object_type = LoraObjectType.org_unit
 
     async def prepare_create(self, req):
         name = util.checked_get(req, mapping.NAME, "", required=True)
@@ -327,6 +330,9 @@ class OrgUnitRequestHandler(handlers.RequestHandler):
         else:
             self.result = await c.organisationenhed.update(self.payload, self.uuid)
 
+        if self.request_type != mapping.RequestType.REFRESH:
+            await orgunit_index.refresh_units([self.uuid])
+
         submit = await super().submit()
         if self.request_type == mapping.RequestType.REFRESH:
             return {
@@ -420,6 +426,30 @@ async def request_bulked_get_one_orgunit(
     )
 
 
+async def get_unit_settings(unitid: str, parent: Optional[dict]) -> Dict[str, Any]:
+    """The settings of the unit, inherited from its parent and the global settings.
+
+    Settings are resolved once per unit during a request.
+    """
+    resolved = conf_db.request_resolved_configuration.get()
+    if resolved is not None and unitid in resolved:
+        return dict(resolved[unitid])
+
+    settings = await conf_db.get_configuration_async(unitid)
+    if parent:
+        parent_settings = parent[mapping.USER_SETTINGS]["orgunit"]
+        for setting, value in parent_settings.items():
+            settings.setdefault(setting, value)
+
+    global_settings = await conf_db.get_configuration_async()
+    for setting, value in global_settings.items():
+        settings.setdefault(setting, value)
+
+    if resolved is not None:
+        resolved[unitid] = dict(settings)
+    return settings
+
+
 async def get_one_orgunit(
     c: lora.Connector,
     unitid,
@@ -428,9 +458,13 @@ async def get_one_orgunit(
     validity=None,
     only_primary_uuid: bool = False,
     count_related: dict = None,
+    counts: Optional[Dict[str, int]] = None,
 ) -> Optional[Dict[Any, Any]]:
     """
     Internal API for returning one organisation unit.
+
+    The child count and the counts of related objects are taken from 'counts' if
+    given, as computed for many units at once by get_unit_counts.
     """
     if only_primary_uuid:
         return {mapping.UUID: unitid}
@@ -468,11 +502,14 @@ async def get_one_orgunit(
         )
 
     if details is UnitDetails.NCHILDREN:
-        children = await c.organisationenhed.load_uuids(
-            overordnet=unitid,
-            gyldighed="Aktiv",
-        )
-        r["child_count"] = len(children)
+        if counts is not None:
+            r["child_count"] = counts["child_count"]
+        else:
+            children = await c.organisationenhed.load_uuids(
+                overordnet=unitid,
+                gyldighed="Aktiv",
+            )
+            r["child_count"] = len(children)
     elif details is UnitDetails.FULL or details is UnitDetails.PATH:
         parent_task = create_task(
             await request_bulked_get_one_orgunit(
@@ -517,19 +554,7 @@ async def get_one_orgunit(
                 r[mapping.LOCATION] = ""
 
             if details is UnitDetails.FULL:
-                settings = {}
-                local_settings = conf_db.get_configuration(unitid)
-
-                settings.update(local_settings)
-                if parent:
-                    parent_settings = parent[mapping.USER_SETTINGS]["orgunit"]
-                    for setting, value in parent_settings.items():
-                        settings.setdefault(setting, value)
-
-                global_settings = conf_db.get_configuration()
-                for setting, value in global_settings.items():
-                    settings.setdefault(setting, value)
-
+                settings = await get_unit_settings(unitid, parent)
                 r[mapping.USER_SETTINGS] = {"orgunit": settings}
 
         if details is UnitDetails.FULL:
@@ -601,11 +626,46 @@ async def get_one_orgunit(
 
     count_related = count_related or {}
     for key, reader in count_related.items():
-        r["%s_count" % key] = await reader.get_count(c, "ou", unitid)
+        if counts is not None:
+            r["%s_count" % key] = counts["%s_count" % key]
+        else:
+            r["%s_count" % key] = await reader.get_count(c, "ou", unitid)
 
     return r
 
 
+async def get_unit_counts(
+    c: lora.Connector,
+    unitids: Iterable[str],
+    count_related: Optional[Dict] = None,
+    nchildren_unitids: Iterable[str] = (),
+) -> Dict[str, Dict[str, int]]:
+    """Count the children and related objects of many units.
+
+    Each kind of count is found with a single search for all the units, rather
+    than one per unit.
+
+    :param unitids: The units to count related objects of.
+    :param count_related: Reading handlers of the related objects, by name.
+    :param nchildren_unitids: The units to count children of.
+    :return: The counts of each unit, by the key of the count in the unit.
+    """
+    nchildren_unitids = list(nchildren_unitids)
+    counts = {unitid: {} for unitid in chain(unitids, nchildren_unitids)}
+    searches = {}
+    if nchildren_unitids:
+        searches["child_count"] = c.organisationenhed.get_counts(
+            "overordnet", nchildren_unitids, gyldighed="Aktiv"
+        )
+    for key, reader in (count_related or {}).items():
+        searches["%s_count" % key] = reader.get_counts(c, "ou", list(counts))
+
+    for key, key_counts in zip(searches, await gather(*searches.values())):
+        for unitid, count in key_counts.items():
+            counts[unitid][key] = count
+    return counts
+
+
 @router.get("/ou/autocomplete/")
 async def autocomplete_orgunits(query: str):
     settings = config.get_settings()
@@ -723,6 +783,13 @@ async def _get_immediate_children(
 async def _collect_child_objects(connector, children: Iterable[Dict]):
     only_primary_uuid = util.get_args_flag("only_primary_uuid")
     count_related = {t: get_handler_for_type(t) for t in _get_count_related()}
+    children = list(children)
+    counts = {}
+    if not only_primary_uuid:
+        childids = [childid for childid, _ in children]
+        counts = await get_unit_counts(
+            connector, childids, count_related, nchildren_unitids=childids
+        )
     return await gather(
         *[
             create_task(
@@ -732,6 +799,7 @@ async def _collect_child_objects(connector, children: Iterable[Dict]):
                     unit=child,
                     only_primary_uuid=only_primary_uuid,
                     count_related=count_related,
+                    counts=counts.get(childid),
                 )
             )
             for childid, child in children
@@ -852,6 +920,7 @@ async def get_unit_tree(
             details=details,
             only_primary_uuid=only_primary_uuid,
             count_related=count_related,
+            counts=counts.get(unitid),
         )
         if unitid in children:
             r["children"] = await get_units(children[unitid])
@@ -877,16 +946,40 @@ async def get_unit_tree(
 
         return args
 
+    known_ancestors = []
+    if orgunit_index.is_shared(c):
+        for unitid in unitids:
+            known_ancestors.extend(await orgunit_index.get_ancestors(c, unitid))
+
     root_uuids, children, cache = await prepare_ancestor_tree(
         c.organisationenhed,
         mapping.PARENT_FIELD,
         unitids,
         get_children_args,
         with_siblings=with_siblings,
+        known_ancestors=known_ancestors,
     )
     # Strip off one level
     root_uuids = set(flatten([children[uuid] for uuid in root_uuids]))
 
+    # Count for all units of the tree at once
+    counts = {}
+    if not only_primary_uuid:
+        unitids = []
+        pending = list(root_uuids)
+        while pending:
+            unitid = pending.pop()
+            unitids.append(unitid)
+            pending.extend(children.get(unitid, ()))
+        nchildren_unitids = (
+            [unitid for unitid in unitids if unitid not in children]
+            if with_siblings
+            else []
+        )
+        counts = await get_unit_counts(
+            c, unitids, count_related, nchildren_unitids=nchildren_unitids
+        )
+
     return await get_units(root for root in root_uuids)
 
 
@@ -1056,6 +1149,7 @@ async def list_orgunits(
     query: Optional[str] = None,
     root: Optional[str] = None,
     only_primary_uuid: Optional[bool] = None,
+    cursor: Optional[str] = None,
 ):
     """Query organisational units in an organisation.
 
@@ -1068,10 +1162,14 @@ async def list_orgunits(
     :queryparam int start: Index of first unit for paging.
     :queryparam int limit: Maximum items
     :queryparam string query: Filter by units matching this string.
+    :queryparam string cursor: Cursor returned by a previous page, or empty for
+        the first page. The matching units are then only found once, and not
+        recomputed for each page.
 
     :>json string items: The returned items.
     :>json string offset: Pagination offset.
     :>json string total: Total number of items available on this query.
+    :>json string cursor: Cursor for the next page, if requested.
 
     :>jsonarr string name: Human-readable name.
     :>jsonarr string uuid: Machine-friendly UUID.
@@ -1143,28 +1241,7 @@ async def list_orgunits(
 
     uuid_filters = []
     if root:
-        enheder = await c.organisationenhed.get_all()
-
-        uuids, enheder = unzip(enheder)
-        # Fetch parent_uuid from objects
-        parent_uuids = map(mapping.PARENT_FIELD.get_uuid, enheder)
-        # Create map from uuid --> parent_uuid
-        parent_map = dict(zip(uuids, parent_uuids))
-
-        def entry_under_root(uuid):
-            """Check whether the given uuid is in the subtree under 'root'.
-
-            Works by recursively ascending the parent_map.
-
-            If the specified root is found, we must have started in its subtree.
-            If the specified root is not found, we will stop searching at the
-                root of the organisation tree.
-            """
-            if uuid not in parent_map:
-                return False
-            return uuid == root or entry_under_root(parent_map[uuid])
-
-        uuid_filters.append(entry_under_root)
+        uuid_filters.append(partial(orgunit_index.is_under, c, root=root))
 
     details = get_details_from_query_args(util.get_query_args())
 
@@ -1174,7 +1251,11 @@ async def list_orgunits(
         )
 
     search_result = await c.organisationenhed.paged_get(
-        get_minimal_orgunit, uuid_filters=uuid_filters, **kwargs
+        get_minimal_orgunit,
+        uuid_filters=uuid_filters,
+        uuid_filters_key=root,
+        cursor=cursor,
+        **kwargs,
     )
     return search_result
 
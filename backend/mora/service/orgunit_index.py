@@ -0,0 +1,174 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+"""
+In-memory index of the organisation unit hierarchy.
+
+The index maps every organisation unit to its parent, and every parent to its
+children, so ancestors, descendants and depth can be answered without LoRa
+round-trips. Indexes of present-time reads are shared between requests, one per
+effective date, and refreshed incrementally when organisation units are written.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+
+from structlog import get_logger
+
+from .. import config
+from .. import lora
+from .. import mapping
+from ..cache import SharedIndexes
+
+logger = get_logger()
+
+
+class OrgUnitIndex:
+    """Parent and children of all organisation units at an effective time."""
+
+    def __init__(self, now: datetime, parents: Dict[str, Optional[str]]):
+        self.now = now
+        self.parents: Dict[str, Optional[str]] = {}
+        self.children: Dict[str, Set[str]] = defaultdict(set)
+        for uuid, parent_uuid in parents.items():
+            self.set_parent(uuid, parent_uuid)
+        # Parents known not to be units, i.e. the organisation
+        self.non_units: Set[str] = set(self.children) - set(self.parents)
+
+    def __contains__(self, uuid: str) -> bool:
+        return uuid in self.parents
+
+    def set_parent(self, uuid: str, parent_uuid: Optional[str]) -> None:
+        self.remove(uuid)
+        self.parents[uuid] = parent_uuid
+        if parent_uuid is not None:
+            self.children[parent_uuid].add(uuid)
+
+    def remove(self, uuid: str) -> None:
+        if uuid not in self.parents:
+            return
+        parent_uuid = self.parents.pop(uuid)
+        siblings = self.children.get(parent_uuid)
+        if siblings is not None:
+            siblings.discard(uuid)
+            if not siblings:
+                del self.children[parent_uuid]
+
+    def get_ancestors(self, uuid: str) -> List[str]:
+        """The unit followed by its ancestors, up to the top-level unit.
+
+        Parents which are not units themselves, i.e. the organisation, are left out.
+        """
+        ancestors = []
+        while uuid in self.parents and uuid not in ancestors:
+            ancestors.append(uuid)
+            uuid = self.parents[uuid]
+        return ancestors
+
+    def get_descendants(self, uuid: str) -> Set[str]:
+        """All units in the subtree under the unit, excluding the unit itself."""
+        descendants = set()
+        pending = [uuid]
+        while pending:
+            children = self.children.get(pending.pop(), set()) - descendants
+            descendants.update(children)
+            pending.extend(children)
+        return descendants
+
+    def is_under(self, uuid: str, root: str) -> bool:
+        """Whether the unit is the root or in the subtree under it."""
+        return root in self.get_ancestors(uuid)
+
+    def get_depth(self, uuid: str) -> int:
+        """Number of ancestors of the unit, i.e. 0 for top-level units."""
+        return len(self.get_ancestors(uuid)) - 1
+
+
+async def _build_index(c: lora.Connector) -> OrgUnitIndex:
+    units = await c.organisationenhed.get_all()
+    parents = {uuid: mapping.PARENT_FIELD.get_uuid(obj) for uuid, obj in units}
+    logger.debug("org_unit_index_built", units=len(parents), now=c.now)
+    return OrgUnitIndex(c.now, parents)
+
+
+_indexes: SharedIndexes[OrgUnitIndex] = SharedIndexes(
+    _build_index,
+    maxsize=config.get_settings().org_unit_index_size,
+    ttl=config.get_settings().org_unit_index_ttl,
+)
+
+
+def is_shared(c: lora.Connector) -> bool:
+    """Whether reads through the connector can use a shared index."""
+    return c.shared_date is not None
+
+
+async def get_index(c: lora.Connector) -> OrgUnitIndex:
+    """The index at the effective time of the connector.
+
+    Indexes are shared if possible, and otherwise built for the caller alone.
+    """
+    return await _indexes.get(c)
+
+
+async def get_ancestors(c: lora.Connector, uuid: str) -> List[str]:
+    """The unit followed by its ancestors, up to the top-level unit.
+
+    Units missing from the index, e.g. if created through another MO instance, are
+    fetched and added to it.
+    """
+    return await _climb(c, await get_index(c), str(uuid))
+
+
+async def is_under(c: lora.Connector, uuid: str, root: str) -> bool:
+    """Whether the unit is the root or in the subtree under it.
+
+    Units missing from the index are fetched and added to it, as by
+    :func:`get_ancestors`.
+    """
+    return str(root) in await get_ancestors(c, uuid)
+
+
+async def read_ancestors(c: lora.Connector, uuid: str) -> List[str]:
+    """The unit followed by its ancestors, as currently in LoRa.
+
+    Unlike :func:`get_ancestors`, the shared index is not used, as it may not have
+    seen units moved through other MO instances yet. Use this for decisions which
+    must not act on stale data, such as authorization.
+    """
+    return await _climb(c, OrgUnitIndex(c.now, {}), str(uuid))
+
+
+async def _climb(c: lora.Connector, index: OrgUnitIndex, uuid: str) -> List[str]:
+    while True:
+        ancestors = index.get_ancestors(uuid)
+        top = index.parents[ancestors[-1]] if ancestors else uuid
+        # Stop at the organisation, or if the hierarchy is cyclic
+        if top is None or top in index.non_units or top in index:
+            return ancestors
+        obj = await c.organisationenhed.get(top)
+        if obj:
+            index.set_parent(top, mapping.PARENT_FIELD.get_uuid(obj))
+        else:
+            index.non_units.add(top)
+
+
+async def refresh_units(uuids: Iterable[str]) -> None:
+    """Re-read the parents of written units into all shared indexes."""
+    uuids = list(map(str, uuids))
+    for index in _indexes.values():
+        c = lora.Connector(effective_date=index.now)
+        objs = dict(await c.organisationenhed.get_all_by_uuid(uuids))
+        for uuid in uuids:
+            index.non_units.discard(uuid)
+            if uuid in objs:
+                index.set_parent(uuid, mapping.PARENT_FIELD.get_uuid(objs[uuid]))
+            else:
+                index.remove(uuid)
+
+
+def clear() -> None:
+    _indexes.clear()
@@ -10,6 +10,7 @@ This section describes how to interact with related units.
 """
 from asyncio import create_task, gather
 from uuid import UUID
+from uuid import uuid4
 
 from fastapi import APIRouter, Body
 
@@ -182,7 +183,10 @@ async def map_org_units(origin: UUID, req: dict = Body(...)):
         ),
         "added": sorted(
             await gather(
-                *[create_task(c.organisationfunktion.create(req)) for req in creations]
+                *[
+                    create_task(c.organisationfunktion.create(req, str(uuid4())))
+                    for req in creations
+                ]
             )
         ),
         "unchanged": sorted(destinations & preexisting.keys()),
@@ -12,8 +12,60 @@ from more_itertools import one
 from mora.service.employee import router as employee_router
 from mora.service.itsystem import router as it_router
 from ..graphapi.shim import execute_graphql
+from ..graphapi.shim import register_query
 from .. import exceptions
 
+EMPLOYEE_UUID_QUERY = register_query(
+    """
+    query EmployeeQuery($uuid: UUID!) {
+      employees(uuids: [$uuid]) {
+        uuid
+      }
+    }
+    """
+)
+
+EMPLOYEE_QUERY = register_query(
+    """
+    query EmployeeQuery($uuid: UUID!) {
+      employees(uuids: [$uuid]) {
+        uuid, user_key, cpr_no
+        givenname, surname
+        nickname_givenname, nickname_surname
+        seniority
+      }
+      org {
+        uuid, user_key, name
+      }
+    }
+    """
+)
+
+VERSION_QUERY = register_query(
+    """
+    query VersionQuery {
+      version {
+        mo_hash
+        lora_version
+        mo_version
+      }
+    }
+    """
+)
+
+IT_SYSTEM_QUERY = register_query(
+    """
+    query ITSystemQuery {
+      itsystems {
+        uuid, name, system_type, user_key
+      }
+      org {
+        uuid
+      }
+    }
+    """
+)
+
 
 @employee_router.get("/e/{id}/")
 async def get_employee(id: UUID, only_primary_uuid: Optional[bool] = None):
@@ -67,31 +119,13 @@ async def get_employee(id: UUID, only_primary_uuid: Optional[bool] = None):
 
     """
     if only_primary_uuid:
-        query = """
-        query EmployeeQuery($uuid: UUID!) {
-          employees(uuids: [$uuid]) {
-            uuid
-          }
-        }
-        """
+        query = EMPLOYEE_UUID_QUERY
 
         def transformer(data: Dict[str, Any]) -> Dict[str, Any]:
             return one(r.data["employees"])
 
     else:
-        query = """
-        query EmployeeQuery($uuid: UUID!) {
-          employees(uuids: [$uuid]) {
-            uuid, user_key, cpr_no
-            givenname, surname
-            nickname_givenname, nickname_surname
-            seniority
-          }
-          org {
-            uuid, user_key, name
-          }
-        }
-        """
+        query = EMPLOYEE_QUERY
 
         def transformer(data: Dict[str, Any]) -> Dict[str, Any]:
             employee = one(r.data["employees"])
@@ -122,18 +156,8 @@ def meta_router():
 
     @router.get("/version/")
     async def version():
-        query = """
-        query VersionQuery {
-          version {
-            mo_hash
-            lora_version
-            mo_version
-          }
-        }
-        """
-
         # Execute GraphQL query to fetch required data
-        r = await execute_graphql(query)
+        r = await execute_graphql(VERSION_QUERY)
         if r.errors:
             raise ValueError(r.errors)
 
@@ -184,17 +208,7 @@ async def list_it_systems(orgid: UUID):
     """
     orgid = str(orgid)
 
-    query = """
-    query ITSystemQuery {
-      itsystems {
-        uuid, name, system_type, user_key
-      }
-      org {
-        uuid
-      }
-    }
-    """
-    r = await execute_graphql(query)
+    r = await execute_graphql(IT_SYSTEM_QUERY)
     if r.errors:
         raise ValueError(r.errors)
     if r.data["org"]["uuid"] != orgid:
@@ -4,6 +4,7 @@ import collections
 from asyncio import create_task
 from queue import Empty, Queue
 from typing import Dict
+from typing import Iterable
 
 from ..lora import Scope
 from ..mapping import (
@@ -29,6 +30,7 @@ async def prepare_ancestor_tree(
     uuids,
     get_children_args,
     with_siblings=False,
+    known_ancestors: Iterable = (),
 ):
     """Return a tree helper structure, bounded by the given uuids.
 
@@ -43,6 +45,9 @@ async def prepare_ancestor_tree(
             children of the current uuid.
         with_siblings (bool):
             Add siblings of ancestors to children and cache.
+        known_ancestors (Iterable):
+            UUIDs of ancestors already known, e.g. from an index, which are
+            fetched in bulk up front rather than one at a time while climbing.
 
     Returns:
         set, dict(set), dict:
@@ -91,7 +96,7 @@ async def prepare_ancestor_tree(
     root_uuids = set()
 
     # Bulk cache for performance
-    await get_bulk(uuids)
+    await get_bulk({*uuids, *known_ancestors})
 
     # Initialize our queue
     task_queue = Queue()
@@ -6,6 +6,8 @@ import datetime
 import functools
 import typing
 from asyncio import create_task, gather
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from more_itertools import pairwise
 
@@ -40,31 +42,104 @@ def forceable(fn):
     return wrapper
 
 
-async def _is_date_range_valid(
-    obj: typing.Union[dict, str],
+class ValidationMemo:
+    """Objects and validity effects read by the validators of a batch of requests.
+
+    Both are stored as futures, so concurrent validations of the same object share
+    a single LoRa read.
+    """
+
+    def __init__(self):
+        self.objects: typing.Dict[typing.Tuple[str, str], asyncio.Future] = {}
+        self.effects: typing.Dict[typing.Tuple[str, str, str], asyncio.Future] = {}
+
+
+_memo: ContextVar[typing.Optional[ValidationMemo]] = ContextVar(
+    "validation_memo", default=None
+)
+
+
+@contextmanager
+def validation_memo():
+    """Share objects and validities read by the validators within the block.
+
+    The memo of an enclosing block is reused.
+    """
+    if _memo.get() is not None:
+        yield
+        return
+    token = _memo.set(ValidationMemo())
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def _memoized(memo: dict, key: tuple, coro_fn: typing.Callable) -> typing.Awaitable:
+    if key not in memo:
+        memo[key] = asyncio.ensure_future(coro_fn())
+    # Shielded, as cancelling one of the waiters must not cancel the others
+    return asyncio.shield(memo[key])
+
+
+def _get_full_range_scope(obj_type: LoraObjectType) -> lora.Scope:
+    return lora.Connector(
+        virkningfra=util.to_lora_time(util.NEGATIVE_INFINITY),
+        virkningtil=util.to_lora_time(util.POSITIVE_INFINITY),
+    ).scope(obj_type)
+
+
+async def _get_full_range_object(
+    obj_type: LoraObjectType, uuid: str
+) -> typing.Optional[dict]:
+    """The object with all of its effects, read once per validation memo."""
+    scope = _get_full_range_scope(obj_type)
+    memo = _memo.get()
+    if memo is None:
+        return await scope.get(uuid)
+    return await _memoized(
+        memo.objects, (obj_type.value, str(uuid)), functools.partial(scope.get, uuid)
+    )
+
+
+async def _get_validity_effects(
+    obj_type: LoraObjectType, uuid: str, obj: dict, gyldighed_key: str
+) -> typing.List[typing.Tuple[datetime.datetime, datetime.datetime, dict]]:
+    """The effects of the validity of a full range object, computed once per memo."""
+    scope = _get_full_range_scope(obj_type)
+
+    async def get_effects():
+        effects = await scope.get_effects(obj, {"tilstande": (gyldighed_key,)})
+        return list(effects or ())
+
+    memo = _memo.get()
+    if memo is None:
+        return await get_effects()
+    return await _memoized(
+        memo.effects, (obj_type.value, str(uuid), gyldighed_key), get_effects
+    )
+
+
+def _are_effects_valid(
+    effects: typing.Iterable[typing.Tuple[datetime.datetime, datetime.datetime, dict]],
     valid_from: datetime.datetime,
     valid_to: datetime.datetime,
-    lora_scope: lora.Scope,
     gyldighed_key: str,
 ) -> bool:
     """
-    Determine if the given dates are within validity of the parent unit.
+    Determine if the given dates are covered by active validity effects.
 
-    :param obj: Ether the UUID of an object found in the attached scope,
-        or a dict containing it.
+    :param effects: The validity effects of the object in question.
     :param valid_from: The candidate start date.
     :param valid_to: The candidate end date.
-    :param lora_scope: A scope object from a LoRa connector.
     :param gyldighed_key: The key of where to find the 'gyldighed' in the
-        object in question
+        effects.
     :return: True if the date range is valid and false otherwise.
     """
 
     if valid_from >= valid_to:
         return False
 
-    effects = await lora_scope.get_effects(obj, {"tilstande": (gyldighed_key,)})
-
     def get_valid_effects(effects):
         def overlap_filter_fn(effect):
             start, end, _ = effect
@@ -143,14 +218,6 @@ def _get_active_validity(reg: dict) -> typing.Mapping[str, str]:
 
 @forceable
 async def is_date_range_in_org_unit_range(org_unit_obj, valid_from, valid_to):
-    # query for the full range of effects; otherwise,
-    # _get_active_validity() won't return any useful data for time
-    # intervals predating the creation of the unit
-    scope = lora.Connector(
-        virkningfra=util.to_lora_time(util.NEGATIVE_INFINITY),
-        virkningtil=util.to_lora_time(util.POSITIVE_INFINITY),
-    ).organisationenhed
-
     if org_unit_obj.get("allow_nonexistent"):
         org_unit_valid_from = org_unit_obj.get(mapping.VALID_FROM)
         org_unit_valid_to = org_unit_obj.get(mapping.VALID_TO)
@@ -162,16 +229,20 @@ async def is_date_range_in_org_unit_range(org_unit_obj, valid_from, valid_to):
             exceptions.ErrorCodes.V_DATE_OUTSIDE_ORG_UNIT_RANGE,
         )
     else:
+        # query for the full range of effects; otherwise,
+        # _get_active_validity() won't return any useful data for time
+        # intervals predating the creation of the unit
         org_unit_uuid = org_unit_obj.get(mapping.UUID)
-        org_unit = await scope.get(org_unit_uuid)
+        org_unit = await _get_full_range_object(LoraObjectType.org_unit, org_unit_uuid)
         if not org_unit:
             exceptions.ErrorCodes.E_ORG_UNIT_NOT_FOUND(org_unit_uuid=org_unit_uuid)
 
         gyldighed_key = "organisationenhedgyldighed"
+        effects = await _get_validity_effects(
+            LoraObjectType.org_unit, org_unit_uuid, org_unit, gyldighed_key
+        )
 
-        if not await _is_date_range_valid(
-            org_unit, valid_from, valid_to, scope, gyldighed_key
-        ):
+        if not _are_effects_valid(effects, valid_from, valid_to, gyldighed_key):
             exceptions.ErrorCodes.V_DATE_OUTSIDE_ORG_UNIT_RANGE(
                 org_unit_uuid=org_unit_uuid,
                 wanted_valid_from=util.to_iso_date(valid_from),
@@ -233,10 +304,6 @@ async def is_date_range_in_obj_range(
     obj_type: LoraObjectType,
     gyldighed_key: str,
 ):
-    scope = lora.Connector(
-        virkningfra=util.to_lora_time(valid_from),
-        virkningtil=util.to_lora_time(valid_to),
-    ).scope(obj_type)
     # If this is a not-yet created user, emulate check
     if obj.get("allow_nonexistent"):
         obj_valid_from = obj.get(mapping.VALID_FROM)
@@ -249,18 +316,26 @@ async def is_date_range_in_obj_range(
             exceptions.ErrorCodes.V_DATE_OUTSIDE_EMPL_RANGE,
         )
     else:
+        # The full range is read, so that it can be shared between validations of
+        # different date ranges
         uuid = obj.get(mapping.UUID)
-        existing_obj = await scope.get(uuid)
+        existing_obj = await _get_full_range_object(obj_type, uuid)
+        effects = []
+        if existing_obj:
+            effects = await _get_validity_effects(
+                obj_type, uuid, existing_obj, gyldighed_key
+            )
 
-        if not existing_obj:
+        # Not found without effects in the range, as if read for the range alone
+        if not any(
+            not (end < valid_from or valid_to < start) for start, end, _ in effects
+        ):
             # special case for backwards compatibility
             if obj_type is LoraObjectType.user:
                 exceptions.ErrorCodes.E_USER_NOT_FOUND(employee_uuid=uuid)
             exceptions.ErrorCodes.E_NOT_FOUND(scope=str(obj_type), uuid=uuid)
 
-        if not await _is_date_range_valid(
-            existing_obj, valid_from, valid_to, scope, gyldighed_key
-        ):
+        if not _are_effects_valid(effects, valid_from, valid_to, gyldighed_key):
             exceptions.ErrorCodes.V_DATE_OUTSIDE_EMPL_RANGE(
                 uuid=uuid,
                 **_get_active_validity(obj),
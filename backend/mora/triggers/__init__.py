@@ -1,8 +1,10 @@
 # SPDX-FileCopyrightText: 2019-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
+from asyncio import gather
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import NoReturn
 from typing import Set
 
 from structlog import get_logger
@@ -66,26 +68,44 @@ class Trigger:
 
     @classmethod
     async def run(cls, trigger_dict):
-        """Find the relevant set of trigger functions and trigger them in turn.
+        """Find the relevant set of trigger functions and trigger them.
 
         The relevant set is found by lookup into the registry using role, request and
         event-type.
+
+        ON_BEFORE triggers are run in turn, so the first one to fail vetoes the
+        change before the rest are run. ON_AFTER triggers cannot veto anything, so
+        they are run concurrently, and a failure is only reported once all of them
+        have finished.
         """
         triggers = (
             cls.registry.get(trigger_dict[cls.ROLE_TYPE], {})
             .get(trigger_dict[cls.REQUEST_TYPE], {})
             .get(trigger_dict[cls.EVENT_TYPE], set())
         )
-        results = []
-        for t in triggers:
-            try:
-                results.append(await t(trigger_dict))
-            except cls.Error as e:
-                ErrorCodes.E_INTEGRATION_ERROR(str(e), **e.extra)
-            except Exception as e:
-                ErrorCodes.E_INTEGRATION_ERROR(str(e))
+        if trigger_dict[cls.EVENT_TYPE] != EventType.ON_AFTER:
+            results = []
+            for t in triggers:
+                try:
+                    results.append(await t(trigger_dict))
+                except Exception as e:
+                    cls._raise_integration_error(e)
+            return results
+
+        results = await gather(
+            *(t(trigger_dict) for t in triggers), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                cls._raise_integration_error(result)
         return results
 
+    @classmethod
+    def _raise_integration_error(cls, e: Exception) -> NoReturn:
+        if isinstance(e, cls.Error):
+            ErrorCodes.E_INTEGRATION_ERROR(str(e), **e.extra)
+        ErrorCodes.E_INTEGRATION_ERROR(str(e))
+
     @classmethod
     def on(cls, role_type: str, request_type: RequestType, event_type: EventType):
         """Add the decorated trigger function to relevant set of functions.
@@ -5,6 +5,7 @@ import json
 from dataclasses import dataclass
 from datetime import datetime
 from itertools import product
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -16,9 +17,11 @@ from structlog import get_logger
 
 from mora import config
 from mora import exceptions
+from mora import lora
 from mora import mapping
 from mora import triggers
 from mora import util
+from mora.service import association_index
 
 logger = get_logger()
 
@@ -39,17 +42,154 @@ _OBJECT_TYPES = (
 )
 _ACTIONS = tuple(request_type.value.lower() for request_type in mapping.RequestType)
 
+# Internal topic telling all MO instances to drop an object from their process-wide
+# caches. It has two segments, so it does not match "service.object_type.action".
+_CACHE_INVALIDATION_TOPIC = "cache.invalidate"
+# The messages of association writes, by all MO instances, refresh the association
+# index of each instance
+_ASSOCIATION_TOPIC = "*.association.*"
+
 
 @dataclass
 class Pools:
     connection_pool: Optional[Pool] = None
     channel_pool: Optional[Pool] = None
     exchange_pool: Optional[Pool] = None
+    consumer_channel: Optional[aio_pika.Channel] = None
 
 
 pools = Pools()
 
 
+@dataclass
+class OutboxMessage:
+    routing_key: str
+    body: dict
+    enqueued_at: float
+
+
+class Outbox:
+    """Bounded queue of AMQP messages, published in batches by a set of workers.
+
+    Writers wait when the queue is full, so bursts of writes are slowed down to
+    the rate AMQP can take rather than piling up. Messages are published with
+    publisher confirms, as channels are opened with them enabled, and failed
+    messages are retried with exponential backoff before being given up on.
+    """
+
+    def __init__(self):
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        # Called with the time from enqueueing to confirmation of each message
+        self.on_published: List[Callable[[float], None]] = []
+        # Called for each message given up on
+        self.on_failed: List[Callable[[], None]] = []
+
+    def start(self) -> None:
+        settings = config.get_settings()
+        self.queue = asyncio.Queue(maxsize=settings.amqp_outbox_size)
+        self.workers = [
+            asyncio.create_task(self._work())
+            for _ in range(settings.amqp_publisher_workers)
+        ]
+
+    def qsize(self) -> int:
+        return 0 if self.queue is None else self.queue.qsize()
+
+    async def put(self, routing_key: str, body: dict) -> None:
+        if self.queue is None:
+            logger.error("AMQP outbox not started", routing_key=routing_key, body=body)
+            return
+        loop = asyncio.get_running_loop()
+        await self.queue.put(OutboxMessage(routing_key, body, loop.time()))
+
+    async def close(self) -> None:
+        """Wait for queued messages to be published, then stop the workers."""
+        if self.queue is None:
+            return
+        try:
+            await asyncio.wait_for(
+                self.queue.join(), timeout=config.get_settings().amqp_flush_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error("Dropping unpublished AMQP messages", count=self.qsize())
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.queue = None
+        self.workers = []
+
+    async def _work(self) -> None:
+        batch_size = config.get_settings().amqp_publish_batch_size
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                await self._publish(batch)
+            except Exception:
+                logger.exception("Failed to publish AMQP messages", exc_info=True)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _publish(self, batch: List[OutboxMessage]) -> None:
+        settings = config.get_settings()
+        for attempt in range(settings.amqp_publish_retries + 1):
+            if attempt:
+                await asyncio.sleep(settings.amqp_publish_backoff * 2 ** (attempt - 1))
+            try:
+                async with pools.exchange_pool.acquire() as exchange:
+                    results = await asyncio.gather(
+                        *(self._publish_one(exchange, message) for message in batch),
+                        return_exceptions=True,
+                    )
+            except Exception as error:
+                results = [error] * len(batch)
+            failed = [
+                (message, result)
+                for message, result in zip(batch, results)
+                if isinstance(result, Exception)
+            ]
+            if not failed:
+                return
+            batch = [message for message, _ in failed]
+            logger.warning(
+                "Failed to publish AMQP messages",
+                count=len(batch),
+                attempt=attempt,
+                error=str(failed[0][1]),
+            )
+
+        for message in batch:
+            logger.error(
+                "Giving up publishing AMQP message",
+                topic=message.routing_key,
+                message=message.body,
+            )
+            for callback in self.on_failed:
+                callback()
+
+    async def _publish_one(
+        self, exchange: aio_pika.Exchange, message: OutboxMessage
+    ) -> None:
+        logger.debug(
+            "Publishing AMQP message",
+            message=message.body,
+            routing_key=message.routing_key,
+        )
+        await exchange.publish(
+            message=aio_pika.Message(body=json.dumps(message.body).encode("utf-8")),
+            routing_key=message.routing_key,
+        )
+        latency = asyncio.get_running_loop().time() - message.enqueued_at
+        for callback in self.on_published:
+            callback(latency)
+
+
+outbox = Outbox()
+
+
 async def setup_pools() -> None:
     pools.connection_pool = Pool(get_connection, max_size=2)
     pools.channel_pool = Pool(get_channel, max_size=10)
@@ -65,7 +205,8 @@ async def get_connection():
 
 async def get_channel() -> aio_pika.Channel:
     async with pools.connection_pool.acquire() as connection:
-        return await connection.channel()
+        # Publishing waits for the broker to confirm each message
+        return await connection.channel(publisher_confirms=True)
 
 
 async def get_exchange() -> aio_pika.Exchange:
@@ -77,6 +218,18 @@ async def get_exchange() -> aio_pika.Exchange:
 
 
 async def close_amqp():
+    await outbox.close()
+
+    if pools.consumer_channel is not None and not pools.consumer_channel.is_closed:
+        logger.debug("Closing AMQP Consumer Channel")
+        try:
+            await pools.consumer_channel.close()
+        except Exception:
+            logger.exception(
+                "Failed to close AMQP Consumer Channel",
+                exc_info=True,
+            )
+
     if pools.exchange_pool.is_closed is False:
         logger.debug("Closing AMQP Exchange Pool")
         try:
@@ -116,7 +269,7 @@ async def publish_message(
     object_uuid: str,
     datetime: datetime,
 ) -> None:
-    """Send a message to the MO exchange.
+    """Queue a message for the MO exchange.
 
     For the full documentation, refer to "AMQP Messages" in the docs.
     The source for that is in ``docs/amqp.rst``.
@@ -145,30 +298,11 @@ async def publish_message(
         "time": datetime.isoformat(),
     }
 
-    message = aio_pika.Message(body=json.dumps(message_dict).encode("utf-8"))
-
     # Message publishing is a secondary task to writing to lora.
     #
     # We should not throw a HTTPError in the case where lora writing is
-    # successful, but amqp is down. Therefore, the try/except block.
-    try:
-        async with pools.exchange_pool.acquire() as exchange:
-            logger.debug(
-                "Publishing AMQP message",
-                message=message_dict,
-                routing_key=topic,
-            )
-            await exchange.publish(
-                message=message,
-                routing_key=topic,
-            )
-    except aio_pika.exceptions.AMQPError:
-        logger.exception(
-            "Failed to publish AMQP message",
-            topic=topic,
-            message=message_dict,
-            exc_info=True,
-        )
+    # successful, but amqp is down. Therefore, the message is only queued here.
+    await outbox.put(topic, message_dict)
 
 
 async def amqp_sender(trigger_dict: Dict) -> None:
@@ -201,18 +335,52 @@ async def amqp_sender(trigger_dict: Dict) -> None:
 
     for service, service_uuid in amqp_messages:
         logger.debug(
-            "Registering AMQP publish message task",
+            "Queueing AMQP publish message",
             service=service,
             object_type=object_type,
             action=action,
         )
-        asyncio.create_task(
-            publish_message(
-                service, object_type, action, service_uuid, object_uuid, datetime
-            )
+        await publish_message(
+            service, object_type, action, service_uuid, object_uuid, datetime
         )
 
 
+async def publish_cache_invalidation(path: str, uuid: str) -> None:
+    """Tell all MO instances, including this one, to forget a cached object."""
+    await outbox.put(_CACHE_INVALIDATION_TOPIC, {"path": path, "uuid": uuid})
+
+
+async def on_cache_invalidation(message: aio_pika.IncomingMessage) -> None:
+    async with message.process():
+        message_dict = json.loads(message.body)
+        logger.debug("Received AMQP cache invalidation", message=message_dict)
+        if message.routing_key != _CACHE_INVALIDATION_TOPIC:
+            await association_index.refresh_association(message_dict["object_uuid"])
+        elif message_dict["path"] in lora.CLASSIFICATION_PATHS:
+            lora.invalidate_classification_cache(
+                message_dict["path"], message_dict["uuid"]
+            )
+
+
+async def start_cache_invalidation_consumer() -> None:
+    """
+    Consume cache invalidations and association writes through an exclusive queue
+    for this instance.
+    """
+    # The exchange is declared as by the publishers, then only looked up here
+    async with pools.exchange_pool.acquire():
+        pass
+    async with pools.connection_pool.acquire() as connection:
+        pools.consumer_channel = await connection.channel()
+    exchange = await pools.consumer_channel.get_exchange(
+        config.get_settings().amqp_os2mo_exchange
+    )
+    queue = await pools.consumer_channel.declare_queue(exclusive=True)
+    await queue.bind(exchange, routing_key=_CACHE_INVALIDATION_TOPIC)
+    await queue.bind(exchange, routing_key=_ASSOCIATION_TOPIC)
+    await queue.consume(on_cache_invalidation)
+
+
 async def register(app) -> bool:
     """Register an ON_AFTER triggers for all ROLE_TYPEs and RequestTypes.
 
@@ -226,6 +394,7 @@ async def register(app) -> bool:
         return False
 
     await setup_pools()
+    outbox.start()
 
     # Register trigger on everything
     ROLE_TYPES = [
@@ -238,4 +407,11 @@ async def register(app) -> bool:
     )
     for combi in trigger_combinations:
         triggers.Trigger.on(*combi)(amqp_sender)
+
+    # Keep the classification caches and association indexes of all MO instances
+    # in sync
+    if config.get_settings().classification_cache:
+        if publish_cache_invalidation not in lora.on_classification_written:
+            lora.on_classification_written.append(publish_cache_invalidation)
+    await start_cache_invalidation_consumer()
     return True
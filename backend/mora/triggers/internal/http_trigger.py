@@ -1,9 +1,12 @@
 # SPDX-FileCopyrightText: 2019-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
 import asyncio
+import time
 from functools import partial
+from typing import Callable
 from typing import Dict
 from typing import List
+from typing import Optional
 
 import aiohttp
 from fastapi.encoders import jsonable_encoder
@@ -24,6 +27,67 @@ class HTTPTriggerException(Exception):
     pass
 
 
+class CircuitBreaker:
+    """Fail fast when calling an endpoint which keeps timing out.
+
+    After `failure_threshold` consecutive failures the circuit opens, and calls are
+    refused until `reset_timeout` seconds have passed. Then a single trial call is
+    let through; its success closes the circuit, and its failure keeps it open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timer = timer
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.timer() - self.opened_at < self.reset_timeout:
+            return False
+        # Let one trial call through, and refuse the rest for another period
+        self.opened_at = self.timer()
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = self.timer()
+
+
+# Endpoint of each registered trigger URL, and circuit breaker of each endpoint
+trigger_endpoints: Dict[str, str] = {}
+circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+# Called with the endpoint and duration of each trigger call
+on_response: List[Callable[[str, float], None]] = []
+
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    if endpoint not in circuit_breakers:
+        settings = config.get_settings()
+        circuit_breakers[endpoint] = CircuitBreaker(
+            failure_threshold=settings.http_trigger_failure_threshold,
+            reset_timeout=settings.http_trigger_reset_timeout,
+        )
+    return circuit_breakers[endpoint]
+
+
 async def http_sender(trigger_url: str, trigger_dict: dict, timeout: int):
     """Triggers the provided event over HTTP(s).
 
@@ -48,20 +112,35 @@ async def http_sender(trigger_url: str, trigger_dict: dict, timeout: int):
         trigger_dict=trigger_dict,
         timeout=timeout,
     )
+    endpoint = trigger_endpoints.get(trigger_url, trigger_url)
+    circuit_breaker = get_circuit_breaker(endpoint)
+    if not circuit_breaker.allow():
+        raise HTTPTriggerException(
+            f"{endpoint} is failing, not calling it until it has had time to recover"
+        )
+
     client_timeout = aiohttp.ClientTimeout(total=timeout)
-    async with async_session() as session:
-        # TODO: Consider changing trigger_dict to MOTriggerPayload throughout
-        payload = jsonable_encoder(MOTriggerPayload(**trigger_dict).dict())
-        async with session.post(
-            trigger_url, timeout=client_timeout, json=payload
-        ) as response:
-            payload = await response.json()
-            logger.debug(
-                "http_sender received", payload=payload, trigger_url=trigger_url
-            )
-            if response.status != 200:
-                raise HTTPTriggerException(payload["detail"])
-            return payload
+    start = time.monotonic()
+    try:
+        async with async_session() as session:
+            # TODO: Consider changing trigger_dict to MOTriggerPayload throughout
+            payload = jsonable_encoder(MOTriggerPayload(**trigger_dict).dict())
+            async with session.post(
+                trigger_url, timeout=client_timeout, json=payload
+            ) as response:
+                payload = await response.json()
+    except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+        circuit_breaker.record_failure()
+        raise
+    finally:
+        for callback in on_response:
+            callback(endpoint, time.monotonic() - start)
+    circuit_breaker.record_success()
+
+    logger.debug("http_sender received", payload=payload, trigger_url=trigger_url)
+    if response.status != 200:
+        raise HTTPTriggerException(payload["detail"])
+    return payload
 
 
 async def fetch_endpoint_trigger(
@@ -175,6 +254,7 @@ async def register(app) -> bool:
             logger.debug("Registering trigger for", endpoint=endpoint, trigger=trigger)
 
             trigger_url = endpoint + trigger.url
+            trigger_endpoints[trigger_url] = endpoint
             timeout = trigger.timeout or run_trigger_timeout
 
             Trigger.on(trigger.role_type, trigger.request_type, trigger.event_type)(
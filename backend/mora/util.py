@@ -24,6 +24,7 @@ import urllib.parse
 import uuid
 from asyncio import iscoroutinefunction
 from datetime import date
+from functools import lru_cache
 from functools import reduce
 from functools import wraps
 from typing import Any
@@ -62,6 +63,10 @@ _tzinfos = {
 
 logger = get_logger()
 
+# LoRa listings repeat the same few timestamps throughout, so parsing and
+# formatting them is memoized, up to this many distinct values
+TIMESTAMP_CACHE_SIZE = 4096
+
 
 def parsedatetime(
     s: Union[str, datetime.date, datetime.datetime], default=_sentinel
@@ -119,9 +124,40 @@ def do_ranges_overlap(first_start, first_end, second_start, second_end):
     return max(first_start, second_start) < min(first_end, second_end)
 
 
+def _memoized_by_wall_time(func):
+    """Memoize ``func(dt, *args)`` by the wall time and zone of ``dt``.
+
+    Aware datetimes hash by their UTC time, which is slow to compute for
+    dateutil zones, and the zones themselves are unhashable. Hence the default
+    zone is keyed as ``None``, and other dateutil zones are not memoized.
+    """
+
+    @lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+    def memoized(wall_time, fold, tzinfo, *args):
+        if tzinfo is None:
+            tzinfo = DEFAULT_TIMEZONE
+        return func(wall_time.replace(tzinfo=tzinfo, fold=fold), *args)
+
+    @wraps(func)
+    def wrapper(dt: datetime.datetime, *args):
+        tzinfo = dt.tzinfo
+        if tzinfo is DEFAULT_TIMEZONE:
+            tzinfo = None
+        elif not isinstance(tzinfo, datetime.timezone):
+            return func(dt, *args)
+        return memoized(dt.replace(tzinfo=None), dt.fold, tzinfo, *args)
+
+    wrapper.cache_info = memoized.cache_info
+    wrapper.cache_clear = memoized.cache_clear
+    return wrapper
+
+
 def to_lora_time(s: Union[str, datetime.date, datetime.datetime]) -> str:
-    dt = parsedatetime(s)
+    return _to_lora_time(parsedatetime(s))
 
+
+@_memoized_by_wall_time
+def _to_lora_time(dt: datetime.datetime) -> str:
     if dt == POSITIVE_INFINITY:
         return "infinity"
     elif dt == NEGATIVE_INFINITY:
@@ -174,8 +210,11 @@ def to_iso_date(s, is_end: bool = False):
         >>> to_iso_date(NEGATIVE_INFINITY)
 
     """
-    dt = parsedatetime(s)
+    return _to_iso_date(parsedatetime(s), is_end)
 
+
+@_memoized_by_wall_time
+def _to_iso_date(dt: datetime.datetime, is_end: bool) -> typing.Optional[str]:
     if is_end and dt == POSITIVE_INFINITY:
         return None
     elif not is_end and dt == NEGATIVE_INFINITY:
@@ -193,8 +232,30 @@ def to_iso_date(s, is_end: bool = False):
     return dt.date().isoformat()
 
 
+def parse_iso_time(s: str) -> datetime.datetime:
+    """Parse an ISO 8601 timestamp, as :func:`dateutil.parser.isoparse`.
+
+    The standard library parser is tried first, as it handles the timestamps
+    written by LoRa and MO much faster, falling back to dateutil for other
+    ISO 8601 variants.
+
+    .. doctest::
+
+        >>> parse_iso_time('2001-01-01T12:00:00.5+01:00').isoformat()
+        '2001-01-01T12:00:00.500000+01:00'
+        >>> parse_iso_time('20010101T1200Z').isoformat()
+        '2001-01-01T12:00:00+00:00'
+
+    """
+    try:
+        return datetime.datetime.fromisoformat(s)
+    except ValueError:
+        return dateutil.parser.isoparse(s)
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
 def from_iso_time(s):
-    dt = dateutil.parser.isoparse(s)
+    dt = parse_iso_time(s)
 
     if not dt.tzinfo:
         dt = dt.replace(tzinfo=DEFAULT_TIMEZONE)
@@ -771,6 +832,18 @@ def is_substitute_allowed(association_type_uuid: str) -> bool:
     checks whether the chosen association needs a substitute
     """
     substitute_roles: str = conf_db.get_configuration()["substitute_roles"]
+    return _is_substitute_role(association_type_uuid, substitute_roles)
+
+
+async def is_substitute_allowed_async(association_type_uuid: str) -> bool:
+    """
+    like is_substitute_allowed, but without blocking the event loop
+    """
+    configuration = await conf_db.get_configuration_async()
+    return _is_substitute_role(association_type_uuid, configuration["substitute_roles"])
+
+
+def _is_substitute_role(association_type_uuid: str, substitute_roles: str) -> bool:
     if association_type_uuid in substitute_roles.split(","):
         # chosen role does need substitute
         return True
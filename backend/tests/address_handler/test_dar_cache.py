@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+import re
+from uuid import UUID
+
+import pytest
+from aioresponses import CallbackResult
+from mora.config import Settings
+from mora.service.address_handler import dar
+
+from ..util import override_config
+
+pytestmark = pytest.mark.asyncio
+
+FOUND = UUID("0a3f50a0-23c9-32b8-e044-0003ba298018")
+NOT_FOUND = UUID("00000000-0000-0000-0000-000000000000")
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+async def dar_standin(aioresponses, monkeypatch):
+    """DAR at a local URL, knowing a single address. Yields the requested ids."""
+    requested = []
+
+    def callback(url, **kwargs):
+        ids = kwargs["params"]["id"].split("|")
+        requested.extend(ids)
+        body = (
+            [{"id": str(FOUND), "vejnavn": "Pilestræde"}] if str(FOUND) in ids else []
+        )
+        return CallbackResult(payload=body)
+
+    aioresponses.get(
+        re.compile(r"http://dar\.local/.*"), callback=callback, repeat=True
+    )
+    monkeypatch.setattr(dar.address_cache, "timer", FakeTimer())
+    with override_config(Settings(dar_url="http://dar.local")):
+        yield requested
+        await dar.close_client()
+
+
+async def test_addresses_are_cached(dar_standin):
+    addresses = await dar.load_addresses([FOUND, FOUND])
+    assert [FOUND, FOUND] == [UUID(address["id"]) for address in addresses]
+    assert [str(FOUND)] == dar_standin
+
+    assert addresses[:1] == await dar.load_addresses([FOUND])
+    assert [str(FOUND)] == dar_standin
+
+
+async def test_not_found_addresses_are_cached_briefly(dar_standin):
+    assert [None] == await dar.load_addresses([NOT_FOUND])
+    # Looked up as every address type
+    lookups = len(dar_standin)
+
+    assert [None] == await dar.load_addresses([NOT_FOUND])
+    assert lookups == len(dar_standin)
+
+    dar.address_cache.timer.now = Settings().dar_cache_negative_ttl
+    assert [None] == await dar.load_addresses([NOT_FOUND])
+    assert 2 * lookups == len(dar_standin)
+
+
+async def test_cache_is_persisted(dar_standin, tmp_path):
+    path = str(tmp_path / "dar.json")
+    address, not_found = await dar.load_addresses([FOUND, NOT_FOUND])
+    dar.save_cache(path)
+    dar.address_cache.clear()
+
+    dar.load_cache(path)
+    requested = len(dar_standin)
+    assert [address, None] == await dar.load_addresses([FOUND, NOT_FOUND])
+    # Only the found address survives
+    assert {str(NOT_FOUND)} == set(dar_standin[requested:])
+
+
+async def test_concurrent_callers_share_one_client(dar_standin, monkeypatch):
+    opened = []
+    aopen = dar.DARClient.aopen
+
+    async def slow_aopen(self):
+        await asyncio.sleep(0)
+        await aopen(self)
+        opened.append(self)
+
+    monkeypatch.setattr(dar.DARClient, "aopen", slow_aopen)
+    clients = await asyncio.gather(*(dar.get_client() for _ in range(3)))
+
+    assert 1 == len(set(map(id, clients)))
+    assert "http://dar.local" == clients[0]._baseurl
+    # The clients which lost the race are closed again
+    assert 3 == len(opened)
+    assert [client._session is None for client in opened].count(False) == 1
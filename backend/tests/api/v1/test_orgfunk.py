@@ -1,19 +1,28 @@
 # SPDX-FileCopyrightText: 2021- Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
 import datetime
+import json
+import re
 from copy import deepcopy
+from unittest.mock import AsyncMock
 from unittest.mock import patch
 from uuid import UUID
 
 import freezegun
+from aioresponses import CallbackResult
 from hypothesis import given
 from hypothesis import HealthCheck
 from hypothesis import settings
 from hypothesis import strategies as st
+from mora import common
 from mora.api.v1.reading_endpoints import _extract_search_params
 from mora.api.v1.reading_endpoints import orgfunk_type_map
+from mora.config import Settings
+from mora.handler.reading import get_handler_for_type
 from mora.mapping import MoOrgFunk
 from tests.cases import TestCase
+from tests.util import MockAioresponses
+from tests.util import override_config
 
 from .util import instance2dict
 
@@ -112,3 +121,136 @@ class Reading(TestCase):
         for orgfunk in MoOrgFunk:
             return_value = self.construct_orgfunk_model(orgfunk, data)
             self.api_exposing_org_funk_uuid_endpoint_helper(orgfunk, [return_value])
+
+    @given(st.data())
+    @settings(
+        max_examples=1, suppress_health_check=[HealthCheck.too_slow], deadline=None
+    )
+    def test_api_streaming_org_funk_endpoint(self, data):
+        orgfunk = MoOrgFunk.RELATED_UNIT
+        objects = [self.construct_orgfunk_model(orgfunk, data) for _ in range(3)]
+        by_uuid = {obj["uuid"]: obj for obj in objects}
+
+        async def get(c, search_fields, changed_since=None):
+            return [by_uuid[uuid] for uuid in search_fields["uuid"]]
+
+        cls = get_handler_for_type(orgfunk.value)
+        with override_config(Settings(v1_stream_chunk_size=2)), patch.object(
+            cls, "get_uuids", AsyncMock(return_value=list(by_uuid))
+        ), patch.object(cls, "get", AsyncMock(side_effect=get)) as mock:
+            response = self.client.get(f"/api/v1/{orgfunk.value}?stream=1")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("application/x-ndjson", response.headers["content-type"])
+        self.assertEqual(
+            objects, [json.loads(line) for line in response.text.splitlines()]
+        )
+        # The objects are read a chunk at a time
+        self.assertEqual(
+            [[objects[0]["uuid"], objects[1]["uuid"]], [objects[2]["uuid"]]],
+            [call.args[1]["uuid"] for call in mock.await_args_list],
+        )
+
+    @freezegun.freeze_time("2017-01-01", tz_offset=1)
+    @MockAioresponses()
+    def test_api_streaming_reads_chunks_through_new_connectors(self, m):
+        virkning = {"from": "2017-01-01 00:00:00+01", "to": "infinity"}
+        units = [
+            "00000000-0000-0000-0000-0000000000e1",
+            "00000000-0000-0000-0000-0000000000e2",
+        ]
+        uuids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(1, 4)]
+        requests = []
+
+        def related_unit(uuid):
+            return {
+                "id": uuid,
+                "registreringer": [
+                    {
+                        "attributter": {
+                            "organisationfunktionegenskaber": [
+                                {
+                                    "brugervendtnoegle": "a <-> b",
+                                    "funktionsnavn": "Relateret Enhed",
+                                    "virkning": virkning,
+                                }
+                            ]
+                        },
+                        "tilstande": {
+                            "organisationfunktiongyldighed": [
+                                {"gyldighed": "Aktiv", "virkning": virkning}
+                            ]
+                        },
+                        "relationer": {
+                            "tilknyttedeenheder": [
+                                {"uuid": unit, "virkning": virkning} for unit in units
+                            ]
+                        },
+                    }
+                ],
+            }
+
+        def org_unit(uuid):
+            return {
+                "id": uuid,
+                "registreringer": [
+                    {
+                        "attributter": {
+                            "organisationenhedegenskaber": [
+                                {
+                                    "brugervendtnoegle": uuid[-2:],
+                                    "enhedsnavn": uuid[-2:],
+                                    "virkning": virkning,
+                                }
+                            ]
+                        },
+                        "tilstande": {
+                            "organisationenhedgyldighed": [
+                                {"gyldighed": "Aktiv", "virkning": virkning}
+                            ]
+                        },
+                        "relationer": {
+                            "overordnet": [{"uuid": uuid, "virkning": virkning}]
+                        },
+                    }
+                ],
+            }
+
+        def callback(url, json, **kwargs):
+            requests.append(json)
+            if "uuid" not in json:
+                return CallbackResult(payload={"results": [uuids]})
+            objs = [related_unit(uuid) for uuid in json["uuid"]]
+            return CallbackResult(payload={"results": [objs]})
+
+        m.get(
+            re.compile(r".*/organisation/organisationfunktion"),
+            callback=callback,
+            repeat=True,
+        )
+        m.get(
+            re.compile(r".*/organisation/organisationenhed"),
+            callback=lambda url, json, **kwargs: CallbackResult(
+                payload={"results": [[org_unit(uuid) for uuid in json["uuid"]]]}
+            ),
+            repeat=True,
+        )
+
+        with override_config(Settings(v1_stream_chunk_size=2)), patch(
+            "mora.api.v1.reading_endpoints.new_connector",
+            wraps=common.new_connector,
+        ) as new_connector:
+            response = self.client.get(
+                f"/api/v1/{MoOrgFunk.RELATED_UNIT.value}?stream=1"
+            )
+
+        self.assertEqual(200, response.status_code)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(uuids, [line["uuid"] for line in lines])
+        self.assertEqual(units, [unit["uuid"] for unit in lines[0]["org_unit"]])
+        # The objects are searched for once, and then read a chunk at a time, each
+        # through a connector of its own
+        self.assertEqual(
+            [uuids[:2], uuids[2:]], [r["uuid"] for r in requests if "uuid" in r]
+        )
+        self.assertEqual(2, new_connector.call_count)
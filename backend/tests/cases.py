@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: MPL-2.0
 import json
 import pprint
-from unittest import IsolatedAsyncioTestCase
+import unittest
 from unittest.case import TestCase
 from unittest.mock import patch
 
@@ -15,6 +15,7 @@ from structlog import get_logger
 from mora import app
 from mora import conf_db
 from mora import config
+from mora import lora
 from mora import service
 from mora.auth.keycloak.oidc import auth
 from mora.config import Settings
@@ -45,6 +46,16 @@ async def fake_auth():
     }
 
 
+class IsolatedAsyncioTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Closes the shared LoRa session, as it cannot outlive the per-test event loop.
+    """
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.addAsyncCleanup(lora.close_session)
+
+
 class _AsyncBaseTestCase(IsolatedAsyncioTestCase):
     """
     Async base class for MO testcases w/o LoRA access.
@@ -11,7 +11,13 @@ from hypothesis.database import InMemoryExampleDatabase
 from starlette_context import _request_scope_context_storage
 from starlette_context.ctx import _Context
 
+from mora import conf_db
+from mora import lora
 from mora.api.v1.models import Validity
+from mora.service import association_index
+from mora.service import facet
+from mora.service import orgunit_index
+from mora.service.address_handler import dar
 from tests.util import load_sample_structures, _mox_testing_api
 from tests.hypothesis_utils import validity_model_strat
 
@@ -58,6 +64,17 @@ def mocked_context(monkeypatch) -> _Context:
     return _Context()
 
 
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Objects must not leak between tests through the process-wide caches."""
+    lora.classification_cache.clear()
+    conf_db.configuration_cache.clear()
+    orgunit_index.clear()
+    association_index.clear()
+    dar.address_cache.clear()
+    facet.primary_class_cache.clear()
+
+
 @pytest.fixture
 def aioresponses():
     """Pytest fixture for aioresponses."""
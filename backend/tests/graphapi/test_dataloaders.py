@@ -7,6 +7,8 @@
 # --------------------------------------------------------------------------------------
 # Imports
 # --------------------------------------------------------------------------------------
+from uuid import uuid4
+
 import pytest
 from hypothesis import given
 from pytest import MonkeyPatch
@@ -100,3 +102,59 @@ class TestDataloaders:
             assert set(result) == {None}
         else:
             assert set(result) == set()
+
+    @given(
+        test_data=data_strat(
+            [
+                AddressRead,
+                AssociationRead,
+                EngagementRead,
+                ITUserRead,
+                LeaveRead,
+                ManagerRead,
+                RoleRead,
+            ]
+        )
+    )
+    async def test_load_employee_details(self, test_data, patch_loader):
+        """Test bulk load of employee details is bucketed by employee."""
+        model, data = test_data
+        keys = list({model.employee_uuid for model in data}) + [uuid4()]
+
+        with MonkeyPatch.context() as patch:
+            patch.setattr(dataloaders, "get_details", patch_loader(data))
+            result = await dataloaders.load_employee_details(keys, model)
+
+        assert len(result) == len(keys)
+        for key, details in zip(keys, result):
+            assert details == [x for x in data if x.employee_uuid == key]
+
+    @given(test_data=data_strat([KLERead, ManagerRead, RelatedUnitRead, RoleRead]))
+    async def test_load_org_unit_details(self, test_data, patch_loader):
+        """Test bulk load of org unit details is bucketed by org unit."""
+        model, data = test_data
+        keys = list(
+            {key for model in data for key in dataloaders.org_unit_uuids(model)}
+        ) + [uuid4()]
+
+        with MonkeyPatch.context() as patch:
+            patch.setattr(dataloaders, "get_details", patch_loader(data))
+            result = await dataloaders.load_org_unit_details(keys, model)
+
+        assert len(result) == len(keys)
+        for key, details in zip(keys, result):
+            assert details == [x for x in data if key in dataloaders.org_unit_uuids(x)]
+
+    @given(test_data=data_strat([OrganisationUnitRead]))
+    async def test_load_org_units_children(self, test_data, patch_loader):
+        """Test bulk load of org unit children is bucketed by parent."""
+        _, data = test_data
+        keys = list({model.parent_uuid for model in data} - {None}) + [uuid4()]
+
+        with MonkeyPatch.context() as patch:
+            patch.setattr(dataloaders, "get_org_unit_children", patch_loader(data))
+            result = await dataloaders.load_org_units_children(keys)
+
+        assert len(result) == len(keys)
+        for key, children in zip(keys, result):
+            assert children == [x for x in data if x.parent_uuid == key]
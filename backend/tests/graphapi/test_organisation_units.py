@@ -18,6 +18,7 @@ from aioresponses import CallbackResult
 from fastapi.encoders import jsonable_encoder
 from hypothesis import given
 from hypothesis import strategies as st
+from more_itertools import flatten
 from more_itertools import unzip
 from pytest import MonkeyPatch
 from ramodels.mo import OrganisationUnitRead
@@ -219,8 +220,12 @@ def setup_organisation_tree(aioresponses):
         overordnet = json.get("overordnet")
         uuids = json.get("uuid")
         if overordnet:
-            overordnet_uuid = overordnet
-            children_uuids = get_children_uuids(parent_map, overordnet_uuid)
+            if isinstance(overordnet, str):
+                overordnet = [overordnet]
+            children_uuids = flatten(
+                get_children_uuids(parent_map, overordnet_uuid)
+                for overordnet_uuid in overordnet
+            )
             matching_org_units = list(map(organisation_unit_map.get, children_uuids))
         elif uuids:
             matching_org_units = list(map(organisation_unit_map.get, uuids))
@@ -274,6 +279,38 @@ async def test_query_organisation_unit_tree_root(aioresponses):
     ]
 
 
+@pytest.mark.asyncio
+async def test_query_organisation_unit_tree_levels(aioresponses):
+    """Test that each level of the tree is looked up in a single request."""
+    organisation_unit_map, parent_map, root, deepest_child = setup_organisation_tree(
+        aioresponses
+    )
+
+    query = """
+        query TestQuery($uuid: UUID!) {
+            org_units(uuids: [$uuid]) {
+                children { children { children { uuid } } }
+            }
+        }
+    """
+    result = await execute(query, {"uuid": str(root["id"])})
+
+    # We expect 4 outgoing request:
+    # 1x For the first lookup
+    # 3x To lookup children, one per level below the root
+    assert sum(len(v) for v in aioresponses.requests.values()) == 4
+
+    assert result.errors is None
+    (org_unit,) = result.data["org_units"]
+    deepest = [
+        grandgrandchild
+        for child in org_unit["children"]
+        for grandchild in child["children"]
+        for grandgrandchild in grandchild["children"]
+    ]
+    assert deepest == [{"uuid": deepest_child["id"]}]
+
+
 @pytest.mark.asyncio
 async def test_query_organisation_unit_tree_deepest_child(aioresponses):
     """Test that we are able to query parents and children of the deepest child."""
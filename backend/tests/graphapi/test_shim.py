@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------------------
+# SPDX-FileCopyrightText: 2022 Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+# --------------------------------------------------------------------------------------
+# --------------------------------------------------------------------------------------
+# Imports
+# --------------------------------------------------------------------------------------
+from unittest.mock import patch
+
+import pytest
+
+import mora.health  # noqa: F401
+import mora.service.shimmed  # noqa: F401
+from mora.graphapi import shim
+from mora.graphapi.main import get_schema
+from tests.util import starlette_context
+
+# --------------------------------------------------------------------------------------
+# Tests
+# --------------------------------------------------------------------------------------
+
+QUERY = """
+query HealthQuery($identifier: String!) {
+  healths(identifiers: [$identifier]) {
+    identifier
+  }
+}
+"""
+
+
+def test_schema_is_built_once():
+    assert get_schema() is get_schema()
+
+
+def test_shim_queries_are_valid():
+    """All registered shim queries must be valid against the schema."""
+    shim.prepare_queries()
+    assert shim._registered_queries <= shim._prepared_queries.keys()
+
+
+def test_invalid_query_is_rejected():
+    with pytest.raises(ValueError):
+        shim.prepare_query("query { no_such_field }")
+
+
+@pytest.mark.asyncio
+async def test_prepared_query_is_parsed_once():
+    shim.register_query(QUERY)
+    with starlette_context():
+        with patch(
+            "strawberry.schema.execute.parse_document", wraps=shim.parse
+        ) as parse:
+            for _ in range(2):
+                result = await shim.execute_graphql(
+                    QUERY, variable_values={"identifier": "no_such_health"}
+                )
+                assert result.errors is None
+                assert {"healths": []} == result.data
+    parse.assert_not_called()
@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmark of the throughput of bulk writes against a local LoRa stub.
+
+Writes leave creates through ``submit_requests``, as the detail endpoints do
+without the bulk flag, and through ``bulk_write``. The stub answers each write
+after a fixed latency, and fails a share of them with 503. The requests are
+prepared up front, so only the writes themselves are measured.
+
+Run with ``python -m tests.manual.benchmark_bulk_write`` from the backend
+directory, with the settings MO needs to import.
+"""
+import asyncio
+import random
+import time
+import uuid
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from aiohttp import web
+from mora import config
+from mora import lora
+from mora.mapping import RequestType
+from mora.service import handlers
+
+from tests import util
+
+WRITES = 2000
+LATENCY = 0.005
+FAILURE_RATES = (0.0, 0.02)
+PORT = 8765
+
+failure_rate = 0.0
+
+
+async def write(request: web.Request) -> web.Response:
+    await request.read()
+    await asyncio.sleep(LATENCY)
+    if random.random() < failure_rate:
+        return web.json_response({"message": "unavailable"}, status=503)
+    return web.json_response({"uuid": request.match_info["uuid"]})
+
+
+def make_request() -> handlers.RequestHandler:
+    requesthandler = handlers.HANDLERS_BY_ROLE_TYPE["leave"]({}, RequestType.CREATE)
+    requesthandler.payload = {}
+    requesthandler.uuid = str(uuid.uuid4())
+    return requesthandler
+
+
+async def construct(req, request_type):
+    return make_request()
+
+
+async def submit_requests() -> str:
+    try:
+        await handlers.submit_requests([make_request() for _ in range(WRITES)])
+    except Exception as e:
+        return "batch failed: {}".format(type(e).__name__)
+    return "all written"
+
+
+async def bulk_write() -> str:
+    results = await handlers.bulk_write(
+        [{"type": "leave"}] * WRITES, RequestType.CREATE
+    )
+    failed = sum(isinstance(result, dict) for result in results)
+    return "{} failed".format(failed)
+
+
+BENCHMARKS = {
+    "submit_requests": submit_requests,
+    "bulk_write": bulk_write,
+}
+
+
+async def main():
+    global failure_rate
+    app = web.Application()
+    app.router.add_route("*", "/organisation/organisationfunktion/{uuid}", write)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+
+    settings = config.get_settings().copy(
+        update={"lora_url": "http://127.0.0.1:{}/".format(PORT)}
+    )
+    with ExitStack() as stack:
+        stack.enter_context(util.override_config(settings))
+        stack.enter_context(patch.object(handlers, "_construct", construct))
+        stack.enter_context(patch("mora.util.context", new={"query_args": {}}))
+        print("{} writes, {:.0f} ms latency".format(WRITES, LATENCY * 1e3))
+        for failure_rate in FAILURE_RATES:
+            for name, benchmark in BENCHMARKS.items():
+                random.seed(1)
+                start = time.perf_counter()
+                outcome = await benchmark()
+                elapsed = time.perf_counter() - start
+                print(
+                    "{:>3.0%} 503  {:<16} {:6.0f} writes/s ({})".format(
+                        failure_rate, name, WRITES / elapsed, outcome
+                    )
+                )
+
+    await lora.close_session()
+    await runner.cleanup()
+
+
+asyncio.run(main())
@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+"""Micro-benchmark of rendering an organisation unit tree as a MO response.
+
+Compares FastAPI's default rendering, ``jsonable_encoder`` followed by
+``json.dumps``, with the codec, for a tree like those of ``/service/ou/tree``.
+
+Run with ``python -m tests.manual.benchmark_codec`` from the backend
+directory, with the settings MO needs to import.
+"""
+import json
+import timeit
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from mora import codec
+
+DEPTH = 4
+FANOUT = 8
+
+
+def org_unit(depth: int) -> dict:
+    children = [org_unit(depth - 1) for _ in range(FANOUT)] if depth else []
+    return {
+        "name": "Enhed",
+        "user_key": "enhed",
+        "uuid": uuid.uuid4(),
+        "validity": {"from": "2017-01-01", "to": None},
+        "child_count": len(children),
+        "children": children,
+    }
+
+
+TREE = [org_unit(DEPTH)]
+RENDERED = codec.dumps(TREE)
+
+
+def render_default() -> bytes:
+    return json.dumps(
+        jsonable_encoder(TREE),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+BENCHMARKS = {
+    "jsonable_encoder+json.dumps": render_default,
+    "codec.dumps": lambda: codec.dumps(TREE),
+    "json.loads": lambda: json.loads(RENDERED),
+    "codec.loads": lambda: codec.loads(RENDERED),
+}
+
+print(
+    "{} units, {} bytes".format(
+        sum(FANOUT**i for i in range(DEPTH + 1)), len(RENDERED)
+    )
+)
+for name, benchmark in BENCHMARKS.items():
+    number = 5
+    best = min(timeit.repeat(benchmark, number=number, repeat=5))
+    print("{:<28} {:8.2f} ms".format(name, best / number * 1e3))
@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+"""Micro-benchmark of projecting the fields of an engagement effect.
+
+Compares a ``FieldTuple`` call per field with the compiled projection of the
+engagement reader.
+
+Run with ``python -m tests.manual.benchmark_projection`` from the backend
+directory, with the settings MO needs to import.
+"""
+import timeit
+
+from mora import mapping
+from mora.handler.impl.engagement import EngagementReader
+
+
+def rel(i: int) -> list:
+    return [{"uuid": "%032d" % i, "virkning": {"from": "2020-01-01", "to": "infinity"}}]
+
+
+EFFECT = {
+    "attributter": {
+        "organisationfunktionegenskaber": [{"brugervendtnoegle": "x"}],
+        "organisationfunktionudvidelser": [{"fraktion": 10, "udvidelse_1": "a"}],
+    },
+    "tilstande": {"organisationfunktiongyldighed": [{"gyldighed": "Aktiv"}]},
+    "relationer": {
+        "tilknyttedebrugere": rel(1),
+        "tilknyttedeenheder": rel(2),
+        "opgaver": rel(3),
+        "organisatoriskfunktionstype": rel(4),
+        "primær": rel(5),
+        "tilhoerer": rel(6),
+        "tilknyttedeorganisationer": rel(7),
+    },
+}
+
+
+def field_tuples(effect: dict) -> tuple:
+    return (
+        mapping.USER_FIELD.get_uuid(effect),
+        mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(effect),
+        mapping.JOB_FUNCTION_FIELD.get_uuid(effect),
+        mapping.ORG_FUNK_TYPE_FIELD.get_uuid(effect),
+        mapping.PRIMARY_FIELD.get_uuid(effect),
+        mapping.ORG_FUNK_UDVIDELSER_FIELD(effect),
+    )
+
+
+BENCHMARKS = {
+    "FieldTuple": field_tuples,
+    "Projection": EngagementReader.projection,
+}
+
+assert field_tuples(EFFECT) == tuple(EngagementReader.projection(EFFECT))
+for name, benchmark in BENCHMARKS.items():
+    number = 100000
+    best = min(timeit.repeat(lambda: benchmark(EFFECT), number=number, repeat=5))
+    print("{:<12} {:8.2f} us/effect".format(name, best / number * 1e6))
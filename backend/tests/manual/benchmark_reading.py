@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmark of the tasks created and wall time of reading many engagements.
+
+Reads a listing of engagements through ``EngagementReader.get``, with LoRa and
+the nested lookups of persons, units and classes stubbed out. The effects are
+converted in a plain loop with ``deferred_lookups``, and in a task each without,
+as all reading handlers did before.
+
+Run with ``python -m tests.manual.benchmark_reading`` from the backend
+directory, with the settings MO needs to import.
+"""
+import asyncio
+import time
+import uuid
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from mora import lora
+from mora.handler.impl.engagement import EngagementReader
+from mora.request_scoped.bulking import request_wide_bulk
+
+ENGAGEMENTS = 10000
+PERSONS = [str(uuid.uuid4()) for _ in range(ENGAGEMENTS // 2)]
+UNITS = [str(uuid.uuid4()) for _ in range(300)]
+CLASSES = [str(uuid.uuid4()) for _ in range(20)]
+VIRKNING = {"from": "2015-01-01 00:00:00+01", "to": "infinity"}
+
+
+def engagement(i: int):
+    def rel(uuid_):
+        return [{"uuid": uuid_, "virkning": VIRKNING}]
+
+    return str(uuid.uuid4()), {
+        "attributter": {
+            "organisationfunktionegenskaber": [
+                {
+                    "brugervendtnoegle": "x",
+                    "funktionsnavn": "Engagement",
+                    "virkning": VIRKNING,
+                }
+            ],
+            "organisationfunktionudvidelser": [{"fraktion": 1, "virkning": VIRKNING}],
+        },
+        "tilstande": {
+            "organisationfunktiongyldighed": [
+                {"gyldighed": "Aktiv", "virkning": VIRKNING}
+            ]
+        },
+        "relationer": {
+            "tilknyttedebrugere": rel(PERSONS[i % len(PERSONS)]),
+            "tilknyttedeenheder": rel(UNITS[i % len(UNITS)]),
+            "opgaver": rel(CLASSES[i % len(CLASSES)]),
+            "organisatoriskfunktionstype": rel(CLASSES[(i + 1) % len(CLASSES)]),
+            "primær": rel(CLASSES[(i + 2) % len(CLASSES)]),
+        },
+    }
+
+
+OBJECTS = [engagement(i) for i in range(ENGAGEMENTS)]
+
+
+async def bulked_get(*args, **kwargs):
+    async def result():
+        await asyncio.sleep(0)
+        return {"uuid": args[0] if args else next(iter(kwargs.values()))}
+
+    return result()
+
+
+async def get_lora_object(c, search_fields, changed_since=None):
+    return OBJECTS
+
+
+async def run(deferred_lookups: bool):
+    loop = asyncio.get_running_loop()
+    tasks = 0
+
+    def task_factory(loop, coro, **kwargs):
+        nonlocal tasks
+        tasks += 1
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    best = float("inf")
+    with patch.object(EngagementReader, "deferred_lookups", deferred_lookups):
+        for _ in range(3):
+            async with request_wide_bulk.cache_context():
+                tasks = 0
+                loop.set_task_factory(task_factory)
+                start = time.perf_counter()
+                mo_objects = await EngagementReader.get(lora.Connector(), {})
+                best = min(best, time.perf_counter() - start)
+                loop.set_task_factory(None)
+    assert len(mo_objects) == ENGAGEMENTS
+    print(
+        "deferred_lookups={!s:<5} {:7} tasks {:6.2f} s".format(
+            deferred_lookups, tasks, best
+        )
+    )
+
+
+PATCHES = [
+    patch("mora.service.employee.request_bulked_get_one_employee", bulked_get),
+    patch("mora.service.orgunit.request_bulked_get_one_orgunit", bulked_get),
+    patch("mora.service.facet.request_bulked_get_one_class_full", bulked_get),
+    patch.object(EngagementReader, "_get_lora_object", get_lora_object),
+    patch("mora.graphapi.middleware.context", new={}),
+    patch("mora.common.context", new={}),
+    patch("mora.util.context", new={"query_args": {}}),
+]
+
+
+async def main():
+    with ExitStack() as stack:
+        for patcher in PATCHES:
+            stack.enter_context(patcher)
+        print("{} engagements".format(ENGAGEMENTS))
+        await run(deferred_lookups=False)
+        await run(deferred_lookups=True)
+
+
+asyncio.run(main())
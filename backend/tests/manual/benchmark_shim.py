@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmark of the latency of a shimmed GraphQL query.
+
+Executes the health query of the health endpoints in-process, with the health
+checks stubbed out. Before, each call built the schema, and parsed and validated
+the query. After, the schema is built once and the query prepared.
+
+Run with ``python -m tests.manual.benchmark_shim`` from the backend directory,
+with the settings MO needs to import.
+"""
+import asyncio
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from mora.graphapi import shim
+from mora.graphapi.dataloaders import get_loaders
+from mora.graphapi.health import health_map
+from mora.graphapi.main import get_schema
+from mora.graphapi.middleware import set_is_shim
+from mora.health import HEALTHS_QUERY
+
+CALLS = 100
+
+
+async def healthy() -> bool:
+    return True
+
+
+async def before():
+    # As execute_graphql did before the schema was cached and queries prepared
+    set_is_shim()
+    with patch.dict(shim._prepared_queries, clear=True):
+        schema = get_schema.__wrapped__()
+        return await schema.execute(HEALTHS_QUERY, context_value=await get_loaders())
+
+
+async def after():
+    return await shim.execute_graphql(HEALTHS_QUERY)
+
+
+BENCHMARKS = {
+    "before": before,
+    "after": after,
+}
+
+PATCHES = [
+    patch.dict(health_map, {name: healthy for name in health_map}),
+    patch("mora.graphapi.middleware.context", new={}),
+    patch("mora.common.context", new={}),
+    patch("mora.util.context", new={"query_args": {}}),
+]
+
+
+async def main():
+    with ExitStack() as stack:
+        for patcher in PATCHES:
+            stack.enter_context(patcher)
+        for name, benchmark in BENCHMARKS.items():
+            # Warm up, e.g. building the cached schema
+            result = await benchmark()
+            assert not result.errors, result.errors
+            start = time.perf_counter()
+            for _ in range(CALLS):
+                await benchmark()
+            elapsed = time.perf_counter() - start
+            print("{:<8} {:8.2f} ms/call".format(name, elapsed / CALLS * 1e3))
+
+
+asyncio.run(main())
@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+"""Micro-benchmark of parsing and formatting LoRa timestamps.
+
+Run with ``python -m tests.manual.benchmark_timestamps`` from the backend
+directory, with the settings MO needs to import.
+"""
+import datetime
+import timeit
+
+from mora import util
+
+# A LoRa listing repeats a few distinct 'virkning' timestamps over and over
+TIMESTAMPS = [
+    "2017-01-01 00:00:00+01",
+    "2017-01-01T00:00:00+01:00",
+    "2018-06-01T00:00:00.000000+02:00",
+    "2019-12-31T23:00:00+00:00",
+    "infinity",
+    "-infinity",
+]
+START = datetime.datetime(
+    2017, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=1))
+)
+END = datetime.datetime(2019, 12, 31, 23, tzinfo=datetime.timezone.utc)
+
+BENCHMARKS = {
+    "parsedatetime": lambda: [util.parsedatetime(s) for s in TIMESTAMPS],
+    "to_lora_time": lambda: [util.to_lora_time(s) for s in TIMESTAMPS],
+    "to_iso_date": lambda: [util.to_iso_date(s) for s in TIMESTAMPS],
+    "get_validity_object": lambda: util.get_validity_object(START, END),
+}
+
+for name, benchmark in BENCHMARKS.items():
+    number = 20000
+    best = min(timeit.repeat(benchmark, number=number, repeat=5))
+    print("{:<20} {:8.2f} us".format(name, best / number * 1e6))
@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+import contextlib
+import json
+
+import aio_pika
+import pytest
+from mora.config import Settings
+from mora.triggers.internal import amqp_trigger
+from mora.triggers.internal.amqp_trigger import Outbox
+
+from . import util
+
+
+class FakeExchange:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.published = []
+
+    async def publish(self, message, routing_key):
+        if self.failures:
+            self.failures -= 1
+            raise aio_pika.exceptions.AMQPError("nope")
+        self.published.append((routing_key, json.loads(message.body)))
+
+
+class FakePool:
+    def __init__(self, exchange):
+        self.exchange = exchange
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        yield self.exchange
+
+
+@pytest.fixture
+def exchange(monkeypatch):
+    def make(failures: int) -> FakeExchange:
+        exchange = FakeExchange(failures)
+        monkeypatch.setattr(amqp_trigger.pools, "exchange_pool", FakePool(exchange))
+        return exchange
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_outbox_retries_and_flushes(exchange):
+    fake_exchange = exchange(failures=2)
+    settings = Settings(amqp_publish_backoff=0, amqp_publisher_workers=1)
+    with util.override_config(settings):
+        outbox = Outbox()
+        latencies = []
+        outbox.on_published.append(latencies.append)
+        outbox.start()
+        for i in range(3):
+            await outbox.put("org_unit.org_unit.create", {"uuid": str(i)})
+        await outbox.close()
+
+    assert [("org_unit.org_unit.create", {"uuid": str(i)}) for i in range(3)] == sorted(
+        fake_exchange.published, key=lambda p: p[1]["uuid"]
+    )
+    assert 3 == len(latencies)
+    assert 0 == outbox.qsize()
+
+
+@pytest.mark.asyncio
+async def test_outbox_gives_up(exchange):
+    fake_exchange = exchange(failures=10)
+    settings = Settings(amqp_publish_backoff=0, amqp_publish_retries=2)
+    with util.override_config(settings):
+        outbox = Outbox()
+        failures = []
+        outbox.on_failed.append(lambda: failures.append(1))
+        outbox.start()
+        await outbox.put("org_unit.org_unit.create", {"uuid": "x"})
+        await outbox.close()
+
+    assert [] == fake_exchange.published
+    assert 1 == len(failures)
+    # The first attempt and two retries
+    assert 7 == fake_exchange.failures
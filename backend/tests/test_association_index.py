@@ -0,0 +1,127 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+import re
+import time
+from unittest.mock import patch
+
+import freezegun
+import tests.cases
+from aioresponses import CallbackResult
+from mora import util as mora_util
+from mora.config import Settings
+from mora.service import association_index
+
+from . import util
+
+EMPLOYEE = "00000000-0000-0000-0000-000000000001"
+OTHER = "00000000-0000-0000-0000-000000000002"
+ASSOCIATION = "00000000-0000-0000-0000-0000000000a1"
+ENDED = "00000000-0000-0000-0000-0000000000a2"
+
+JAN = mora_util.parsedatetime("2020-01-01")
+FEB = mora_util.parsedatetime("2020-02-01")
+MAR = mora_util.parsedatetime("2020-03-01")
+
+
+def association(uuid, employee_uuid, to="infinity"):
+    return {
+        "id": uuid,
+        "registreringer": [
+            {
+                "attributter": {
+                    "organisationfunktionegenskaber": [{"funktionsnavn": "Tilknytning"}]
+                },
+                "relationer": {
+                    "tilknyttedebrugere": [
+                        {
+                            "uuid": employee_uuid,
+                            "virkning": {"from": "2020-01-01", "to": to},
+                        }
+                    ]
+                },
+            },
+        ],
+    }
+
+
+@freezegun.freeze_time("2020-01-01")
+class AsyncTests(tests.cases.IsolatedAsyncioTestCase):
+    @util.MockAioresponses()
+    async def test_associated_employees(self, m):
+        associations = {
+            ASSOCIATION: association(ASSOCIATION, EMPLOYEE),
+            ENDED: association(ENDED, OTHER, to="2020-02-01"),
+        }
+        requests = []
+
+        def callback(url, json, **kwargs):
+            requests.append(json)
+            # Searches without 'list' only return UUIDs
+            if "uuid" not in json:
+                return CallbackResult(payload={"results": [list(associations)]})
+            objs = [associations[uuid] for uuid in json["uuid"] if uuid in associations]
+            return CallbackResult(payload={"results": [objs]})
+
+        m.get(
+            re.compile(r".*/organisation/organisationfunktion"),
+            callback=callback,
+            repeat=True,
+        )
+
+        # The associations are listed by UUID, and then loaded a chunk at a time,
+        # at all times
+        with patch.object(association_index, "BUILD_CHUNK_SIZE", 1):
+            index = await association_index.get_index()
+        self.assertEqual(3, len(requests))
+        self.assertEqual("-infinity", requests[0]["virkningfra"])
+        self.assertNotIn("list", requests[0])
+        self.assertEqual([[ASSOCIATION], [ENDED]], [r["uuid"] for r in requests[1:]])
+
+        # The index answers for any time, and is shared
+        self.assertTrue(index.is_associated(EMPLOYEE, JAN, FEB))
+        self.assertTrue(index.is_associated(OTHER, JAN, FEB))
+        self.assertFalse(index.is_associated(OTHER, FEB, MAR))
+        self.assertIs(index, await association_index.get_index())
+        self.assertEqual(3, len(requests))
+
+        # Moving the association away from the employee
+        associations[ASSOCIATION] = association(ASSOCIATION, OTHER)
+        await association_index.refresh_association(ASSOCIATION)
+        self.assertFalse(index.is_associated(EMPLOYEE, JAN, FEB))
+        self.assertTrue(index.is_associated(OTHER, FEB, MAR))
+
+        # Deleted associations are dropped
+        del associations[ENDED]
+        await association_index.refresh_association(ENDED)
+        self.assertEqual({ASSOCIATION}, set(index.associations))
+        self.assertEqual({OTHER}, set(index.employees))
+
+    @util.MockAioresponses()
+    async def test_shared_build(self, m):
+        requests = []
+
+        def callback(url, json, **kwargs):
+            requests.append(json)
+            return CallbackResult(payload={"results": [[]]})
+
+        m.get(
+            re.compile(r".*/organisation/organisationfunktion"),
+            callback=callback,
+            repeat=True,
+        )
+
+        settings = Settings(amqp_enable=True, association_index_ttl=1)
+        with util.override_config(settings):
+            # Concurrent callers share a single build
+            first, second = await asyncio.gather(
+                association_index.get_index(), association_index.get_index()
+            )
+            self.assertIs(first, second)
+            self.assertEqual(1, len(requests))
+
+            # The index expires with AMQP, too, to see writes straight to LoRa
+            later = time.monotonic() + 2
+            with patch.object(time, "monotonic", return_value=later):
+                self.assertIsNot(first, await association_index.get_index())
+            self.assertEqual(2, len(requests))
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+from datetime import date
+
+import pytest
+from mora.cache import SharedIndexes
+from mora.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_set():
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert "a" in cache
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expiry():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=60, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=120)
+    timer.now = 60
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_least_recently_used_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_pop_and_clear():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_items_skips_expired():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=60, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=120)
+    timer.now = 60
+    assert [("b", 2)] == cache.items()
+
+
+class FakeConnector:
+    def __init__(self, shared_date):
+        self.shared_date = shared_date
+
+
+@pytest.mark.asyncio
+async def test_shared_indexes():
+    builds = []
+
+    async def build(c):
+        builds.append(c)
+        return object()
+
+    indexes = SharedIndexes(build, maxsize=10, ttl=60)
+    today = FakeConnector(date(2020, 1, 1))
+    assert await indexes.get(today) is await indexes.get(
+        FakeConnector(today.shared_date)
+    )
+    assert [today] == builds
+
+    # Unshared reads are built for the caller alone
+    assert await indexes.get(FakeConnector(None)) not in indexes.values()
+    assert 2 == len(builds)
+    assert 1 == len(indexes.values())
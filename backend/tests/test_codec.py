@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+import datetime
+import json
+from uuid import UUID
+
+from fastapi import APIRouter
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from mora import codec
+from pydantic import BaseModel
+from starlette.testclient import TestClient
+
+UUID1 = UUID("00000000-0000-0000-0000-000000000001")
+
+
+class Model(BaseModel):
+    uuid: UUID
+    name: str
+
+
+CONTENT = {
+    "uuid": UUID1,
+    "from": datetime.datetime(
+        2020, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=1))
+    ),
+    "date": datetime.date(2020, 1, 1),
+    "models": [Model(uuid=UUID1, name="æøå")],
+    "tags": {"tag"},
+    "pair": ("a", 1),
+    UUID1: None,
+}
+
+
+def test_dumps_like_jsonable_encoder():
+    assert jsonable_encoder(CONTENT) == json.loads(codec.dumps(CONTENT))
+    assert (
+        CONTENT["models"][0].name
+        == codec.loads(codec.dumps_str(CONTENT))["models"][0]["name"]
+    )
+
+
+def test_route_responds_directly():
+    router = APIRouter(route_class=codec.JSONRoute)
+    calls = []
+
+    @router.get("/content", status_code=202)
+    async def get_content():
+        calls.append(1)
+        return CONTENT
+
+    app = FastAPI(default_response_class=codec.JSONResponse)
+    app.include_router(router)
+    response = TestClient(app).get("/content")
+
+    assert 202 == response.status_code
+    assert jsonable_encoder(CONTENT) == response.json()
+    assert 1 == len(calls)
@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+from unittest.mock import patch
+
+import pytest
+from mora import conf_db
+from mora.config import Settings
+from mora.service.orgunit import get_unit_settings
+
+pytestmark = pytest.mark.asyncio
+
+UNIT = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+def configurations(monkeypatch):
+    monkeypatch.setattr(
+        conf_db.config,
+        "get_settings",
+        lambda: Settings(conf_db_use=True, conf_db_password="secret"),
+    )
+    configurations = {
+        None: {"show_roles": True, "show_kle": False},
+        UNIT: {"show_kle": True},
+    }
+    with patch(
+        "mora.conf_db._load_db_configurations", return_value=configurations
+    ) as load:
+        yield load
+
+
+async def test_configuration_is_cached(configurations):
+    assert {"show_kle": True} == await conf_db.get_configuration_async(UNIT)
+    assert {"show_roles": True, "show_kle": False} == conf_db.get_configuration()
+    assert {} == conf_db.get_configuration("00000000-0000-0000-0000-000000000002")
+    configurations.assert_called_once()
+
+    # Callers may modify the result
+    conf_db.get_configuration()["show_roles"] = False
+    assert conf_db.get_configuration()["show_roles"] is True
+
+
+def test_configuration_is_invalidated_by_writes(configurations):
+    conf_db.get_configuration()
+    with patch("mora.conf_db._set_db_configuration"):
+        conf_db.set_configuration({"org_units": {"show_roles": False}})
+    conf_db.get_configuration()
+    assert 2 == configurations.call_count
+
+
+async def test_unit_settings_are_resolved_once_per_request(configurations):
+    parent = {"user_settings": {"orgunit": {"show_location": True}}}
+    token = conf_db.request_resolved_configuration.set({})
+    try:
+        expected = {"show_roles": True, "show_kle": True, "show_location": True}
+        assert expected == await get_unit_settings(UNIT, parent)
+        with patch("mora.conf_db.get_configuration_async") as get_configuration:
+            assert expected == await get_unit_settings(UNIT, parent)
+        get_configuration.assert_not_called()
+    finally:
+        conf_db.request_resolved_configuration.reset(token)
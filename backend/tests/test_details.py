@@ -42,6 +42,26 @@ class Tests(tests.cases.TestCase):
             status_code=400,
         )
 
+    def test_bulk_create_reports_errors_per_request(self):
+        self.assertRequestResponse(
+            "/service/details/create?bulk=1",
+            [
+                {
+                    "description": "Unknown role type.",
+                    "error": True,
+                    "error_key": "E_UNKNOWN_ROLE_TYPE",
+                    "status": 400,
+                    "type": "kaflaflibob",
+                }
+            ],
+            json=[
+                {
+                    "type": "kaflaflibob",
+                }
+            ],
+            status_code=201,
+        )
+
     def test_invalid_json(self):
         self.assertRequestResponse(
             "/service/details/edit",
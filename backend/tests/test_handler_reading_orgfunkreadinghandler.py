@@ -1,8 +1,12 @@
 # SPDX-FileCopyrightText: 2017-2021 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
 import pytest
 
 import tests.cases
+from mora.handler.reading import lookup
 from mora.handler.reading import OrgFunkReadingHandler
 from mora.lora import Connector
 
@@ -35,3 +39,37 @@ class TestOrgFunkReadingHandler(tests.cases.AsyncLoRATestCase):
         # ("rod <-> fil", "rod <-> hum")
         result = await OrgFunkReadingHandler.get_count(*self._args)
         self.assertEqual(result, 2)
+
+
+class DeferredReader(OrgFunkReadingHandler):
+    deferred_lookups = True
+
+    @classmethod
+    async def _get_effects(cls, c, obj, **params):
+        return [(None, None, obj)]
+
+    @classmethod
+    async def _get_mo_object_from_effect(cls, effect, start, end, funcid, flat=False):
+        return {"uuid": funcid, "person": lookup(get_person, effect["person"])}
+
+
+get_person = AsyncMock(side_effect=lambda uuid: {"uuid": uuid})
+
+
+@pytest.mark.asyncio
+async def test_equal_lookups_are_resolved_once():
+    valid = {"tilstande": {"organisationfunktiongyldighed": [{"gyldighed": "Aktiv"}]}}
+    objs = [
+        ("a", {**valid, "person": "p1"}),
+        ("b", {**valid, "person": "p2"}),
+        ("c", {**valid, "person": "p1"}),
+    ]
+    with patch.object(DeferredReader, "_get_lora_object", AsyncMock(return_value=objs)):
+        result = await DeferredReader.get(Connector(), {})
+
+    assert [
+        {"uuid": "a", "person": {"uuid": "p1"}},
+        {"uuid": "b", "person": {"uuid": "p2"}},
+        {"uuid": "c", "person": {"uuid": "p1"}},
+    ] == result
+    assert 2 == get_person.await_count
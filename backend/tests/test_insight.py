@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+import json
+from io import BytesIO
+from io import StringIO
+from zipfile import ZipFile
+
+import pytest
+from mora.service.insight import JSONStream
+from mora.service.insight import stream_zip_of_csvs
+
+REPORT = {
+    "title": "Medarbejdere",
+    "data": [
+        {"Navn": "Anders And", "Alder": 86},
+        {"Navn": 'Fedtmule "Goofy"', "Alder": 1234567890},
+    ],
+    "schema": {"fields": [{"name": "Navn"}, {"name": "Alder"}]},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_json_stream(chunk_size):
+    stream = JSONStream(StringIO(json.dumps(REPORT, indent=2)), chunk_size=chunk_size)
+    members = stream.members()
+    assert "title" == next(members)
+    assert "Medarbejdere" == stream.value()
+    assert "data" == next(members)
+    assert REPORT["data"] == list(stream.items())
+    assert "schema" == next(members)
+    stream.skip()
+    assert [] == list(members)
+
+
+def test_stream_zip_of_csvs(tmp_path):
+    (tmp_path / "employees.json").write_text(json.dumps(REPORT))
+    (tmp_path / "empty.json").write_text(
+        json.dumps({"schema": {"fields": [{"name": "Navn"}]}, "data": []})
+    )
+
+    chunks = list(
+        stream_zip_of_csvs(sorted(tmp_path.iterdir(), key=lambda path: path.name))
+    )
+    assert len(chunks) > 1
+
+    with ZipFile(BytesIO(b"".join(chunks))) as zip_file:
+        assert ["employees.csv", "empty.csv"] == zip_file.namelist()
+        assert (
+            '\ufeff"Navn","Alder"\r\n'
+            '"Anders And","86"\r\n'
+            '"Fedtmule ""Goofy""","1234567890"\r\n'
+        ) == zip_file.read("employees.csv").decode("utf-8")
+        assert '\ufeff"Navn"\r\n' == zip_file.read("empty.csv").decode("utf-8")
@@ -1,14 +1,22 @@
 # SPDX-FileCopyrightText: 2018-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
 import re
+from unittest.mock import patch
 
+import aiohttp
 import freezegun
+import lora_utils
+import pytest
 import tests.cases
 from aioresponses import aioresponses
+from aioresponses import CallbackResult
+from hypothesis import given
+from hypothesis import strategies as st
 from mora import config
 from mora import exceptions
 from mora import lora
 from mora import util as mora_util
+from mora.request_scoped.bulking import request_wide_bulk
 from more_itertools import last
 from more_itertools import one
 from parameterized import parameterized
@@ -592,6 +600,221 @@ class AsyncTests(tests.cases.IsolatedAsyncioTestCase):
         response = await c.bruger.update({}, uuid)
         self.assertIsNone(response)
 
+    @util.MockAioresponses()
+    async def test_session_is_reused_between_requests(self, m):
+        uuid = "00000000-0000-0000-0000-000000000000"
+        m.patch(re.compile(r".*/organisation/bruger/" + uuid), payload={"uuid": uuid})
+        m.patch(re.compile(r".*/organisation/bruger/" + uuid), payload={"uuid": uuid})
+        c = lora.Connector()
+        await c.bruger.update({}, uuid)
+        session = lora.get_session()
+        await c.bruger.update({}, uuid)
+        self.assertIs(session, lora.get_session())
+        self.assertFalse(session.closed)
+        self.assertEqual({"in_use": 0, "idle": 0}, lora.pool_statistics())
+
+        await lora.close_session()
+        self.assertTrue(session.closed)
+        self.assertIsNot(session, lora.get_session())
+        await lora.close_session()
+
+    @util.MockAioresponses()
+    async def test_transient_write_errors_are_retried(self, m):
+        uuid = "00000000-0000-0000-0000-000000000000"
+        url = re.compile(r".*/organisation/bruger/" + uuid)
+        m.put(url, status=503)
+        m.put(url, exception=aiohttp.ServerDisconnectedError())
+        m.put(url, payload={"uuid": uuid})
+        c = lora.Connector()
+
+        token = lora.write_retries.set(2)
+        try:
+            with util.override_config(config.Settings(bulk_write_retry_backoff=0)):
+                self.assertEqual(uuid, await c.bruger.create({}, uuid))
+        finally:
+            lora.write_retries.reset(token)
+
+    @util.MockAioresponses()
+    async def test_writes_are_not_retried_by_default(self, m):
+        uuid = "00000000-0000-0000-0000-000000000000"
+        m.patch(
+            re.compile(r".*/organisation/bruger/" + uuid),
+            status=503,
+            payload={"message": "Service Unavailable"},
+        )
+        c = lora.Connector()
+        with self.assertRaises(exceptions.HTTPException):
+            await c.bruger.update({}, uuid)
+        self.assertEqual(1, len(one(m.requests.values())))
+
+    @util.MockAioresponses()
+    async def test_paged_get_cursor(self, m):
+        uuids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(5)]
+        searches = []
+
+        def callback(url, json, **kwargs):
+            if "uuid" in json:
+                objs = [{"id": uuid, "registreringer": [{}]} for uuid in json["uuid"]]
+                return CallbackResult(payload={"results": [objs]})
+            searches.append(json)
+            return CallbackResult(payload={"results": [list(reversed(uuids))]})
+
+        m.get(re.compile(r".*/organisation/bruger"), callback=callback, repeat=True)
+        c = lora.Connector()
+
+        def func(c, uuid, obj):
+            return uuid
+
+        first = await c.bruger.paged_get(func, limit=2, cursor="", gyldighed="Aktiv")
+        self.assertEqual(5, first["total"])
+        self.assertCountEqual(uuids[:2], first["items"])
+        self.assertEqual(1, len(searches))
+
+        second = await c.bruger.paged_get(
+            func, start=2, limit=2, cursor=first["cursor"], gyldighed="Aktiv"
+        )
+        self.assertEqual(5, second["total"])
+        self.assertEqual(2, second["offset"])
+        self.assertCountEqual(uuids[2:4], second["items"])
+        self.assertEqual(first["cursor"], second["cursor"])
+        # The matching uuids were found by the first page only
+        self.assertEqual(1, len(searches))
+
+        # The cursor is not reused for a different search
+        other = await c.bruger.paged_get(
+            func, start=2, limit=2, cursor=first["cursor"], gyldighed="Inaktiv"
+        )
+        self.assertNotEqual(first["cursor"], other["cursor"])
+        self.assertEqual(2, len(searches))
+
+        # Without a cursor, nothing is cached
+        without = await c.bruger.paged_get(func, limit=2, gyldighed="Aktiv")
+        self.assertEqual({"total", "offset", "items"}, without.keys())
+        self.assertEqual(3, len(searches))
+
+    @util.MockAioresponses()
+    async def test_request_object_cache(self, m):
+        uuids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(3)]
+        requests = []
+
+        def callback(url, json, **kwargs):
+            requests.append(json)
+            objs = [
+                {"id": uuid, "registreringer": [{"uuid": uuid}]}
+                for uuid in json.get("uuid", uuids[:2])
+            ]
+            return CallbackResult(payload={"results": [objs]})
+
+        m.get(re.compile(r".*/organisation/bruger"), callback=callback, repeat=True)
+        m.patch(
+            re.compile(r".*/organisation/bruger/" + uuids[0]),
+            payload={"uuid": uuids[0]},
+        )
+
+        async with request_wide_bulk.cache_context() as cache:
+            c = lora.Connector()
+            # Objects found by a search are shared with later lookups by UUID
+            await c.bruger.fetch(tilhoerer="org", list=True)
+            self.assertEqual(1, len(requests))
+            self.assertEqual({"uuid": uuids[0]}, await c.bruger.get(uuids[0]))
+            self.assertEqual(1, len(requests))
+
+            # Only the missing objects are fetched
+            result = dict(await c.bruger.get_all_by_uuid(uuids))
+            self.assertEqual(set(uuids), result.keys())
+            self.assertEqual(2, len(requests))
+            self.assertEqual([uuids[2]], requests[-1]["uuid"])
+
+            # Objects are cached per validity
+            await lora.Connector(validity="past").bruger.get(uuids[0])
+            self.assertEqual(3, len(requests))
+
+            # Writes invalidate the object
+            await c.bruger.update({}, uuids[0])
+            await c.bruger.get(uuids[0])
+            self.assertEqual(4, len(requests))
+
+        self.assertEqual(3, cache.hits)
+        self.assertIsNone(lora.request_object_cache.get())
+
+    @util.MockAioresponses()
+    async def test_classification_cache(self, m):
+        uuid = "00000000-0000-0000-0000-000000000000"
+        requests = []
+
+        def callback(url, json, **kwargs):
+            requests.append(json)
+            obj = {"id": uuid, "registreringer": [{"uuid": uuid}]}
+            return CallbackResult(payload={"results": [[obj]]})
+
+        m.get(re.compile(r".*/klassifikation/klasse"), callback=callback, repeat=True)
+        m.patch(re.compile(r".*/klassifikation/klasse/" + uuid), payload={"uuid": uuid})
+
+        # Classes are shared between connectors, i.e. requests
+        self.assertEqual({"uuid": uuid}, await lora.Connector().klasse.get(uuid))
+        self.assertEqual({"uuid": uuid}, await lora.Connector().klasse.get(uuid))
+        self.assertEqual(1, len(requests))
+
+        # ..but only present-time reads at the same date
+        await lora.Connector(validity="past").klasse.get(uuid)
+        await lora.Connector(effective_date="2011-01-01").klasse.get(uuid)
+        self.assertEqual(3, len(requests))
+
+        # Writes invalidate the class, and are announced to other instances
+        written = []
+
+        async def on_written(path, uuid_):
+            written.append((path, uuid_))
+
+        with patch.object(lora, "on_classification_written", [on_written]):
+            await lora.Connector().klasse.update({}, uuid)
+        await lora.Connector().klasse.get(uuid)
+        self.assertEqual(4, len(requests))
+        self.assertEqual([("klassifikation/klasse", uuid)], written)
+
+    @util.MockAioresponses()
+    async def test_get_counts(self, m):
+        parents = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(3)]
+        units = {"a": [parents[0]], "b": [parents[0]], "c": [parents[1], parents[0]]}
+        requests = []
+
+        def callback(url, json, **kwargs):
+            requests.append(json)
+            objs = [
+                {
+                    "id": uuid,
+                    "registreringer": [
+                        {
+                            "relationer": {
+                                "overordnet": [{"uuid": parent} for parent in rels]
+                            }
+                        }
+                    ],
+                }
+                for uuid, rels in units.items()
+                if set(rels) & set(json["overordnet"])
+            ]
+            return CallbackResult(payload={"results": [objs]})
+
+        m.get(
+            re.compile(r".*/organisation/organisationenhed"),
+            callback=callback,
+            repeat=True,
+        )
+        counts = await lora.Connector().organisationenhed.get_counts(
+            "overordnet", parents, gyldighed="Aktiv"
+        )
+        self.assertEqual({parents[0]: 3, parents[1]: 1, parents[2]: 0}, counts)
+        # Counted by a single search
+        self.assertEqual(1, len(requests))
+        self.assertEqual(parents, requests[0]["overordnet"])
+
+        # Nothing to count, nothing to search
+        self.assertEqual(
+            {}, await lora.Connector().organisationenhed.get_counts("overordnet", [])
+        )
+        self.assertEqual(1, len(requests))
+
 
 @freezegun.freeze_time("2010-06-01", tz_offset=2)
 class Tests(tests.cases.TestCase):
@@ -617,3 +840,84 @@ class Tests(tests.cases.TestCase):
             },
             ctxt.exception.detail,
         )
+
+
+TIMESTAMPS = [
+    "-infinity",
+    "2000-01-01 00:00:00+01",
+    "2010-06-01T00:00:00+02:00",
+    "2010-06-02",
+    "infinity",
+]
+
+
+@st.composite
+def registrations(draw):
+    def entries():
+        return st.lists(
+            st.builds(
+                lambda bounds, value: {
+                    "virkning": {"from": bounds[0], "to": bounds[1]},
+                    "value": value,
+                },
+                st.lists(
+                    st.sampled_from(TIMESTAMPS), min_size=2, max_size=2, unique=True
+                ).map(lambda bounds: sorted(bounds, key=TIMESTAMPS.index)),
+                st.integers(),
+            ),
+            max_size=4,
+        )
+
+    keys = st.dictionaries(st.sampled_from(["a", "b", "c"]), entries(), max_size=3)
+    return draw(st.dictionaries(st.sampled_from(["relationer", "tilstande"]), keys))
+
+
+@given(registrations())
+def test_split_effects_like_lora_utils(reg):
+    relevant = {"relationer": ("a", "b"), "tilstande": ("a",)}
+    also = {"relationer": ("c",)}
+    expected = list(lora_utils.get_effects(reg, relevant, also))
+    assert expected == lora.split_effects(reg, relevant, also)
+
+    def is_relevant(start, end):
+        return start.year >= 2010
+
+    assert [e for e in expected if is_relevant(*e[:2])] == lora.split_effects(
+        reg, relevant, also, is_relevant
+    )
+
+
+@pytest.mark.asyncio
+async def test_effects_are_split_once_per_connector():
+    reg = {
+        "tilstande": {
+            "gyldighed": [
+                {
+                    "gyldighed": "Aktiv",
+                    "virkning": {"from": "2000-01-01", "to": "infinity"},
+                }
+            ]
+        }
+    }
+    relevant = {"tilstande": ("gyldighed",)}
+    scope = lora.Connector(validity="future").organisationenhed
+    with patch("mora.lora.split_effects", wraps=lora.split_effects) as split:
+        first = await scope.get_effects(reg, relevant)
+        second = await scope.get_effects(reg, relevant)
+    assert first == second
+    assert 1 == split.call_count
+
+
+@pytest.mark.asyncio
+async def test_effects_memo_is_bounded():
+    relevant = {"tilstande": ("gyldighed",)}
+    scope = lora.Connector(validity="future").organisationenhed
+    regs = [{"tilstande": {"gyldighed": []}} for _ in range(3)]
+    with patch.object(lora, "EFFECTS_MEMO_SIZE", 2):
+        for reg in regs:
+            await scope.get_effects(reg, relevant)
+    # The least recently used registration is dropped
+    assert [regs[1], regs[2]] == [reg for reg, _ in scope._effects.values()]
+
+    scope.forget([])
+    assert not scope._effects
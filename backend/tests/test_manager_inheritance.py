@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+import re
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+from aioresponses import CallbackResult
+from mora import lora
+from mora.handler.impl.manager import ManagerReader
+from mora.handler.reading import OrgFunkReadingHandler
+from mora.request_scoped.bulking import request_memo
+
+pytestmark = pytest.mark.asyncio
+
+ORG = "00000000-0000-0000-0000-000000000000"
+TOP = "00000000-0000-0000-0000-000000000001"
+PARENT = "00000000-0000-0000-0000-000000000002"
+LEAF = "00000000-0000-0000-0000-000000000003"
+OTHER_LEAF = "00000000-0000-0000-0000-000000000004"
+
+PARENTS = {TOP: ORG, PARENT: TOP, LEAF: PARENT, OTHER_LEAF: PARENT}
+
+
+@pytest.fixture
+def units(aioresponses):
+    def callback(url, json, **kwargs):
+        objs = [
+            {
+                "id": uuid,
+                "registreringer": [
+                    {"relationer": {"overordnet": [{"uuid": PARENTS[uuid]}]}}
+                ],
+            }
+            for uuid in json["uuid"]
+            if uuid in PARENTS
+        ]
+        return CallbackResult(payload={"results": [objs]})
+
+    aioresponses.get(
+        re.compile(r".*/organisation/organisationenhed"),
+        callback=callback,
+        repeat=True,
+    )
+
+
+async def test_managers_are_inherited_from_the_nearest_ancestor(units):
+    manager = {"uuid": "manager", "org_unit": {"uuid": TOP}}
+    token = request_memo.set({})
+    try:
+        with patch.object(
+            OrgFunkReadingHandler, "get", AsyncMock(return_value=[manager])
+        ) as get:
+            c = lora.Connector(validity="future")
+            assert {LEAF: [manager], OTHER_LEAF: [manager]} == (
+                await ManagerReader.get_inherited_managers(c, [LEAF, OTHER_LEAF])
+            )
+            # Later lookups during the request share the managers found
+            assert [manager] == await ManagerReader.get_inherited_manager(
+                c, "ou", PARENT
+            )
+    finally:
+        await lora.close_session()
+        request_memo.reset(token)
+
+    # All ancestors are searched at once
+    get.assert_awaited_once()
+    (_, search_fields), _ = get.await_args
+    assert {"tilknyttedeenheder": [LEAF, PARENT, TOP, OTHER_LEAF]} == search_fields
+
+
+async def test_concurrent_lookups_are_resolved_together(units):
+    manager = {"uuid": "manager", "org_unit": {"uuid": TOP}}
+    token = request_memo.set({})
+    try:
+        with patch.object(
+            OrgFunkReadingHandler, "get", AsyncMock(return_value=[manager])
+        ) as get:
+            c = lora.Connector(validity="future")
+            # As when listing the managers of each unit
+            assert [[manager], [manager]] == await asyncio.gather(
+                ManagerReader.get_inherited_manager(c, "ou", LEAF),
+                ManagerReader.get_inherited_manager(c, "ou", OTHER_LEAF),
+            )
+    finally:
+        await lora.close_session()
+        request_memo.reset(token)
+
+    get.assert_awaited_once()
+    (_, search_fields), _ = get.await_args
+    assert {"tilknyttedeenheder": [LEAF, PARENT, TOP, OTHER_LEAF]} == search_fields
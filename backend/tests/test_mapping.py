@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+import pytest
+from mora import mapping
+
+PROJECTION = mapping.Projection(
+    person=mapping.USER_FIELD,
+    org_unit=mapping.ASSOCIATED_ORG_UNIT_FIELD,
+    manager_level=mapping.MANAGER_LEVEL_FIELD,
+    responsibilities=(mapping.RESPONSIBILITY_FIELD, mapping.Project.UUIDS),
+    extensions=(mapping.ORG_FUNK_UDVIDELSER_FIELD, mapping.Project.ENTRIES),
+)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {},
+        None,
+        {"relationer": None},
+        {"relationer": {"tilknyttedebrugere": []}},
+        {
+            "attributter": {
+                "organisationfunktionudvidelser": [{"fraktion": 10}, {}],
+            },
+            "relationer": {
+                "tilknyttedebrugere": [{"urn": "urn:a"}, {"uuid": "u1"}],
+                "tilknyttedeenheder": [{"uuid": "o1"}, {"uuid": "o2"}],
+                "opgaver": [
+                    {"objekttype": "lederansvar", "uuid": "r1"},
+                    {"objekttype": "lederniveau", "uuid": "l1"},
+                    {"objekttype": "lederansvar", "uuid": "r2"},
+                    {"objekttype": "lederansvar"},
+                ],
+            },
+        },
+    ],
+)
+def test_projection_is_like_field_tuples(obj):
+    assert PROJECTION(obj) == (
+        mapping.USER_FIELD.get_uuid(obj),
+        mapping.ASSOCIATED_ORG_UNIT_FIELD.get_uuid(obj),
+        mapping.MANAGER_LEVEL_FIELD.get_uuid(obj),
+        list(mapping.RESPONSIBILITY_FIELD.get_uuids(obj)),
+        mapping.ORG_FUNK_UDVIDELSER_FIELD.get(obj),
+    )
+
+
+def test_projection_returns_named_record():
+    record = PROJECTION(
+        {"relationer": {"tilknyttedeenheder": [{"uuid": "o1"}]}},
+    )
+
+    assert "o1" == record.org_unit
+    assert [] == record.responsibilities
+    assert record.person is None
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+import re
+from functools import partial
+
+import freezegun
+import tests.cases
+from aioresponses import CallbackResult
+from mora import lora
+from mora.service import orgunit_index
+from mora.service.orgunit_index import OrgUnitIndex
+
+from . import util
+
+ORG = "00000000-0000-0000-0000-000000000000"
+ROOT = "00000000-0000-0000-0000-000000000001"
+CHILD = "00000000-0000-0000-0000-000000000002"
+GRANDCHILD = "00000000-0000-0000-0000-000000000003"
+OTHER = "00000000-0000-0000-0000-000000000004"
+
+
+def unit(uuid, parent_uuid):
+    return {
+        "id": uuid,
+        "registreringer": [
+            {"relationer": {"overordnet": [{"uuid": parent_uuid}]}},
+        ],
+    }
+
+
+def test_hierarchy():
+    index = OrgUnitIndex(None, {ROOT: ORG, CHILD: ROOT, GRANDCHILD: CHILD, OTHER: ORG})
+    assert [GRANDCHILD, CHILD, ROOT] == index.get_ancestors(GRANDCHILD)
+    assert {CHILD, GRANDCHILD} == index.get_descendants(ROOT)
+    assert index.is_under(GRANDCHILD, ROOT)
+    assert index.is_under(ROOT, ROOT)
+    assert not index.is_under(OTHER, ROOT)
+    assert 2 == index.get_depth(GRANDCHILD)
+    assert {ORG} == index.non_units
+
+    # Moving a unit moves its subtree
+    index.set_parent(CHILD, OTHER)
+    assert [GRANDCHILD, CHILD, OTHER] == index.get_ancestors(GRANDCHILD)
+    assert set() == index.get_descendants(ROOT)
+
+    index.remove(GRANDCHILD)
+    assert [] == index.get_ancestors(GRANDCHILD)
+    assert set() == index.get_descendants(CHILD)
+
+
+def test_cyclic_hierarchy():
+    index = OrgUnitIndex(None, {ROOT: CHILD, CHILD: ROOT})
+    assert [ROOT, CHILD] == index.get_ancestors(ROOT)
+    assert {ROOT, CHILD} == index.get_descendants(ROOT)
+
+
+@freezegun.freeze_time("2020-01-01")
+class AsyncTests(tests.cases.IsolatedAsyncioTestCase):
+    @util.MockAioresponses()
+    async def test_get_ancestors(self, m):
+        units = {ROOT: ORG, CHILD: ROOT}
+        requests = []
+
+        def callback(url, json, **kwargs):
+            requests.append(json)
+            uuids = json.get("uuid", units)
+            objs = [unit(uuid, units[uuid]) for uuid in uuids if uuid in units]
+            return CallbackResult(payload={"results": [objs]})
+
+        m.get(
+            re.compile(r".*/organisation/organisationenhed"),
+            callback=callback,
+            repeat=True,
+        )
+
+        c = lora.Connector()
+        # The index is built once, and then shared
+        self.assertEqual([CHILD, ROOT], await orgunit_index.get_ancestors(c, CHILD))
+        self.assertEqual([ROOT], await orgunit_index.get_ancestors(c, ROOT))
+        # Searching for all units lists their UUIDs, and then loads them
+        self.assertEqual(2, len(requests))
+
+        # Units missing from the index are fetched
+        units[GRANDCHILD] = CHILD
+        self.assertEqual(
+            [GRANDCHILD, CHILD, ROOT],
+            await orgunit_index.get_ancestors(lora.Connector(), GRANDCHILD),
+        )
+        self.assertEqual(3, len(requests))
+
+        # Written units are refreshed
+        units[CHILD] = ORG
+        await orgunit_index.refresh_units([CHILD])
+        self.assertEqual(
+            [GRANDCHILD, CHILD],
+            await orgunit_index.get_ancestors(lora.Connector(), GRANDCHILD),
+        )
+        self.assertEqual(4, len(requests))
+
+        # Units moved without this instance knowing are only seen in LoRa
+        units[CHILD] = ROOT
+        self.assertEqual(
+            [GRANDCHILD, CHILD],
+            await orgunit_index.get_ancestors(lora.Connector(), GRANDCHILD),
+        )
+        self.assertEqual(
+            [GRANDCHILD, CHILD, ROOT],
+            await orgunit_index.read_ancestors(lora.Connector(), GRANDCHILD),
+        )
+
+    @util.MockAioresponses()
+    async def test_paged_get_under_root(self, m):
+        units = {ROOT: ORG, CHILD: ROOT, OTHER: ORG}
+
+        def callback(url, json, **kwargs):
+            uuids = json.get("uuid", units)
+            objs = [unit(uuid, units[uuid]) for uuid in uuids if uuid in units]
+            if "uuid" not in json and "list" not in json:
+                objs = [obj["id"] for obj in objs]
+            return CallbackResult(payload={"results": [objs]})
+
+        m.get(
+            re.compile(r".*/organisation/organisationenhed"),
+            callback=callback,
+            repeat=True,
+        )
+
+        c = lora.Connector()
+        await orgunit_index.get_index(c)
+
+        # Units created since the index was built are climbed, as when listing the
+        # units under a root
+        units[GRANDCHILD] = CHILD
+        result = await c.organisationenhed.paged_get(
+            lambda c, uuid, obj: uuid,
+            uuid_filters=[partial(orgunit_index.is_under, c, root=ROOT)],
+        )
+        self.assertEqual({ROOT, CHILD, GRANDCHILD}, set(result["items"]))
+        self.assertIn(GRANDCHILD, await orgunit_index.get_index(c))
@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2022 Magenta ApS
+# SPDX-License-Identifier: MPL-2.0
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import freezegun
+import pytest
+from mora import lora
+from mora.handler.impl.engagement import EngagementReader
+from mora.request_scoped.bulking import request_memo
+from mora.service import facet
+
+pytestmark = pytest.mark.asyncio
+
+PERSON = "00000000-0000-0000-0000-000000000001"
+PRIMARY = "00000000-0000-0000-0000-0000000000c1"
+NON_PRIMARY = "00000000-0000-0000-0000-0000000000c2"
+
+
+@pytest.fixture
+def memo():
+    token = request_memo.set({})
+    yield
+    request_memo.reset(token)
+
+
+@pytest.fixture
+def sorted_classes():
+    classes = [(PRIMARY, 5000), (NON_PRIMARY, 3000)]
+    with patch(
+        "mora.service.facet._get_sorted_primary_class_list",
+        AsyncMock(return_value=classes),
+    ) as get_sorted_classes:
+        yield get_sorted_classes
+
+
+@freezegun.freeze_time("2020-01-01")
+async def test_sorted_primary_classes_are_shared(sorted_classes):
+    c = lora.Connector()
+    assert [(PRIMARY, 5000), (NON_PRIMARY, 3000)] == (
+        await facet.get_sorted_primary_class_list(c)
+    )
+    await facet.get_sorted_primary_class_list(lora.Connector())
+    sorted_classes.assert_awaited_once()
+
+    # Writing a class invalidates the list
+    lora.invalidate_classification_cache("klassifikation/klasse", NON_PRIMARY)
+    await facet.get_sorted_primary_class_list(c)
+    assert 2 == sorted_classes.await_count
+
+
+@freezegun.freeze_time("2020-01-01")
+async def test_sorted_primary_classes_written_meanwhile(memo):
+    async def get_sorted_classes(c):
+        # A class is written while the list is computed
+        lora.invalidate_classification_cache("klassifikation/klasse", PRIMARY)
+        return [(PRIMARY, 5000)]
+
+    with patch("mora.service.facet._get_sorted_primary_class_list", get_sorted_classes):
+        await facet.get_sorted_primary_class_list(lora.Connector())
+    assert 0 == len(facet.primary_class_cache)
+
+
+async def test_sorted_primary_classes_of_other_validities(sorted_classes, memo):
+    c = lora.Connector(validity="future")
+    await facet.get_sorted_primary_class_list(c)
+    await facet.get_sorted_primary_class_list(c)
+    sorted_classes.assert_awaited_once()
+    assert 0 == len(facet.primary_class_cache)
+
+
+async def test_primary_class_is_found_once_per_person(memo):
+    c = lora.Connector()
+    with patch("mora.util.context", new={"query_args": {"calculate_primary": "1"}}):
+        with patch.object(
+            EngagementReader,
+            "_get_primary_class",
+            AsyncMock(return_value=(2, PRIMARY)),
+        ) as get_primary_class:
+            assert await EngagementReader._is_primary(c, PERSON, PRIMARY) is True
+            assert await EngagementReader._is_primary(c, PERSON, NON_PRIMARY) is False
+    get_primary_class.assert_awaited_once()
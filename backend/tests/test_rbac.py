@@ -182,29 +182,11 @@ class TestOwnerMultipleOrgUnits(object):
 
 class TestGetAncestorOwners(object):
     def set_up(self) -> None:
-        self.org_unit_tree = [
-            {
-                "name": "Overordnet Enhed",
-                "user_key": "root",
-                "uuid": "2874e1dc-85e6-4269-823a-e1125484dfd3",
-                "validity": {"from": "2016-01-01", "to": None},
-                "children": [
-                    {
-                        "name": "Humanistisk fakultet",
-                        "user_key": "hum",
-                        "uuid": "9d07123e-47ac-4a9a-88c8-da82e3a4bc9e",
-                        "validity": {"from": "2016-01-01", "to": None},
-                        "children": [
-                            {
-                                "name": "Filosofisk Institut",
-                                "user_key": "fil",
-                                "uuid": "85715fc7-925d-401b-822d-467eb4b163b6",
-                                "validity": {"from": "2016-01-01", "to": None},
-                            }
-                        ],
-                    }
-                ],
-            }
+        # Filosofisk Institut, Humanistisk fakultet and Overordnet Enhed
+        self.ancestors = [
+            "85715fc7-925d-401b-822d-467eb4b163b6",
+            "9d07123e-47ac-4a9a-88c8-da82e3a4bc9e",
+            "2874e1dc-85e6-4269-823a-e1125484dfd3",
         ]
 
         self.owners = [
@@ -236,12 +218,12 @@ class TestGetAncestorOwners(object):
     @pytest.mark.asyncio
     @unittest.mock.patch("mora.auth.keycloak.owner.common.get_connector")
     @unittest.mock.patch("mora.auth.keycloak.owner.OwnerReader.get_from_type")
-    @unittest.mock.patch("mora.auth.keycloak.owner.mora.service.orgunit.get_unit_tree")
+    @unittest.mock.patch("mora.auth.keycloak.owner.orgunit_index.read_ancestors")
     async def test_anders_and_in_owners(
-        self, mock_get_unit_tree, mock_get_from_type, mock_get_connector
+        self, mock_get_ancestors, mock_get_from_type, mock_get_connector
     ):
         self.set_up()
-        mock_get_unit_tree.return_value = self.org_unit_tree
+        mock_get_ancestors.return_value = self.ancestors
         mock_get_from_type.side_effect = [[], self.owners, []]
         mock_get_connector.return_value = None
 
@@ -252,12 +234,12 @@ class TestGetAncestorOwners(object):
     @pytest.mark.asyncio
     @unittest.mock.patch("mora.auth.keycloak.owner.common.get_connector")
     @unittest.mock.patch("mora.auth.keycloak.owner.OwnerReader.get_from_type")
-    @unittest.mock.patch("mora.auth.keycloak.owner.mora.service.orgunit.get_unit_tree")
+    @unittest.mock.patch("mora.auth.keycloak.owner.orgunit_index.read_ancestors")
     async def test_fedtmule_in_owners(
-        self, mock_get_unit_tree, mock_get_from_type, mock_get_connector
+        self, mock_get_ancestors, mock_get_from_type, mock_get_connector
     ):
         self.set_up()
-        mock_get_unit_tree.return_value = self.org_unit_tree
+        mock_get_ancestors.return_value = self.ancestors
         self.owners[0]["owner"]["uuid"] = FEDTMULE
         mock_get_from_type.side_effect = [[], self.owners, []]
         mock_get_connector.return_value = None
@@ -269,12 +251,12 @@ class TestGetAncestorOwners(object):
     @pytest.mark.asyncio
     @unittest.mock.patch("mora.auth.keycloak.owner.common.get_connector")
     @unittest.mock.patch("mora.auth.keycloak.owner.OwnerReader.get_from_type")
-    @unittest.mock.patch("mora.auth.keycloak.owner.mora.service.orgunit.get_unit_tree")
+    @unittest.mock.patch("mora.auth.keycloak.owner.orgunit_index.read_ancestors")
     async def test_anders_and_and_fedtmule_in_owners(
-        self, mock_get_unit_tree, mock_get_from_type, mock_get_connector
+        self, mock_get_ancestors, mock_get_from_type, mock_get_connector
     ):
         self.set_up()
-        mock_get_unit_tree.return_value = self.org_unit_tree
+        mock_get_ancestors.return_value = self.ancestors
 
         anders_and = self.owners[0]
         fedtmule = copy.deepcopy(anders_and)
@@ -291,12 +273,12 @@ class TestGetAncestorOwners(object):
     @pytest.mark.asyncio
     @unittest.mock.patch("mora.auth.keycloak.owner.common.get_connector")
     @unittest.mock.patch("mora.auth.keycloak.owner.OwnerReader.get_from_type")
-    @unittest.mock.patch("mora.auth.keycloak.owner.mora.service.orgunit.get_unit_tree")
+    @unittest.mock.patch("mora.auth.keycloak.owner.orgunit_index.read_ancestors")
     async def test_no_owners(
-        self, mock_get_unit_tree, mock_get_from_type, mock_get_connector
+        self, mock_get_ancestors, mock_get_from_type, mock_get_connector
     ):
         self.set_up()
-        mock_get_unit_tree.return_value = self.org_unit_tree
+        mock_get_ancestors.return_value = self.ancestors
         mock_get_from_type.return_value = []
         mock_get_connector.return_value = None
 
@@ -1,13 +1,18 @@
 # SPDX-FileCopyrightText: 2019-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
+import asyncio
+from unittest.mock import patch
+
 import freezegun
 import pytest
 
 import tests.cases
 from mora.exceptions import HTTPException
 from mora.mapping import EventType, RequestType
+from mora.service import handlers
 from mora.service.handlers import RequestHandler
 from mora.triggers import Trigger
+from mora.triggers.internal.http_trigger import CircuitBreaker
 
 
 class MockHandler(RequestHandler):
@@ -119,6 +124,86 @@ class AsyncTests(tests.cases.AsyncMockRequestContextTestCase):
 
         self.assertTrue(self.trigger_called)
 
+    async def test_bulk_write_coalesces_triggers(self):
+        @Trigger.on("mock", RequestType.EDIT, EventType.ON_BEFORE)
+        async def veto(trigger_dict):
+            if trigger_dict["request"].get("veto"):
+                raise Exception("Bummer")
+
+        calls = []
+
+        @Trigger.on("mock", RequestType.EDIT, EventType.ON_AFTER)
+        async def trigger(trigger_dict):
+            calls.append(trigger_dict)
+
+        results = await handlers.bulk_write(
+            [{"type": "mock"}, {"type": "mock", "veto": True}, {"type": "mock"}],
+            RequestType.EDIT,
+        )
+
+        self.assertEqual(
+            {
+                "description": "Bummer",
+                "error": True,
+                "error_key": "E_INTEGRATION_ERROR",
+                "status": 400,
+            },
+            results[1],
+        )
+        # Both remaining requests edit the same object
+        self.assertEqual(1, len(calls))
+        self.assertEqual("edit", calls[0]["uuid"])
+
+    async def test_bulk_write_reports_any_exception(self):
+        calls = []
+
+        @Trigger.on("mock", RequestType.EDIT, EventType.ON_AFTER)
+        async def trigger(trigger_dict):
+            calls.append(trigger_dict)
+
+        async def prepare_edit(handler, req):
+            if req.get("fail") == "prepare":
+                raise KeyError("prepare")
+            handler.uuid = "edit"
+
+        async def submit(handler):
+            if handler.request.get("fail") == "submit":
+                raise KeyError("submit")
+            await RequestHandler.submit(handler)
+            return handler.uuid
+
+        with patch.object(MockHandler, "prepare_edit", prepare_edit):
+            with patch.object(MockHandler, "submit", submit):
+                results = await handlers.bulk_write(
+                    [
+                        {"type": "mock", "fail": "prepare"},
+                        {"type": "mock", "fail": "submit"},
+                        {"type": "mock"},
+                    ],
+                    RequestType.EDIT,
+                )
+
+        self.assertEqual(
+            [
+                {
+                    "description": "KeyError('prepare')",
+                    "error": True,
+                    "error_key": "E_UNKNOWN",
+                    "status": 500,
+                },
+                {
+                    "description": "KeyError('submit')",
+                    "error": True,
+                    "error_key": "E_UNKNOWN",
+                    "status": 500,
+                },
+                "edit",
+            ],
+            results,
+        )
+        # Only the successful request is announced
+        self.assertEqual(1, len(calls))
+
     async def test_handler_trigger_before_create(self):
         @Trigger.on("mock", RequestType.CREATE, EventType.ON_BEFORE)
         async def trigger(trigger_dict):
@@ -193,6 +278,48 @@ class AsyncTests(tests.cases.AsyncMockRequestContextTestCase):
         await (await MockHandler.construct({}, RequestType.TERMINATE)).submit()
         self.assertTrue(self.trigger_called)
 
+    async def test_handler_triggers_after_run_concurrently(self):
+        first_started = asyncio.Event()
+        second_started = asyncio.Event()
+
+        # Each trigger waits for the other, so they only finish if run concurrently
+        @Trigger.on("mock", RequestType.EDIT, EventType.ON_AFTER)
+        async def first(trigger_dict):
+            first_started.set()
+            await second_started.wait()
+            raise Exception("Bummer")
+
+        @Trigger.on("mock", RequestType.EDIT, EventType.ON_AFTER)
+        async def second(trigger_dict):
+            second_started.set()
+            await first_started.wait()
+
+        handler = await MockHandler.construct({}, RequestType.EDIT)
+        with self.assertRaises(HTTPException) as err:
+            await asyncio.wait_for(handler.submit(), timeout=5)
+        self.assertEqual("Bummer", err.exception.detail["description"])
+
+
+class TestCircuitBreaker:
+    def test_opens_after_repeated_failures(self):
+        now = [0.0]
+        breaker = CircuitBreaker(
+            failure_threshold=2, reset_timeout=30, timer=lambda: now[0]
+        )
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.is_open
+        assert not breaker.allow()
+
+        # A single trial call is let through after the reset timeout
+        now[0] = 30
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert not breaker.is_open
+        assert breaker.allow()
+
 
 @pytest.mark.usefixtures("sample_structures")
 @freezegun.freeze_time("2016-01-01")
@@ -3,6 +3,7 @@
 
 import datetime
 
+import dateutil.parser
 import dateutil.tz
 import freezegun
 
@@ -68,6 +69,53 @@ class TestUtils(TestCase):
         # test fallback
         self.assertEqual(util.parsedatetime("blyf", "flaf"), "flaf")
 
+    def test_parse_iso_time(self):
+        for value in (
+            "2017-07-31",
+            "2017-07-31T22:00",
+            "2017-07-31T22:00:00.123456+00:00",
+            "2017-07-31 22:00:00+02:00",
+            "2017-07-31T22:00:00Z",
+            "2017-07-31T22:00:00.5-0130",
+            "20170731T2200",
+            "2017-W31-1",
+        ):
+            self.assertEqual(
+                dateutil.parser.isoparse(value),
+                util.parse_iso_time(value),
+                "failed to parse {!r}".format(value),
+            )
+
+        with self.assertRaises(ValueError):
+            util.parse_iso_time("31-07-2017")
+
+    def test_timestamps_are_memoized(self):
+        util.from_iso_time.cache_clear()
+        util._to_iso_date.cache_clear()
+
+        for i in range(3):
+            self.assertEqual(
+                "2017-07-31", util.to_iso_date("2017-08-01T00:00:00+02:00", True)
+            )
+            self.assertEqual("2017-06-01", util.to_iso_date(self.today.replace(2017)))
+            self.assertEqual(
+                "2017-06-01",
+                util.to_iso_date(
+                    datetime.datetime(2017, 5, 31, 22, tzinfo=datetime.timezone.utc)
+                ),
+            )
+
+        # the repeated hour when leaving summer time
+        ambiguous = datetime.datetime(2017, 10, 29, 2, 30, tzinfo=util.DEFAULT_TIMEZONE)
+        self.assertEqual("2017-10-29T02:30:00+02:00", util.to_lora_time(ambiguous))
+        self.assertEqual(
+            "2017-10-29T02:30:00+01:00", util.to_lora_time(ambiguous.replace(fold=1))
+        )
+
+        self.assertEqual(1, util.from_iso_time.cache_info().misses)
+        self.assertEqual(3, util._to_iso_date.cache_info().misses)
+        self.assertEqual(6, util._to_iso_date.cache_info().hits)
+
     def test_is_uuid(self):
         self.assertTrue(util.is_uuid("00000000-0000-0000-0000-000000000000"))
         self.assertFalse(util.is_uuid("42"))
@@ -1,5 +1,6 @@
 # SPDX-FileCopyrightText: 2017-2020 Magenta ApS
 # SPDX-License-Identifier: MPL-2.0
+import asyncio
 import datetime
 import unittest
 
@@ -7,31 +8,91 @@ import freezegun
 import tests.cases
 import yarl
 from mora import config
-from mora import lora
+from mora import exceptions
 from mora import util as mora_util
+from mora.lora import LoraObjectType
 from mora.service.validation import validator
 from parameterized import parameterized
 
 from . import util
 
 
-class AsyncTestIsDateRangeValid(tests.cases.IsolatedAsyncioTestCase):
-    async def test_startdate_should_be_smaller_than_enddate(self):
-        self.assertFalse(
-            await validator._is_date_range_valid(
-                None, "01-01-2017", "01-01-2016", None, "whatever"
-            )
+UUID = "00000000-0000-0000-0000-000000000000"
+
+
+def mock_validities(m, path, gyldighed_key, validities):
+    url = yarl.URL(f"{config.get_settings().lora_url}organisation/{path}")
+    m.get(
+        url,
+        payload={
+            "results": [
+                [
+                    {
+                        "id": UUID,
+                        "registreringer": [
+                            {
+                                "tilstande": {
+                                    gyldighed_key: [
+                                        {
+                                            "gyldighed": v,
+                                            "virkning": {
+                                                "from": mora_util.to_lora_time(t1),
+                                                "from_included": True,
+                                                "to": mora_util.to_lora_time(t2),
+                                                "to_included": False,
+                                            },
+                                        }
+                                        for t1, t2, v in validities
+                                    ]
+                                },
+                            }
+                        ],
+                    }
+                ]
+            ]
+        },
+        repeat=True,
+    )
+    return url
+
+
+class AsyncTestIsDateRangeInObjRange(tests.cases.AsyncMockRequestContextTestCase):
+    async def assert_error(self, error_key, coro):
+        if error_key is None:
+            await coro
+            return
+        with self.assertRaises(exceptions.HTTPException) as ctx:
+            await coro
+        self.assertEqual(error_key, ctx.exception.key.name)
+
+    @util.MockAioresponses(override_lora=False)
+    async def test_startdate_should_be_smaller_than_enddate(self, m):
+        mock_validities(
+            m,
+            "organisationenhed",
+            "organisationenhedgyldighed",
+            [("-infinity", "infinity", "Aktiv")],
+        )
+        await self.assert_error(
+            "V_DATE_OUTSIDE_EMPL_RANGE",
+            validator.is_date_range_in_obj_range(
+                {"uuid": UUID},
+                mora_util.parsedatetime("01-01-2017"),
+                mora_util.parsedatetime("01-01-2016"),
+                LoraObjectType.org_unit,
+                "organisationenhedgyldighed",
+            ),
         )
 
     @parameterized.expand(
         [
             # just valid
-            (True, [("-infinity", "infinity", "Aktiv")]),
+            (None, [("-infinity", "infinity", "Aktiv")]),
             # exact coverage
-            (True, [("01-01-2000", "01-01-3000", "Aktiv")]),
+            (None, [("01-01-2000", "01-01-3000", "Aktiv")]),
             # multiple sequences, but valid
             (
-                True,
+                None,
                 [
                     ("01-01-1940", "01-01-1950", "Inaktiv"),
                     ("01-01-1950", "01-01-2100", "Aktiv"),
@@ -45,21 +106,23 @@ class AsyncTestIsDateRangeValid(tests.cases.IsolatedAsyncioTestCase):
             ),
             # valid sequences, with gaps outside active period.
             (
-                True,
+                None,
                 [
                     ("01-01-1960", "01-01-1980", "Aktiv"),
                     ("01-01-2000", "01-01-3000", "Aktiv"),
                 ],
             ),
-            # no validity
-            (False, []),
+            # no validity, i.e. nothing to find in the range
+            ("E_NOT_FOUND", []),
+            # no validity in the range
+            ("E_NOT_FOUND", [("01-01-1960", "01-01-1980", "Aktiv")]),
             # completely invalid
-            (False, [("-infinity", "infinity", "Inaktiv")]),
+            ("V_DATE_OUTSIDE_EMPL_RANGE", [("-infinity", "infinity", "Inaktiv")]),
             # no complete coverage
-            (False, [("01-01-2000", "01-01-2100", "Aktiv")]),
+            ("V_DATE_OUTSIDE_EMPL_RANGE", [("01-01-2000", "01-01-2100", "Aktiv")]),
             # there's a hole in the middle
             (
-                False,
+                "V_DATE_OUTSIDE_EMPL_RANGE",
                 [
                     ("01-01-2000", "01-01-2250", "Aktiv"),
                     ("01-01-2750", "infinity", "Aktiv"),
@@ -67,7 +130,7 @@ class AsyncTestIsDateRangeValid(tests.cases.IsolatedAsyncioTestCase):
             ),
             # there's an invalidity in the middle
             (
-                False,
+                "V_DATE_OUTSIDE_EMPL_RANGE",
                 [
                     ("01-01-2000", "01-01-2250", "Aktiv"),
                     ("01-01-2250", "01-01-2750", "Inaktiv"),
@@ -75,78 +138,89 @@ class AsyncTestIsDateRangeValid(tests.cases.IsolatedAsyncioTestCase):
                 ],
             ),
             # starts too late!
-            (False, [("01-01-2500", "infinity", "Aktiv")]),
+            ("V_DATE_OUTSIDE_EMPL_RANGE", [("01-01-2500", "infinity", "Aktiv")]),
             # ends too soon!
-            (False, [("01-01-1930", "01-01-2500", "Aktiv")]),
+            ("V_DATE_OUTSIDE_EMPL_RANGE", [("01-01-1930", "01-01-2500", "Aktiv")]),
         ]
     )
     @freezegun.freeze_time("2017-01-01", tz_offset=1)
     @util.MockAioresponses(override_lora=False)
-    async def test_validity_ranges(self, expect, validities, m):
-        settings = config.get_settings()
-        url = yarl.URL(f"{settings.lora_url}organisation/organisationenhed")
-        c = lora.Connector(
-            virkningfra="2000-01-01", virkningtil="3000-01-01"
-        ).organisationenhed
-
-        payload = {
-            "results": [
-                [
-                    {
-                        "id": "00000000-0000-0000-0000-000000000000",
-                        "registreringer": [
-                            {
-                                "tilstande": {
-                                    "organisationenhedgyldighed": [
-                                        {
-                                            "gyldighed": v,
-                                            "virkning": {
-                                                "from": mora_util.to_lora_time(
-                                                    t1,
-                                                ),
-                                                "from_included": True,
-                                                "to": mora_util.to_lora_time(
-                                                    t2,
-                                                ),
-                                                "to_included": False,
-                                            },
-                                        }
-                                        for t1, t2, v in validities
-                                    ]
-                                },
-                            }
-                        ],
-                    }
-                ]
-            ]
-        }
-        m.get(
-            url,
-            payload=payload,
+    async def test_validity_ranges(self, error_key, validities, m):
+        url = mock_validities(
+            m, "organisationenhed", "organisationenhedgyldighed", validities
         )
 
-        self.assertIs(
-            expect,
-            await validator._is_date_range_valid(
-                "00000000-0000-0000-0000-000000000000",
+        await self.assert_error(
+            error_key,
+            validator.is_date_range_in_obj_range(
+                {"uuid": UUID},
                 mora_util.parsedatetime("01-01-2000"),
                 mora_util.parsedatetime("01-01-3000"),
-                c,
+                LoraObjectType.org_unit,
                 "organisationenhedgyldighed",
             ),
         )
 
+        # The object is read over the full range
         call_args = m.requests["GET", url][0]
         self.assertEqual(
             call_args.kwargs["json"],
             {
-                "uuid": ["00000000-0000-0000-0000-000000000000"],
-                "virkningfra": "2000-01-01T00:00:00+01:00",
-                "virkningtil": "3000-01-01T00:00:00+01:00",
+                "uuid": [UUID],
+                "virkningfra": "-infinity",
+                "virkningtil": "infinity",
                 "konsolider": "True",
             },
         )
 
+    @freezegun.freeze_time("2017-01-01", tz_offset=1)
+    @util.MockAioresponses(override_lora=False)
+    async def test_validity_effects(self, m):
+        mock_validities(
+            m,
+            "organisationenhed",
+            "organisationenhedgyldighed",
+            [
+                ("01-01-2000", "01-01-2250", "Aktiv"),
+                ("01-01-2250", "01-01-2750", "Inaktiv"),
+            ],
+        )
+        obj = await validator._get_full_range_object(LoraObjectType.org_unit, UUID)
+        effects = await validator._get_validity_effects(
+            LoraObjectType.org_unit, UUID, obj, "organisationenhedgyldighed"
+        )
+        self.assertEqual(
+            [
+                (mora_util.parsedatetime(t1), mora_util.parsedatetime(t2), v)
+                for t1, t2, v in [
+                    ("01-01-2000", "01-01-2250", "Aktiv"),
+                    ("01-01-2250", "01-01-2750", "Inaktiv"),
+                ]
+            ],
+            [
+                (
+                    start,
+                    end,
+                    effect["tilstande"]["organisationenhedgyldighed"][0]["gyldighed"],
+                )
+                for start, end, effect in effects
+            ],
+        )
+
+    @util.MockAioresponses(override_lora=False)
+    async def test_user_not_found_in_range(self, m):
+        mock_validities(
+            m, "bruger", "brugergyldighed", [("01-01-2000", "01-01-2010", "Aktiv")]
+        )
+        await self.assert_error(
+            "E_USER_NOT_FOUND",
+            validator.is_date_range_in_employee_range(
+                {"uuid": UUID},
+                mora_util.parsedatetime("01-01-2020"),
+                mora_util.parsedatetime("01-01-2030"),
+            ),
+        )
+
 
 class TestGetEndpointDate(unittest.TestCase):
     def setUp(self):
@@ -201,3 +275,61 @@ class TestGetEndpointDate(unittest.TestCase):
             0,
             tzinfo=datetime.timezone(datetime.timedelta(0), "+00:00"),
         )
+
+
+class AsyncTestValidationMemo(tests.cases.AsyncMockRequestContextTestCase):
+    @util.MockAioresponses(override_lora=False)
+    async def test_objects_are_read_once_per_batch(self, m):
+        settings = config.get_settings()
+        url = yarl.URL(f"{settings.lora_url}organisation/bruger")
+        m.get(
+            url,
+            payload={
+                "results": [
+                    [
+                        {
+                            "id": "00000000-0000-0000-0000-000000000000",
+                            "registreringer": [
+                                {
+                                    "tilstande": {
+                                        "brugergyldighed": [
+                                            {
+                                                "gyldighed": "Aktiv",
+                                                "virkning": {
+                                                    "from": "1999-06-01 00:00:00+00",
+                                                    "from_included": True,
+                                                    "to": "infinity",
+                                                    "to_included": False,
+                                                },
+                                            }
+                                        ]
+                                    },
+                                }
+                            ],
+                        }
+                    ]
+                ]
+            },
+            repeat=True,
+        )
+        employee = {"uuid": "00000000-0000-0000-0000-000000000000"}
+
+        with validator.validation_memo():
+            await asyncio.gather(
+                *(
+                    validator.is_date_range_in_employee_range(
+                        employee,
+                        mora_util.parsedatetime(f"{2000 + year}-01-01"),
+                        mora_util.POSITIVE_INFINITY,
+                    )
+                    for year in range(100)
+                )
+            )
+            with self.assertRaises(exceptions.HTTPException):
+                await validator.is_date_range_in_employee_range(
+                    employee,
+                    mora_util.parsedatetime("1999-01-01"),
+                    mora_util.POSITIVE_INFINITY,
+                )
+
+        self.assertEqual(1, len(m.requests["GET", url]))